@@ -0,0 +1,287 @@
+############################################################################
+#                                                                          #
+#                     BENCHMARKING THE DATA INTERPRETER:                   #
+#          python benchmark.py [options] (python benchmark.py -h)          #
+#       Generates a synthetic session folder, times every stage, then      #
+#                 writes the timings to a JSON report                      #
+#                                                                          #
+############################################################################
+#
+#   The synthetic folder looks like a real one: files named
+#       Session#_ID_DATE_COLOR_PAIRMEMBER_BANDID_STARTTIME_ENDTIME_PROC.txt
+#   holding one "time value" line every fourth of a second. Each session has one Team Leader ("TL") and
+#   the rest Partners ("P"). The EDA is a slowly drifting level with skin conductance responses (a quick
+#   rise, then a slow decay) on top, some of them shared by every member of the session, plus a little noise.
+#
+#   Every stage is run --repeat times; the report keeps the best and the mean time of each, and the amount
+#   of data lines per second of the best run, so reports of different versions can be compared.
+#
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import time as timer
+from datetime import datetime
+
+import main
+
+COLORS = ["RED", "BLUE", "GREEN", "YELLOW", "PURPLE", "ORANGE"]
+
+#
+#           GENERATOR FUNCTION
+# generateEDA() - Produce count EDA values (4 per second), with responses at the given times (secs) on top
+#
+
+def generateEDA(rnd, count, events):
+    level = rnd.uniform(2.0, 12.0)
+    values = []
+    phasic = 0.0
+    rise = 0.0
+    pending = sorted(events)
+    nextEvent = 0
+    for i in range(count):
+        now = i / 4.0
+        # Responses that begin now add a rise to reach over about 1.5 seconds
+        while(nextEvent < len(pending) and pending[nextEvent] <= now):
+            rise += rnd.uniform(0.05, 0.8) / 6.0
+            nextEvent += 1
+        if(rise > 0.0):
+            step = min(rise, 0.15)
+            phasic += step
+            rise -= step
+        phasic *= 0.985 # Slow decay (about 4 seconds)
+
+        level += rnd.gauss(0.0, 0.002) # Tonic drift
+        level = max(level, 0.5)
+        values.append(round(level + phasic + rnd.gauss(0.0, 0.003), 6))
+    return values
+
+#
+#           GENERATOR FUNCTION
+# generateFolder() - Write a synthetic session folder, returns the file names
+#           sessions with members files each (1 is a lone file, 2 a dyad, 3 a triad...), minutes of data per file
+#
+
+def generateFolder(folderPath, sessions = 4, members = 2, minutes = 30, seed = 1):
+    rnd = random.Random(seed)
+    os.makedirs(folderPath, exist_ok = True)
+    count = int(minutes * 60 * 4)
+    endTime = "%02d%02d" % (9 + ((minutes // 60) % 24), minutes % 60)
+    names = []
+    fileID = 0
+    for sess in range(1, sessions + 1):
+        # About 3 responses a minute per member, a third of them shared by the whole session
+        shared = [rnd.uniform(0, minutes * 60) for i in range(int(minutes))]
+        color = COLORS[(sess - 1) % len(COLORS)]
+        for member in range(members):
+            own = [rnd.uniform(0, minutes * 60) for i in range(int(minutes * 2))]
+            values = generateEDA(rnd, count, shared + own)
+            role = "TL" if member == 0 else "P"
+            name = "Session%s_ID%s_2024-01-01_%s_%s_B%s_0900_%s_PROC.txt" % (sess, fileID, color, role, fileID, endTime)
+            with open(os.path.join(folderPath, name), "w") as dataFile:
+                dataFile.write("".join("%s %s\n" % (i / 4.0, value) for i, value in enumerate(values)))
+            names.append(name)
+            fileID += 1
+    return names
+
+#
+#           BENCHMARK FUNCTION
+# quietly() - Call a function of the program without its messages, returns what it returns
+#
+
+def quietly(function, *args):
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            return function(*args)
+
+#
+#           BENCHMARK FUNCTION
+# timeStage() - Run a stage repeat times (setup, not timed, runs before each), returns [best secs, mean secs]
+#
+
+def timeStage(stage, repeat, setup = None):
+    times = []
+    for i in range(repeat):
+        if(setup is not None):
+            quietly(setup)
+        start = timer.perf_counter()
+        quietly(stage)
+        times.append(timer.perf_counter() - start)
+    return [min(times), sum(times) / len(times)]
+
+#
+#           BENCHMARK FUNCTION
+# record() - Add the timing of a stage to the report results, with its data lines per second
+#
+
+def record(results, stage, timing, lines, params = None):
+    result = {"stage": stage, "best_secs": timing[0], "mean_secs": timing[1], "lines": lines}
+    if(params is not None):
+        result["params"] = {"width": params[main.WIDTH], "increment": params[main.INCRE], "count": params[main.COUNT], "start": params[main.START]}
+    result["lines_per_sec"] = lines / timing[0] if timing[0] > 0 else None
+    results.append(result)
+    print("%-28s %-22s best %9.4f s  mean %9.4f s" % (stage, "" if params is None else "w%s i%s" % (params[main.WIDTH], params[main.INCRE]), timing[0], timing[1]))
+
+#
+#           BENCHMARK FUNCTION
+# runBenchmarks() - Time every stage on the folder, returns the list of results
+#
+
+def runBenchmarks(folderPath, paramSets, repeat):
+    results = []
+    cacheFolder = os.path.join(folderPath, main.CACHE_FOLDER)
+
+    # Loading (parsing the text, then again from the parse cache)
+    main.PARSE_CACHE = False
+    clam = quietly(main.Clam, folderPath)
+    lines = sum(len(obj.m_data) for obj in clam.m_datasets)
+    record(results, "clam_load", timeStage(lambda: main.Clam(folderPath), repeat), lines)
+    main.PARSE_CACHE = True
+    quietly(main.Clam, folderPath) # Fill the cache
+    record(results, "clam_load_cached", timeStage(lambda: main.Clam(folderPath), repeat), lines)
+    shutil.rmtree(cacheFolder, ignore_errors = True)
+
+    # Normalization
+    for stage, normType in (("norm_mm", main.MM_NORM), ("norm_zs", main.ZS_NORM)):
+        def normalize():
+            for obj in clam.m_datasets:
+                main.normTask(normType, obj)
+        record(results, stage, timeStage(normalize, repeat), lines)
+
+    # Window features, alone and fused, in every window configuration
+    #       The window sums are built once per file and shared between features, so they are timed on their own
+    def clearSums():
+        for obj in clam.m_datasets:
+            obj.m_sums = None
+            obj.m_features.clear()
+    def buildSums():
+        for obj in clam.m_datasets:
+            obj.getSums()
+    record(results, "window_sums", timeStage(buildSums, repeat, clearSums), lines)
+    features = [("feature_avg", [main.AVG]), ("feature_std", [main.STD]), ("feature_slope", [main.SLOPE]), ("feature_all", [main.AVG, main.STD, main.SLOPE])]
+    for params in paramSets:
+        for stage, feats in features:
+            def calculate():
+                for obj in clam.m_datasets:
+                    obj.getSums().calcWindows(params, feats)
+            record(results, stage, timeStage(calculate, repeat), lines, params)
+
+    # Pairing, Directional Agreement, Signal Matching and Cross-Correlation
+    record(results, "pairing", timeStage(clam.pairSessions, repeat), len(clam.m_datasets))
+    pairs = [pair for pair in clam.m_pairs if pair.m_second is not None]
+    pairLines = sum(pair.m_maxlen for pair in pairs)
+    record(results, "directional_agreement", timeStage(lambda: [pair.calcMatch() for pair in pairs], repeat), pairLines)
+    record(results, "signal_matching", timeStage(lambda: [pair.calcDiffs() for pair in pairs], repeat), pairLines)
+    record(results, "cross_correlation", timeStage(lambda: [pair.calcXCorr() for pair in pairs], repeat), pairLines)
+    for params in paramSets:
+        def synchrony():
+            for pair in pairs:
+                pair.m_sums = None
+                pair.getSums().calcWindows(params)
+        record(results, "windowed_synchrony", timeStage(synchrony, repeat), pairLines, params)
+
+    # Output writing (of the first window configuration), into a temporary folder
+    #       The messages of the program are part of writing, so they are timed too (but not shown)
+    outputPath = tempfile.mkdtemp(prefix = "bench_outputs_") + os.sep
+    params = paramSets[0]
+    doFeat = [False] * main.TOTALFEAT
+    doFeat[main.AVG] = doFeat[main.STD] = doFeat[main.SLOPE] = doFeat[main.CALCS] = True
+    for obj in clam.m_datasets:
+        obj.calcFeatures(params, doFeat)
+        obj.calcMMnorm()
+    for pair in clam.m_pairs:
+        pair.calcFeatures(params, doFeat)
+    try:
+        record(results, "write_calcs", timeStage(lambda: [obj.writeFile(outputPath, params, main.CALCS, doFeat) for obj in clam.m_datasets], repeat), lines, params)
+        record(results, "write_norms", timeStage(lambda: [obj.writeFile(outputPath, params, main.NORMS, doFeat, main.MM_NORM) for obj in clam.m_datasets], repeat), lines)
+        record(results, "write_sync_calcs", timeStage(lambda: [pair.writeFile(outputPath, params, main.CALCS, doFeat) for pair in clam.m_pairs], repeat), pairLines, params)
+        record(results, "write_dirag", timeStage(lambda: [pair.writeFile(outputPath, params, main.DIRAG, doFeat) for pair in pairs], repeat), pairLines)
+        record(results, "write_sigma", timeStage(lambda: [pair.writeFile(outputPath, params, main.SIGMA, doFeat) for pair in pairs], repeat), pairLines)
+    finally:
+        shutil.rmtree(outputPath, ignore_errors = True)
+
+    return results
+
+#
+#           HELPER FUNCTION
+# version() - The git commit of the program being timed, if it is in a git repository
+#
+
+def version():
+    try:
+        folder = os.path.dirname(os.path.abspath(main.__file__))
+        commit = subprocess.run(["git", "describe", "--always", "--dirty"], cwd = folder, capture_output = True, text = True)
+        if(commit.returncode == 0):
+            return commit.stdout.strip()
+    except OSError:
+        pass
+    return None
+
+#
+#           HELPER FUNCTION
+# parseParams() - Turn "240,4;120,1" into window configurations [WIDTH, INCRE, COUNT, START]
+#
+
+def parseParams(text):
+    paramSets = []
+    for config in text.split(";"):
+        width, incr = [int(value) for value in config.split(",")]
+        params = [0, 0, 0, 0]
+        params[main.WIDTH] = width
+        params[main.INCRE] = incr
+        paramSets.append(params)
+    return paramSets
+
+#
+#           DRIVER FUNCTION
+# benchmark() - driver function
+#
+
+def benchmark(args):
+    parser = argparse.ArgumentParser(prog = "benchmark.py", description = "Time every stage of the Data Interpreter on a synthetic session folder.")
+    parser.add_argument("--sessions", type = int, default = 4, help = "sessions to generate (default 4)")
+    parser.add_argument("--members", type = int, default = 2, help = "files per session: 1 lone, 2 dyads, 3 triads... (default 2)")
+    parser.add_argument("--minutes", type = int, default = 30, help = "minutes of data per file (default 30)")
+    parser.add_argument("--params", default = "240,4;120,1;480,20", help = "window configurations \"width,increment;...\" (default \"240,4;120,1;480,20\")")
+    parser.add_argument("--repeat", type = int, default = 3, help = "runs per stage (default 3)")
+    parser.add_argument("--seed", type = int, default = 1, help = "seed of the generator (default 1)")
+    parser.add_argument("--folder", help = "folder to generate the data into (default: a temporary folder, removed afterwards)")
+    parser.add_argument("--report", default = "benchmark.json", help = "JSON report to write (default benchmark.json)")
+    options = parser.parse_args(args)
+
+    folderPath = options.folder
+    if(folderPath is None):
+        folderPath = tempfile.mkdtemp(prefix = "bench_data_")
+    paramSets = parseParams(options.params)
+
+    print("Generating %s session(s) of %s file(s), %s minutes each, in \"%s\"" % (options.sessions, options.members, options.minutes, folderPath))
+    names = generateFolder(folderPath, options.sessions, options.members, options.minutes, options.seed)
+    try:
+        results = runBenchmarks(folderPath, paramSets, options.repeat)
+    finally:
+        if(options.folder is None):
+            shutil.rmtree(folderPath, ignore_errors = True)
+
+    report = {
+        "date": datetime.now().isoformat(timespec = "seconds"),
+        "version": version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"sessions": options.sessions, "members": options.members, "minutes": options.minutes, "files": len(names),
+                   "lines_per_file": int(options.minutes * 60 * 4), "repeat": options.repeat, "seed": options.seed},
+        "results": results,
+    }
+    with open(options.report, "w") as reportFile:
+        json.dump(report, reportFile, indent = 2)
+    print("\nReport written to \"%s\"" % options.report)
+
+# Start Benchmarks
+if __name__ == "__main__":
+    benchmark(sys.argv[1:])
@@ -12,15 +12,51 @@
 #   Clam - a class dedicated for holding multiple files (a folder of files)
 #   NameData - a class dedicated for individual files
 #   
-#   Each NameData object's m_data and m_orig consists of an array of [time, data] pairs.
+#   Each NameData object's m_time, m_orig and m_data are columns of floats (array('d')), parsed once
+#   when the file is read: m_time holds the timestamps, m_orig the EDA before normalization, and m_data
+#   the EDA the calculations run on (normalized, if normalization was picked). Index i of each is line i.
 #   NameData objects may also be referred to:
 #       SyncPair's m_first and m_second
 #
+#   The classes holding data (one object per file, pair or window feature) declare their members in __slots__,
+#   so they carry no per-object dictionary; their results are typed arrays rather than lists of Python floats.
+#
 
 import os
+import sys
 import math
+import mmap
+import cmath
+import json
+import time as timer
+import stat as filestat
+import socket
+import shutil
+import struct
+import hashlib
+import tempfile
+import argparse
+import selectors
+import threading
+import socketserver
+import functools
+import contextlib
+import operator
+import cProfile
+import pstats
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+from itertools import accumulate, combinations, compress, islice, product, repeat
 #import pandas as pd
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+try:
+    import resource # Unix only, for the peak memory of a process (see peakMemory())
+except ImportError:
+    resource = None
 
 #############
 # Constants #
@@ -36,46 +72,620 @@ CALCS = 6
 NORMS = 7
 DIRAG = 8
 SIGMA = 9
-
-TOTALFEAT = 10
+XCORR = 10
+XCORRW = 11
+SYNCW = 12
+
+TOTALFEAT = 13
+# Directional Agreement signs of change, as written in the outputs
+SIGNS = {1: "+", -1: "-", 0: "x"}
+# Column names of the features in data files (see DATA_FORMAT)
+FEATNAMES = {AVG: "average", STD: "std", SLOPE: "slope"}
+# Column names of the windowed synchrony of pairs in data files, in the order of PairSums.calcWindows()
+SYNCNAMES = ["pearson", "mean_difference", "da_ratio"]
 # Parameters
 WIDTH = 0
 INCRE = 1
 COUNT = 2
 START = 3
 
+############
+# Settings #
+############
+# Number of processes that share the per-file calculations and output files.
+# 1 runs everything in this process, 0 uses one process per CPU core.
+WORKERS = 1
+# Threads that write output files at once when there are no worker processes (WORKERS = 1), so the time spent waiting on
+# the disk (or a network share) for one file overlaps the others. 1 writes them one after another.
+WRITERS = 4
+# Load each file only while it is being worked on, instead of keeping the whole folder in memory.
+# Peak memory then depends on the largest file (times WORKERS), not on the size of the folder.
+LOW_MEMORY = False
+# Size in bytes of each piece of a file that is read and parsed at once.
+READ_CHUNK = 1 << 20
+# Keep the parsed columns of every file in a "-cache" folder next to it, so later runs skip parsing.
+# A cached file is used while the file's size and modification time are unchanged, and with
+# CACHE_HASH, only while the file's contents hash the same too (slower, but catches copied-over files).
+PARSE_CACHE = True
+CACHE_HASH = False
+CACHE_FOLDER = "-cache"
+# Lines of an output file that are formatted into one block and written with a single call.
+WRITE_BLOCK = 1 << 16
+# Also write every output as a columnar data file for other programs, next to the text file:
+# "" writes only the text files, "csv" a comma delimited file with a header line, "bin" a binary file with a schema.
+DATA_FORMAT = ""
+# Window feature results kept per file (least recently used ones are dropped first), so asking again
+# for a feature with the same window parameters and normalization does not recalculate it.
+FEATURE_CACHE = 32
+# Incremental mode, for data files that keep growing: outputs go to one fixed folder per data folder
+# (outputs\incremental\<folder name>\), and each run only reads the lines added to a file since the last run,
+# appending the newly completed windows and normalized lines to its CALCS and NORM outputs.
+# The progress of each file is kept in the CHECKPOINT_FOLDER of that output folder. Individual files only.
+INCREMENTAL = False
+CHECKPOINT_FOLDER = "-checkpoints"
+# Streaming mode (python main.py stream ...): seconds between checks of followed files for new lines, and
+# how many samples one member of a pair may get ahead of the other before its oldest ones are dropped.
+STREAM_POLL = 0.25
+STREAM_LAG = 1200
+# Write the wall time, CPU time, peak memory and samples per second of every stage of a run, and of every file
+# worked on in it, to a "-metrics.json" file next to "-fileList.txt".
+METRICS = True
+# Profile the run: every stage is also run under cProfile and tracemalloc (much slower), and the profile is written
+# next to "-fileList.txt" ("-profile.txt" by cumulative time, "-profile.prof" for pstats or other viewers).
+# Only this process is profiled, so use it with WORKERS = 1.
+PROFILE = False
+# Out-of-core mode, for recordings too large to hold in memory: a file is never read whole, but worked on CHUNK_LINES
+# lines at a time, from its memory mapped parse cache (or its text, without PARSE_CACHE). Normalization takes a first
+# pass for the statistics (min and max, or mean and standard deviation), then normalizes while the outputs are written.
+# Window features, NORM, CALCS and SIGMA outputs are the same as in memory; DIRAG still loads each pair whole.
+OUT_OF_CORE = False
+CHUNK_LINES = 1 << 17
+# Cross-Correlation of pairs: the largest lag (lines of data, either way) at which the Partner's data is compared with
+# the Team Leader's. 240 lines is one minute.
+XCORR_LAG = 240
+# Result cache: the window features, DA, SM and windowed synchrony calculated for a file (or pair) are kept in the
+# "results" folder of its "-cache" folder, under the SHA-256 of the file's contents, the normalization and the window
+# parameters, so a later run over the same data with the same parameters reads them back instead of calculating them.
+# RESULT_CACHE_SIZE bounds the results kept per data folder (bytes); the least recently used go first at the end of a run.
+# Not used in INCREMENTAL or OUT_OF_CORE mode.
+RESULT_CACHE = True
+RESULT_CACHE_SIZE = 256 << 20
+
+###=-=-=-=-=-=-= BEGIN CLASS WINDOWSUMS =-=-=-=-=-=-=###
+#
+#   WindowSums - the sliding window engine shared by AvgData, StdData and SlopeData
+#   Builds cumulative sums of x (time), y (data), x^2, y^2 and xy once per dataset, so the
+#   sums over any window [start, end) are the difference of two entries: O(1) per window.
+#   Each entry m_sx[i] holds the sum of the first i values (m_sx[0] = 0).
+#
+#   The sums are kept as exact integers: every float is a whole number once multiplied by a
+#   power of two, so each column is scaled by a common m_dx/m_dy and then shifted by its first
+#   value. Nothing is lost to rounding, so a window's statistics come out the same as looping
+#   over its values, no matter how far into the file it is or how narrow it is.
+#
+#   The common denominator is bounded (see toExact()), so one tiny value does not make every integer long.
+#   nan and inf have no exact value: a window holding one has nan for every feature, as looping over it would.
+#
+
+class WindowSums:
+    __slots__ = ("m_len", "m_dx", "m_dy", "m_x0", "m_y0", "m_sx", "m_sy", "m_sxx", "m_syy", "m_sxy", "m_sbad")
+    EXACT_BITS = 128
+
+    def __init__(self, times, data):
+        self.m_len = len(data)
+        self.calc(times, data)
+
+    #####################################################
+    #           Conversion (float to exact integer)
+    # toExact() - Scale a column of floats to integers over one common power of two denominator
+    #           The denominator is at most what keeps the largest value within EXACT_BITS bits: only values that much
+    #           smaller than it are rounded (see toInteger()), the others stay exact
+    #           Returns [integers, denominator, flags]: flags is 1 for a value that is not finite (taken as 0) and 0
+    #           for the others, or None when every value is finite
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def toExact(values):
+        flags = None
+        if(not math.isfinite(sum(values))): # nan or inf somewhere (or finite values too large to add up as floats)
+            flags = [0 if math.isfinite(value) else 1 for value in values]
+            values = [0.0 if flag else value for value, flag in zip(values, flags)]
+            if(not any(flags)):
+                flags = None
+        ratios = list(map(float.as_integer_ratio, values))
+        denom = max((ratio[1] for ratio in ratios), default = 1)
+        if(denom > (1 << WindowSums.EXACT_BITS)):
+            peak = max(map(abs, values))
+            denom = min(denom, 1 << max(WindowSums.EXACT_BITS - math.frexp(peak)[1], 0))
+            return [WindowSums.toInteger(value, denom) for value in values], denom, flags
+        return [num * (denom // den) for num, den in ratios], denom, flags
+
+    # toInteger() - One float as an integer over the denominator of its column (from toExact())
+    #           Rounded to the nearest when the denominator is too small to hold it exactly; 0 if it is not finite
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def toInteger(value, denom):
+        if(not math.isfinite(value)):
+            return 0
+        num, den = value.as_integer_ratio()
+        if(den <= denom):
+            return num * (denom // den)
+        shift = den // denom
+        return ((2 * num) + shift) // (2 * shift)
+
+    # countBad() - Cumulative count of the lines where any of the given columns is not finite (flags from toExact()),
+    #           so a window holds one when the count changes across it; None when every column is finite
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def countBad(*flags):
+        flags = [column for column in flags if column is not None]
+        if(len(flags) == 0):
+            return None
+        return list(accumulate(map(any, zip(*flags)), initial = 0))
+
+    ############################################################################################
+    # calc() - Convert the time and data columns once, then build the cumulative sums
+
+    def calc(self, times, data):
+        xs, self.m_dx, badX = self.toExact(times)
+        ys, self.m_dy, badY = self.toExact(data)
+        self.m_sbad = self.countBad(badX, badY)
+
+        # Shift by the first sample to keep the integers short
+        self.m_x0 = xs[0] if xs else 0
+        self.m_y0 = ys[0] if ys else 0
+        xs = [x - self.m_x0 for x in xs]
+        ys = [y - self.m_y0 for y in ys]
+
+        self.m_sx  = list(accumulate(xs, initial = 0))
+        self.m_sy  = list(accumulate(ys, initial = 0))
+        self.m_sxx = list(accumulate(map(operator.mul, xs, xs), initial = 0))
+        self.m_syy = list(accumulate(map(operator.mul, ys, ys), initial = 0))
+        self.m_sxy = list(accumulate(map(operator.mul, xs, ys), initial = 0))
+
+    ############################################################################################
+    # windows() - Produce the start position of every window in the given window parameters
+    #           Same bounds as always: windows stay full size and end strictly before the data ends
+
+    def windows(self, params):
+        return [params[START] + (i * params[INCRE]) for i in range(windowCount(params, self.m_len))]
+
+    ############################################################################################
+    # calcWindows() - The fused window kernel: one pass over the windows computes every feature in
+    #           feats (any of AVG, STD, SLOPE), sharing the window sums between them
+    #           Returns one array of results per entry of feats, in the same order
+    #           All the arithmetic stays exact until the final division, which rounds only once
+    #           starts picks the windows instead of the window parameters (only their width is used then)
+
+    def calcWindows(self, params, feats, starts = None):
+        count = params[WIDTH]
+        doAvg = AVG in feats
+        doStd = STD in feats
+        doSlope = SLOPE in feats
+        results = {AVG: array('d'), STD: array('d'), SLOPE: array('d')}
+
+        # Every window has the same width, so the scaling terms are worked out once
+        avgShift = count * self.m_y0
+        avgScale = count * self.m_dy
+        stdScale = count * count * self.m_dy * self.m_dy
+        m_sx, m_sy, m_sxx, m_syy, m_sxy, m_sbad = self.m_sx, self.m_sy, self.m_sxx, self.m_syy, self.m_sxy, self.m_sbad
+
+        if(starts is None):
+            starts = self.windows(params)
+
+        for start in starts:
+            end = start + count
+            if(m_sbad is not None and m_sbad[end] != m_sbad[start]): # nan or inf within the window
+                for feat in feats:
+                    results[feat].append(math.nan)
+                continue
+            sy = m_sy[end] - m_sy[start]
+
+            # Average: sum(y)/n
+            if(doAvg):
+                results[AVG].append((sy + avgShift) / avgScale)
+
+            # Population Standard Deviation: sqrt(n*sum(y^2) - sum(y)^2)/n (shifting does not change it)
+            if(doStd):
+                syy = m_syy[end] - m_syy[start]
+                results[STD].append(math.sqrt(((count * syy) - (sy * sy)) / stdScale))
+
+            # Slope (line of regression): covariance of (time, data) over variance of time
+            if(doSlope):
+                sx = m_sx[end] - m_sx[start]
+                sxx = m_sxx[end] - m_sxx[start]
+                sxy = m_sxy[end] - m_sxy[start]
+                xtotal = (count * sxy) - (sx * sy)
+                ytotal = (count * sxx) - (sx * sx)
+                results[SLOPE].append((xtotal * self.m_dx) / (ytotal * self.m_dy))
+
+        return [results[feat] for feat in feats]
+
+###=-=-=-=-=-=-= END CLASS WINDOWSUMS =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS PAIRSUMS =-=-=-=-=-=-=###
+#
+#   PairSums - the sliding window engine of the synchrony of a pair, built once from the data both members have
+#   Cumulative sums of a (Team Leader), b (Partner), a^2, b^2, ab, |a - b| and of the Directional Agreement
+#   matches, so every window's Pearson correlation, mean difference and agreement ratio is O(1), as in WindowSums.
+#
+#   Both columns are scaled by one common power of two (see WindowSums.toExact()), so |a - b| is exact too; a and b
+#   are then shifted by their first value for the other sums, which the correlation does not depend on.
+#   A window where either member is nan or inf has a nan correlation and mean difference.
+#   matches (1 or 0 per line, see SyncPair.calcMatches()) can be passed in when the signs depend on earlier lines.
+#
+
+class PairSums:
+    __slots__ = ("m_len", "m_d", "m_sa", "m_sb", "m_saa", "m_sbb", "m_sab", "m_sdiff", "m_smatch", "m_sbad")
+
+    def __init__(self, dataA, dataB, maxlen, matches = None):
+        self.m_len = maxlen
+        self.calc(dataA, dataB, matches)
+
+    ############################################################################################
+    # calc() - Convert both columns once, then build the cumulative sums
+
+    def calc(self, dataA, dataB, matches):
+        count = self.m_len
+        values, self.m_d, flags = WindowSums.toExact(list(dataA[:count]) + list(dataB[:count]))
+        xs = values[:count]
+        ys = values[count:]
+        self.m_sbad = None if flags is None else WindowSums.countBad(flags[:count], flags[count:])
+        self.m_sdiff = list(accumulate(map(abs, map(operator.sub, xs, ys)), initial = 0))
+
+        x0 = xs[0] if xs else 0
+        y0 = ys[0] if ys else 0
+        xs = [x - x0 for x in xs]
+        ys = [y - y0 for y in ys]
+        self.m_sa  = list(accumulate(xs, initial = 0))
+        self.m_sb  = list(accumulate(ys, initial = 0))
+        self.m_saa = list(accumulate(map(operator.mul, xs, xs), initial = 0))
+        self.m_sbb = list(accumulate(map(operator.mul, ys, ys), initial = 0))
+        self.m_sab = list(accumulate(map(operator.mul, xs, ys), initial = 0))
+
+        if(matches is None):
+            matches = SyncPair.calcMatches(SyncPair.calcSigns(dataA, count), SyncPair.calcSigns(dataB, count))
+        self.m_smatch = list(accumulate(map(int, islice(matches, count)), initial = 0))
+
+    ############################################################################################
+    # calcWindows() - One pass over the windows of params (or the given starts) computes, for each:
+    #           Pearson correlation of a and b, nan when either does not change within the window
+    #           mean absolute difference, sum(|a - b|)/n
+    #           Directional Agreement ratio, the matches among the n - 1 positions after the first of the window,
+    #           counted like the DIRAG matches: positions where neither member has changed yet are matches too (nan for n < 2)
+    #           Returns [correlations, mean differences, agreement ratios]
+
+    def calcWindows(self, params, starts = None):
+        count = params[WIDTH]
+        results = [array('d'), array('d'), array('d')]
+        m_sa, m_sb, m_saa, m_sbb, m_sab, m_sbad = self.m_sa, self.m_sb, self.m_saa, self.m_sbb, self.m_sab, self.m_sbad
+        diffScale = count * self.m_d
+
+        if(starts is None):
+            starts = [params[START] + (i * params[INCRE]) for i in range(windowCount(params, self.m_len))]
+
+        for start in starts:
+            end = start + count
+            bad = m_sbad is not None and m_sbad[end] != m_sbad[start] # nan or inf within the window
+            sa = m_sa[end] - m_sa[start]
+            sb = m_sb[end] - m_sb[start]
+
+            # Pearson: (n*sum(ab) - sum(a)*sum(b)) / sqrt((n*sum(a^2) - sum(a)^2) * (n*sum(b^2) - sum(b)^2))
+            # Squared first and divided as integers (correctly rounded), since the square root of a variance this
+            # exact can be too large for a float
+            varA = (count * (m_saa[end] - m_saa[start])) - (sa * sa)
+            varB = (count * (m_sbb[end] - m_sbb[start])) - (sb * sb)
+            if(varA > 0 and varB > 0 and not bad):
+                cov = (count * (m_sab[end] - m_sab[start])) - (sa * sb)
+                r = math.sqrt((cov * cov) / (varA * varB))
+                results[0].append(r if cov >= 0 else -r)
+            else:
+                results[0].append(math.nan)
+
+            results[1].append(math.nan if bad else (self.m_sdiff[end] - self.m_sdiff[start]) / diffScale)
+
+            if(count > 1):
+                results[2].append((self.m_smatch[end] - self.m_smatch[start + 1]) / (count - 1))
+            else:
+                results[2].append(math.nan)
+
+        return results
+
+###=-=-=-=-=-=-= END CLASS PAIRSUMS =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS AGGREGATEINDEX =-=-=-=-=-=-=###
+#
+#   AggregateIndex - answers the statistics of any [start, end) range of lines of one file without going over the range:
+#   mean, standard deviation and slope in O(1), min and max in O(log n).
+#
+#   The exact integer sums of WindowSums (x, y, x^2, y^2, xy) are only kept at every BLOCK lines; the sums up to any
+#   line are the ones of its block plus the few lines before it, read from the columns. The results are the same as
+#   the CALCS features of a window over the same lines.
+#
+#   On top, a block pyramid holds the min, max, sum and sum of squares of the EDA of every block of BLOCK lines, then
+#   of every FAN blocks of the level below, up to one block for the whole file. A range takes the whole blocks it
+#   covers at the coarsest level it can, and only the lines at its ends one by one.
+#
+#   The index is kept in the parse cache folder, next to the file's cache file (see ParseCache.writeIndex()).
+#
+
+class AggregateIndex:
+    META = struct.Struct("<qqddIIIIdd") # time and EDA denominator exponents, first time and EDA, bytes per sum,
+                                        # BLOCK, FAN, levels, Z-Score average and standard deviation
+    BLOCK = 64
+    FAN = 16
+
+    __slots__ = ("m_count", "m_times", "m_values", "m_dx", "m_dy", "m_x0", "m_y0", "m_sums", "m_levels", "m_average", "m_standard",
+                 "m_finite")
+
+    def __init__(self, times, values):
+        self.m_count = len(values)
+        self.m_times = times # the columns of the file (arrays, or views of its cache file)
+        self.m_values = values
+        self.m_dx = self.m_dy = 1
+        self.m_x0 = self.m_y0 = 0
+        self.m_sums = [] # [sum x, sum y, sum x^2, sum y^2, sum xy] of the lines before every block
+        self.m_levels = [] # [mins, maxs, sums, squares] per level of the pyramid, finest first
+        self.m_average = self.m_standard = None # of the whole file, as Z-Score normalization takes them
+        self.m_finite = None # whether every time and EDA of the file is finite, found on the first query
+
+    ############################################################################################
+    # build() - Calculate the index from the columns, returns itself
+
+    def build(self):
+        xs, self.m_dx = WindowSums.toExact(self.m_times)[:2]
+        ys, self.m_dy = WindowSums.toExact(self.m_values)[:2]
+        self.m_x0 = xs[0] if xs else 0
+        self.m_y0 = ys[0] if ys else 0
+        xs = [x - self.m_x0 for x in xs]
+        ys = [y - self.m_y0 for y in ys]
+        products = [xs, ys, map(operator.mul, xs, xs), map(operator.mul, ys, ys), map(operator.mul, xs, ys)]
+        self.m_sums = [list(accumulate(column, initial = 0))[::self.BLOCK] for column in products]
+
+        # The finest level reads the EDA, each level above it the one below
+        values = self.m_values
+        level = [array('d'), array('d'), array('d'), array('d')]
+        for start in range(0, self.m_count, self.BLOCK):
+            block = values[start:start + self.BLOCK]
+            level[0].append(min(block))
+            level[1].append(max(block))
+            level[2].append(math.fsum(block))
+            level[3].append(math.fsum(map(operator.mul, block, block)))
+        self.m_levels = [level] if self.m_count > 0 else []
+        while(len(level[0]) > 1):
+            below = level
+            level = [array('d'), array('d'), array('d'), array('d')]
+            for start in range(0, len(below[0]), self.FAN):
+                end = start + self.FAN
+                level[0].append(min(below[0][start:end]))
+                level[1].append(max(below[1][start:end]))
+                level[2].append(math.fsum(below[2][start:end]))
+                level[3].append(math.fsum(below[3][start:end]))
+            self.m_levels.append(level)
+
+        if(self.m_count > 0):
+            self.m_average, self.m_standard = ZSNormData.stats(values)
+        return self
+
+    ############################################################################################
+    # blockSize() - Lines per block of a level of the pyramid (0 is the finest)
+
+    def blockSize(self, level):
+        return self.BLOCK * (self.FAN ** level)
+
+    ############################################################################################
+    # sumsTo() - The exact sums [x, y, x^2, y^2, xy] of the lines before line end
+
+    def sumsTo(self, end):
+        block = end // self.BLOCK
+        sx, sy, sxx, syy, sxy = [column[block] for column in self.m_sums]
+        first = block * self.BLOCK
+        for time, value in zip(self.m_times[first:end], self.m_values[first:end]):
+            x = WindowSums.toInteger(time, self.m_dx) - self.m_x0
+            y = WindowSums.toInteger(value, self.m_dy) - self.m_y0
+            sx += x
+            sy += y
+            sxx += x * x
+            syy += y * y
+            sxy += x * y
+        return [sx, sy, sxx, syy, sxy]
+
+    ############################################################################################
+    # extremes() - The [min, max] of the EDA of lines [start, end), climbing the pyramid from both ends of the range
+
+    def extremes(self, start, end):
+        lows = []
+        highs = []
+        size = 1
+        for depth in range(len(self.m_levels) + 1):
+            if(depth == 0):
+                mins = maxs = self.m_values
+            else:
+                mins, maxs = self.m_levels[depth - 1][0], self.m_levels[depth - 1][1]
+
+            # The ends of the range not lined up with the blocks of the next level are taken at this one
+            if(depth < len(self.m_levels)):
+                nextSize = self.blockSize(depth)
+                head = min(end, -(-start // nextSize) * nextSize)
+                tail = max(head, (end // nextSize) * nextSize)
+            else:
+                head = tail = end
+            for first, last in ((start, head), (tail, end)):
+                if(last > first):
+                    lows.append(min(mins[first // size:last // size]))
+                    highs.append(max(maxs[first // size:last // size]))
+            start, end = head, tail
+            if(start >= end):
+                break
+            size = nextSize
+        return [min(lows), max(highs)]
+
+    ############################################################################################
+    # query() - The statistics of the EDA of lines [start, end): count, mean, std (population), slope (over time), min, max
+    #           Worked out the same way as WindowSums.calcWindows(); std is 0 for one line, slope is nan when time does not change
+
+    def query(self, start, end):
+        if(start < 0 or end > self.m_count or start >= end):
+            raise IndexError("Lines %s to %s are not within the %s lines of the file" % (start, end, self.m_count))
+        count = end - start
+        if(self.m_finite is None):
+            self.m_finite = math.isfinite(sum(self.m_times)) and math.isfinite(sum(self.m_values))
+        if(not self.m_finite and not (all(map(math.isfinite, self.m_times[start:end])) and all(map(math.isfinite, self.m_values[start:end])))):
+            # nan or inf within the range (taken as 0 by the sums)
+            return {"start": start, "end": end, "count": count, "mean": math.nan, "std": math.nan, "slope": math.nan, "min": math.nan, "max": math.nan}
+        sx, sy, sxx, syy, sxy = map(operator.sub, self.sumsTo(end), self.sumsTo(start))
+
+        mean = (sy + (count * self.m_y0)) / (count * self.m_dy)
+        std = math.sqrt(((count * syy) - (sy * sy)) / (count * count * self.m_dy * self.m_dy))
+        xtotal = (count * sxy) - (sx * sy)
+        ytotal = (count * sxx) - (sx * sx)
+        slope = (xtotal * self.m_dx) / (ytotal * self.m_dy) if ytotal != 0 else math.nan
+        low, high = self.extremes(start, end)
+        return {"start": start, "end": end, "count": count, "mean": mean, "std": std, "slope": slope, "min": low, "max": high}
+
+    ############################################################################################
+    # blocks() - The EDA of the file at the resolution of a level of the pyramid: [starts, mins, maxs, means, stds]
+    #           (the last block may be shorter)
+
+    def blocks(self, level):
+        size = self.blockSize(level)
+        mins, maxs, sums, squares = self.m_levels[level]
+        starts = range(0, self.m_count, size)
+        counts = [min(size, self.m_count - start) for start in starts]
+        means = array('d', map(operator.truediv, sums, counts))
+        stds = array('d', (math.sqrt(max(0.0, (square / count) - (mean * mean))) for square, count, mean in zip(squares, counts, means)))
+        return [list(starts), mins, maxs, means, stds]
+
+    ############################################################################################
+    # toBytes() / fromBytes() - The index as stored after its header in the cache folder, and back
+    #           The sums are little endian signed integers of the same width, the pyramid little endian float64
+    #           fromBytes() returns None if the bytes do not hold a whole index of count lines
+
+    def toBytes(self):
+        width = max((abs(value).bit_length() for column in self.m_sums for value in column), default = 0) // 8 + 1
+        meta = self.META.pack(self.m_dx.bit_length() - 1, self.m_dy.bit_length() - 1,
+                              self.m_times[0] if self.m_count else 0.0, self.m_values[0] if self.m_count else 0.0,
+                              width, self.BLOCK, self.FAN, len(self.m_levels),
+                              self.m_average if self.m_count else 0.0, self.m_standard if self.m_count else 0.0)
+        parts = [meta]
+        for column in self.m_sums:
+            parts.extend(value.to_bytes(width, "little", signed = True) for value in column)
+        for level in self.m_levels:
+            for column in level:
+                if(sys.byteorder != "little"):
+                    column = array('d', column)
+                    column.byteswap()
+                parts.append(column.tobytes())
+        return b"".join(parts)
+
+    @staticmethod
+    def fromBytes(view, times, values):
+        index = AggregateIndex(times, values)
+        dxBits, dyBits, time0, value0, width, block, fan, levels, average, standard = AggregateIndex.META.unpack_from(view)
+        if(block != index.BLOCK or fan != index.FAN):
+            return None
+        index.m_dx = 1 << dxBits
+        index.m_dy = 1 << dyBits
+        index.m_x0 = WindowSums.toInteger(time0, index.m_dx)
+        index.m_y0 = WindowSums.toInteger(value0, index.m_dy)
+        if(index.m_count > 0):
+            index.m_average, index.m_standard = average, standard
+
+        at = AggregateIndex.META.size
+        entries = (index.m_count // block) + 1
+        for i in range(5):
+            index.m_sums.append([int.from_bytes(view[at + (j * width):at + ((j + 1) * width)], "little", signed = True) for j in range(entries)])
+            at += entries * width
+        for depth in range(levels):
+            blocks = -(-index.m_count // index.blockSize(depth))
+            level = []
+            for i in range(4):
+                column = array('d')
+                column.frombytes(view[at:at + (8 * blocks)])
+                if(sys.byteorder != "little"):
+                    column.byteswap()
+                level.append(column)
+                at += 8 * blocks
+            index.m_levels.append(level)
+        if(at != len(view) or any(len(column) != entries for column in index.m_sums)):
+            return None
+        return index
+
+###=-=-=-=-=-=-= END CLASS AGGREGATEINDEX =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS FEATURECACHE =-=-=-=-=-=-=###
+#
+#   FeatureCache - the window feature results of one dataset, keyed by (feature, normalization, window
+#   parameters), holding at most FEATURE_CACHE of them. Using an entry makes it the most recent one;
+#   adding one past the limit drops the least recently used.
+#
+
+class FeatureCache:
+    __slots__ = ("m_size", "m_entries")
+
+    def __init__(self, size = FEATURE_CACHE):
+        self.m_size = size
+        self.m_entries = OrderedDict()
+
+    #
+    # key() - The key of a feature of data normalized by normType, in the given window parameters
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def key(feat, normType, params):
+        return (feat, normType, tuple(params))
+
+    def get(self, key):
+        values = self.m_entries.get(key)
+        if(values is not None):
+            self.m_entries.move_to_end(key)
+        return values
+
+    def put(self, key, values):
+        self.m_entries[key] = values
+        self.m_entries.move_to_end(key)
+        while(len(self.m_entries) > self.m_size):
+            self.m_entries.popitem(last = False)
+
+    def clear(self):
+        self.m_entries.clear()
+
+###=-=-=-=-=-=-= END CLASS FEATURECACHE =-=-=-=-=-=-=###
+
+
+
 ###=-=-=-=-=-=-= BEGIN CLASS AVGDATA =-=-=-=-=-=-=###
+#
+#   The feature classes below each take the WindowSums of a dataset. If the values were already
+#   computed together with other features (NameData.calcFeatures), they are passed in directly.
+#
 
 class AvgData:
-    def __init__(self, data, params):
-        self.m_data = data
-        self.calc(params)
+    __slots__ = ("m_data", "m_avg")
+
+    def __init__(self, sums, params, values = None):
+        self.m_data = sums
+        if(values is None):
+            self.calc(params)
+        else:
+            self.m_avg = self.m_data = values
 
     ############################################################################################
     # calcAvg() - Calculate and produce an array of average EDA in the given window parameters
 
     def calc(self, params):
-        sectTime = params[WIDTH]
-        incrTime = params[INCRE]
-        windowCt = params[COUNT]
-        start = params[START]
-        end = start + sectTime
-        tempCt = 0
-
-        self.m_avg = []
-        # Continuously calculate averages until window is out of bounds
-        while(end < len(self.m_data) and (tempCt < windowCt or windowCt <= 0)):
-            num = 0.0
-            # Calculate sum of data in window
-            for i in range(start, end):
-                num += float(self.m_data[i][1])
-            self.m_avg.append(num/sectTime) # Add average to list of averages
-            
-            # Next window bounds
-            start  += incrTime
-            end    += incrTime
-            tempCt += 1
-        
+        # Average of every window, each one read straight from the cumulative sums
+        self.m_avg = self.m_data.calcWindows(params, [AVG])[0]
+
         self.m_data = self.m_avg
 
 ###=-=-=-=-=-=-= END CLASS AVGDATA =-=-=-=-=-=-=###
@@ -85,41 +695,21 @@ class AvgData:
 ###=-=-=-=-=-=-= BEGIN CLASS STDDATA =-=-=-=-=-=-=###
 
 class StdData:
-    def __init__(self, data, params, avg):
-        self.m_data = data
-        self.calc(params, avg)
+    __slots__ = ("m_data", "m_std")
+
+    def __init__(self, sums, params, values = None):
+        self.m_data = sums
+        if(values is None):
+            self.calc(params)
+        else:
+            self.m_std = self.m_data = values
 
     ###################################################################################################
     # calcStd() - Calculate and produce an array of standard deviation in the given window parameters
 
-    def calc(self, params, avg):
-        sectTime = params[WIDTH]
-        incrTime = params[INCRE]
-        windowCt = params[COUNT]
-        start = params[START]
-        end = start + sectTime
-        tempCt = 0
-
-        self.m_std = []
-        # Continuously calculate standard deviation until window is out of bounds
-        # Standard Deviation:
-        while(end < len(self.m_data) and (tempCt < windowCt or windowCt <= 0)):
-            # 1. Take the average of the original set
-            firstAvg = avg.m_data[tempCt]
-
-            # 2. For each number of the original set, substract average, then square result
-            num = 0.0
-            for i in range(start, end):
-                num += (math.pow((float(self.m_data[i][1]) - firstAvg), 2))
-
-            # 3. Find the average of the new squared set
-            # 4. Square root the average of the new squared set
-            self.m_std.append(math.sqrt(num/sectTime))
-
-            # Next window bounds
-            start  += incrTime
-            end    += incrTime
-            tempCt += 1
+    def calc(self, params):
+        # Standard Deviation (population) of every window, from the sums of data and data squared
+        self.m_std = self.m_data.calcWindows(params, [STD])[0]
 
         self.m_data = self.m_std
 
@@ -130,47 +720,21 @@ class StdData:
 ###=-=-=-=-=-=-= BEGIN CLASS SLOPEDATA =-=-=-=-=-=-=###
 
 class SlopeData:
-    def __init__(self, data, params):
-        self.m_data = data
-        self.calc(params)
+    __slots__ = ("m_data", "m_slope")
+
+    def __init__(self, sums, params, values = None):
+        self.m_data = sums
+        if(values is None):
+            self.calc(params)
+        else:
+            self.m_slope = self.m_data = values
 
     ###################################################################################################
     # calcSlope() - Calculate and produce an array of slope in the given window parameters
 
     def calc(self, params):
-        sectTime = params[WIDTH]
-        incrTime = params[INCRE]
-        windowCt = params[COUNT]
-        start = params[START]
-        end = start + sectTime
-        tempCt = 0
-
-        self.m_slope = []
-        # Continuously calculate slope until window is out of bounds
-        # Slope:
-        while(end < len(self.m_data) and (tempCt < windowCt or windowCt <= 0)):
-            # Sum of the window (time = tnum, data = dnum)
-            tnum = dnum = 0.0
-            for i in range(start, end):
-                tnum += float(self.m_data[i][0])
-                dnum += float(self.m_data[i][1])
-            
-            # x is Time ; y is Data
-            xavg = tnum/sectTime
-            yavg = dnum/sectTime
-
-            # Calculate average slope (line of regression)
-            xtotal = ytotal = 0
-            for j in range(start, end):
-                xtotal += (float(self.m_data[j][0]) - xavg) * (float(self.m_data[j][1]) - yavg)
-                ytotal += math.pow((float(self.m_data[j][0]) - xavg), 2)
-
-            self.m_slope.append(xtotal/ytotal)
-
-            # Next window bounds
-            start  += incrTime
-            end    += incrTime
-            tempCt += 1
+        # Slope (line of regression, x is Time ; y is Data) of every window
+        self.m_slope = self.m_data.calcWindows(params, [SLOPE])[0]
 
         self.m_data = self.m_slope
 
@@ -181,6 +745,8 @@ class SlopeData:
 ###=-=-=-=-=-=-= BEGIN CLASS MMNORMDATA =-=-=-=-=-=-=###
 
 class MMNormData:
+    __slots__ = ("m_data", "m_minmax")
+
     def __init__(self, data):
         self.m_data = data
         self.calc()
@@ -198,19 +764,12 @@ class MMNormData:
     # calcmMNorm() - Calculate and replace NameData.data with minmax normalized data
 
     def calc(self):
-        un_norm_values = []
-        times = []
-        for data in self.m_data: # data = [time, EDA]
-            times.append(data[0])
-            un_norm_values.append(float(data[1]))
+        un_norm_values = self.m_data # column of EDA
 
         minv = min(un_norm_values)
         maxv = max(un_norm_values)
 
-        self.m_minmax = []
-        for i in range(len(times)):
-            norm_value = self.normalize(un_norm_values[i], minv, maxv)
-            self.m_minmax.append([times[i], norm_value])
+        self.m_minmax = array('d', (self.normalize(value, minv, maxv) for value in un_norm_values))
 
         # Setting data to norm: If normalization was picked, is main data
         #                       If calculations were picked first, it's still main data anyway
@@ -223,6 +782,8 @@ class MMNormData:
 ###=-=-=-=-=-=-= BEGIN CLASS ZSNORMDATA =-=-=-=-=-=-=###
 
 class ZSNormData:
+    __slots__ = ("m_data", "m_zscore")
+
     def __init__(self, data):
         self.m_data = data
         self.calc()
@@ -235,20 +796,19 @@ class ZSNormData:
     @staticmethod
     def normalize(value, average, standard):
         return (value - average)/standard
-        
-    ##################################################################################
-    # calczSNorm() - Calculate and replace NameData.data with zscore normalized data
-    def calc(self):
-        un_norm_values = []
-        times = []
-        num = total = 0
 
-        # Append un-normalized values, times, and calculate average
-        for data in self.m_data: # data = [time, EDA]
-            times.append(data[0])
-            un_norm_values.append(float(data[1]))
-            total += float(data[1])
-            num += 1
+    #####################################################
+    # stats() - The [average, standard deviation] of a column of EDA that normalize() takes
+    #           staticmethod due to not using self values (AggregateIndex keeps them too)
+
+    @staticmethod
+    def stats(un_norm_values):
+        num = len(un_norm_values)
+        total = 0
+
+        # Calculate average
+        for val in un_norm_values:
+            total += val
 
         # Find Standard Deviation
         average = total/num
@@ -259,563 +819,3429 @@ class ZSNormData:
 
         sqavg = total/num
         standard = math.sqrt(sqavg)
-
-        self.m_zscore = []
-        for i in range(len(times)):
-            norm_value = self.normalize(un_norm_values[i], average, standard)
-            self.m_zscore.append([times[i], norm_value])
+        return [average, standard]
         
+    ##################################################################################
+    # calczSNorm() - Calculate and replace NameData.data with zscore normalized data
+    def calc(self):
+        un_norm_values = self.m_data # column of EDA
+        average, standard = self.stats(un_norm_values)
+
+        self.m_zscore = array('d', (self.normalize(value, average, standard) for value in un_norm_values))
+
         self.m_data = self.m_zscore
 
 ###=-=-=-=-=-=-= END CLASS ZSNORMDATA =-=-=-=-=-=-=###
 
 
 
-###=-=-=-=-=-=-= BEGIN CLASS CLAM =-=-=-=-=-=-=###
+###=-=-=-=-=-=-= BEGIN CLASS PARSEREPORT =-=-=-=-=-=-=###
+#
+#   ParseReport - what parsing one data file found: its lines, the ones that became data, and the ones skipped,
+#   as blank, comment (beginning with '#') or malformed (not two numbers, e.g. a header line or a cut off line).
+#   The first few malformed lines are kept, to show where they are; a report taken from the parse cache only has the counts.
+#
+
+class ParseReport:
+    __slots__ = ("m_name", "m_lines", "m_parsed", "m_blank", "m_comment", "m_malformed", "m_examples")
+    COMMENT = b"#"
+    EXAMPLES = 3 # malformed lines kept
+
+    def __init__(self, name = None):
+        self.m_name = name
+        self.m_lines = 0
+        self.m_parsed = 0
+        self.m_blank = 0
+        self.m_comment = 0
+        self.m_malformed = 0
+        self.m_examples = [] # [line number, line] of the first malformed lines
+
+    # malformed() - Count a malformed line (the last line counted)
+
+    def malformed(self, line):
+        self.m_malformed += 1
+        if(len(self.m_examples) < self.EXAMPLES):
+            self.m_examples.append([self.m_lines, line.strip().decode("utf-8", "replace")[:40]])
+
+    # fromHeader() - Take the counts kept in a parse cache header (see ParseCache)
+
+    def fromHeader(self, fields):
+        self.m_parsed = fields[4]
+        self.m_blank, self.m_comment, self.m_malformed = fields[6:9]
+        self.m_lines = self.m_parsed + self.skipped()
+
+    def skipped(self):
+        return self.m_blank + self.m_comment + self.m_malformed
+
+    # summary() - One line telling what was skipped, for the console
+
+    def summary(self):
+        text = "[WARN] \"%s\": %s of %s lines skipped (%s blank, %s comment, %s malformed)" % (self.m_name, self.skipped(),
+                self.m_lines, self.m_blank, self.m_comment, self.m_malformed)
+        if(len(self.m_examples) > 0):
+            text += ", malformed: " + ", ".join("line %s \"%s\"" % (number, line) for number, line in self.m_examples)
+        return text
+
+    # record() - The report as a dictionary, for the metrics file
+
+    def record(self):
+        return {"name": self.m_name, "lines": self.m_lines, "parsed": self.m_parsed, "blank": self.m_blank,
+                "comment": self.m_comment, "malformed": self.m_malformed,
+                "first_malformed": [{"line": number, "text": line} for number, line in self.m_examples]}
+
+###=-=-=-=-=-=-= END CLASS PARSEREPORT =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS PARSECACHE =-=-=-=-=-=-=###
+#
+#   ParseCache - the parsed time and EDA columns of the files of a folder, kept in its "-cache" folder
+#   (the '-' keeps Clam from reading it as a data file).
+#
+#   Each data file gets one binary file: a 64 byte header, then the time column, then the EDA column,
+#   both as little endian float64. The header holds the size and modification time (in ns) the data
+#   file had when it was parsed, the amount of data lines, its SHA-256 (zeros if CACHE_HASH was off),
+#   and the blank, comment and malformed lines parsing skipped (see ParseReport).
+#   The columns start at fixed offsets, so the file is memory mapped and copied straight into arrays.
+#
+#   A file's AggregateIndex, once built, is kept beside its cache file (".idx" instead of ".bin"), under the same
+#   header with its own magic, so it is rebuilt whenever the data file changes.
+#
+
+class ParseCache:
+    HEADER = struct.Struct("<4sIqqQ32sQQQ") # magic, version, size, mtime_ns, count, sha256, blank, comment, malformed
+    MAGIC = b"EDAC"
+    INDEX_MAGIC = b"EDAI"
+    VERSION = 2
 
-class Clam:
     def __init__(self, folderPath):
-        self.m_datasets = self.readFolder(folderPath)
+        self.m_folder = folderPath
+        self.m_path = folderPath + "\\" + CACHE_FOLDER + "\\"
 
     #
-    #           PER FILE
-    # readFile() - Read the file and produce an array of time-EDA pairs
+    # fileHash() - SHA-256 of the contents of a data file, or zeros if CACHE_HASH is off
+    # contentHash() - SHA-256 of the contents of a data file (also the address of its results, see ResultCache)
     #
 
-    def readFile(self, folderPath, fileName):
-        filePath = folderPath + "\\" + fileName
-        with open(filePath, "r") as dataFile:
-            # Data is extracted as ["Time Data"] per line
-            pairs = dataFile.readlines()
-
-        # Data is adjusted as  [Time, Data] per line
-        for i in range(len(pairs)):
-            pairs[i] = pairs[i].strip()
-            pairs[i] = pairs[i].split()
+    def fileHash(self, fileName):
+        if(not CACHE_HASH):
+            return bytes(32)
+        return self.contentHash(fileName)
 
-        return pairs
+    def contentHash(self, fileName):
+        digest = hashlib.sha256()
+        with open(self.m_folder + "\\" + fileName, "rb") as dataFile:
+            chunk = dataFile.read(READ_CHUNK)
+            while(chunk):
+                digest.update(chunk)
+                chunk = dataFile.read(READ_CHUNK)
+        return digest.digest()
 
     #
-    #           PER FOLDER
-    # readFolder() - Take a path and produce an array of [name, arrays of time-EDA pairs]
+    # read() - Produce the cached time and EDA columns of a data file, or None if there are none
+    #           or the data file has changed since (stat is the data file's os.stat)
     #
 
-    def readFolder(self, folderPath):
-        setOfNameData = []
-        print("\nProcessing files in folder path: " + folderPath)
-        for fileName in os.listdir(folderPath):
-            if(fileName[:1] != "-"): # Exempt files begin with '-'
-                print("File name: " + fileName)
-                namedata = NameData(fileName, self.readFile(folderPath,fileName))
-                setOfNameData.append(namedata)
-        return setOfNameData
+    def read(self, fileName, stat, report = None):
+        try:
+            with open(self.m_path + fileName + ".bin", "rb") as cacheFile:
+                with mmap.mmap(cacheFile.fileno(), 0, access = mmap.ACCESS_READ) as view:
+                    count = self.check(view, fileName, stat)
+                    if(count is None):
+                        return None
+                    if(report is not None):
+                        report.fromHeader(self.HEADER.unpack_from(view))
+
+                    start = self.HEADER.size
+                    times = array('d')
+                    values = array('d')
+                    times.frombytes(view[start:start + (8 * count)])
+                    values.frombytes(view[start + (8 * count):start + (16 * count)])
+        except (OSError, ValueError, struct.error):
+            return None
+
+        if(sys.byteorder != "little"):
+            times.byteswap()
+            values.byteswap()
+        return times, values
 
     #
-    # setPairs() - If synchrony is enabled, set a member variable containing the array of pairs
+    # check() - The amount of lines in a memory mapped cache file, or None if it is not a copy of the data file as it is now
     #
 
-    def setPairs(self, pairs):
-        self.m_pairs = pairs
+    def check(self, view, fileName, stat, magic = MAGIC):
+        cacheMagic, version, size, mtime, count, digest = self.HEADER.unpack_from(view)[:6]
+        if(cacheMagic != magic or version != self.VERSION):
+            return None
+        if(size != stat.st_size or mtime != stat.st_mtime_ns):
+            return None
+        if(CACHE_HASH and digest != self.fileHash(fileName)):
+            return None
+        if(magic == self.MAGIC and len(view) != self.HEADER.size + (16 * count)):
+            return None
+        return count
 
-###=-=-=-=-=-=-= END CLASS CLAM =-=-=-=-=-=-=###
+    #
+    # report() - Fill a ParseReport from the cache file of a data file, returns False if it has no usable one
+    #
 
+    def report(self, fileName, stat, report):
+        try:
+            with open(self.m_path + fileName + ".bin", "rb") as cacheFile:
+                with mmap.mmap(cacheFile.fileno(), 0, access = mmap.ACCESS_READ) as view:
+                    if(self.check(view, fileName, stat) is None):
+                        return False
+                    report.fromHeader(self.HEADER.unpack_from(view))
+                    return True
+        except (OSError, ValueError, struct.error):
+            return False
 
+    #
+    # view() - The cached time and EDA columns of a data file as views of the memory mapped cache file, without copying
+    #           them (only the lines used are read), or None where read() would return None
+    #           On big endian machines the columns are copied by read() instead
+    #
 
-###=-=-=-=-=-=-= BEGIN CLASS NAMEDATA =-=-=-=-=-=-=###
+    def view(self, fileName, stat):
+        if(sys.byteorder != "little"):
+            return self.read(fileName, stat)
+        try:
+            with open(self.m_path + fileName + ".bin", "rb") as cacheFile:
+                view = mmap.mmap(cacheFile.fileno(), 0, access = mmap.ACCESS_READ)
+            count = self.check(view, fileName, stat)
+            if(count is None):
+                view.close()
+                return None
+        except (OSError, ValueError, struct.error):
+            return None
+
+        # The views keep the map open for as long as they are used
+        start = self.HEADER.size
+        columns = memoryview(view)[start:start + (16 * count)].cast('d')
+        return columns[:count], columns[count:]
 
-class NameData:
-    def __init__(self, name, data):
-        self.m_name = name # original filename
-        self.m_orig = data # array of [time, data] (BEFORE NORMALIZATION [if applicable])
-        self.m_data = data # array of [time, data]
+    #
+    # readIndex() - The AggregateIndex of a data file over its columns, or None if it has none for the data file as it is now
+    #
 
-    # The following calculation-related arrays are single lists example: m_avg = [data, data, data, data, ...]
+    def readIndex(self, fileName, stat, times, values):
+        try:
+            with open(self.m_path + fileName + ".idx", "rb") as indexFile:
+                with mmap.mmap(indexFile.fileno(), 0, access = mmap.ACCESS_READ) as view:
+                    count = self.check(view, fileName, stat, self.INDEX_MAGIC)
+                    if(count is None or count != len(values)):
+                        return None
+                    return AggregateIndex.fromBytes(view[self.HEADER.size:], times, values)
+        except (OSError, ValueError, struct.error):
+            return None
 
-    def calcAvg(self, params):
-        self.m_avg = AvgData(self.m_data, params)
+    #
+    # writeIndex() - Keep the AggregateIndex of a data file (through a temporary file, like write())
+    #
 
-    def calcStd(self, params):
-        self.m_std = StdData(self.m_data, params, self.m_avg)
+    def writeIndex(self, fileName, stat, index):
+        indexPath = self.m_path + fileName + ".idx"
+        try:
+            os.makedirs(self.m_path, exist_ok = True)
+            header = self.HEADER.pack(self.INDEX_MAGIC, self.VERSION, stat.st_size, stat.st_mtime_ns, index.m_count, self.fileHash(fileName), 0, 0, 0)
+            with open(indexPath + ".tmp", "wb") as indexFile:
+                indexFile.write(header)
+                indexFile.write(index.toBytes())
+            os.replace(indexPath + ".tmp", indexPath)
+        except OSError:
+            print("[WARN] Aggregate index for \"%s\" could not be written." % fileName)
 
-    def calcSlope(self, params):
-        self.m_slope = SlopeData(self.m_data, params)
+    #
+    # count() - The amount of lines in the cache file of a data file, or None if it has no usable one (see check())
+    #
 
-    def calcMMnorm(self):
-        self.m_NormData = MMNormData(self.m_orig)
-        self.m_data = self.m_NormData.m_data
+    def count(self, fileName, stat):
+        try:
+            with open(self.m_path + fileName + ".bin", "rb") as cacheFile:
+                with mmap.mmap(cacheFile.fileno(), 0, access = mmap.ACCESS_READ) as view:
+                    return self.check(view, fileName, stat)
+        except (OSError, ValueError, struct.error):
+            return None
 
-    def calcZSnorm(self):
-        self.m_NormData = ZSNormData(self.m_orig)
-        self.m_data = self.m_NormData.m_data
+    #
+    # readChunks() - Produce the cached columns of a data file chunkLines lines at a time (out-of-core mode)
+    #           The cache file is memory mapped, so only the chunk being copied out is read from it
+    #
 
+    def readChunks(self, fileName, chunkLines):
+        with open(self.m_path + fileName + ".bin", "rb") as cacheFile:
+            with mmap.mmap(cacheFile.fileno(), 0, access = mmap.ACCESS_READ) as view:
+                count = self.HEADER.unpack_from(view)[4]
+                timesAt = self.HEADER.size
+                valuesAt = timesAt + (8 * count)
+                for start in range(0, count, chunkLines):
+                    end = min(start + chunkLines, count)
+                    times = array('d')
+                    values = array('d')
+                    times.frombytes(view[timesAt + (8 * start):timesAt + (8 * end)])
+                    values.frombytes(view[valuesAt + (8 * start):valuesAt + (8 * end)])
+                    if(sys.byteorder != "little"):
+                        times.byteswap()
+                        values.byteswap()
+                    yield times, values
 
-    #######################################################################################################
-    # writeFile() - Writes the output files for both calculation and normalization depending on writeType
+    #
+    # build() - Parse a data file into its cache file a piece at a time, without holding its columns (out-of-core mode)
+    #           The EDA column goes to a temporary file until the time column is complete, then follows it
+    #           Returns whether the cache file could be written
+    #
 
-    def writeFile(self, outputPath, params, writeType, doFeat, normType = -1):
+    def build(self, fileName, stat):
+        cachePath = self.m_path + fileName + ".bin"
         try:
-            dataLength = len(self.m_data)
-            calcs = []
-            if(writeType == CALCS):
-                sectTime = params[WIDTH]
-                incrTime = params[INCRE]
-                windowCt = params[COUNT]
-                startPos = params[START]
+            os.makedirs(self.m_path, exist_ok = True)
+            count = 0
+            report = ParseReport(fileName)
+            with open(cachePath + ".tmp", "wb") as cacheFile:
+                with tempfile.TemporaryFile() as valueFile:
+                    cacheFile.write(bytes(self.HEADER.size))
+                    for times, values in Clam.parseChunks(self.m_folder, fileName, report):
+                        if(sys.byteorder != "little"):
+                            times.byteswap()
+                            values.byteswap()
+                        times.tofile(cacheFile)
+                        values.tofile(valueFile)
+                        count += len(times)
+                    valueFile.seek(0)
+                    shutil.copyfileobj(valueFile, cacheFile, READ_CHUNK)
+                cacheFile.seek(0)
+                cacheFile.write(self.HEADER.pack(self.MAGIC, self.VERSION, stat.st_size, stat.st_mtime_ns, count, self.fileHash(fileName),
+                                                 report.m_blank, report.m_comment, report.m_malformed))
+            os.replace(cachePath + ".tmp", cachePath)
+            return True
+        except OSError:
+            print("[WARN] Parse cache for \"%s\" could not be written." % fileName)
+            return False
+        finally:
+            if(os.path.exists(cachePath + ".tmp")):
+                os.remove(cachePath + ".tmp")
 
-                if(doFeat[AVG]):
-                    calcs.append(self.m_avg.m_data)
-                if(doFeat[STD]):
-                    calcs.append(self.m_std.m_data)
-                if(doFeat[SLOPE]):
-                    calcs.append(self.m_slope.m_data)
+    #
+    # write() - Keep the columns of a data file (stat is the os.stat taken before it was parsed), and the lines its
+    #           ParseReport skipped
+    #           Written to a temporary file first, so a cache file is never left half written
+    #
 
-            # newName: AVG_ct#_width_increment_start_originalfile.txt
-            newFName = ""
-            if(writeType == CALCS):
-                newFName = "CALCS_ct" + str(windowCt) + "_w" + str(sectTime) + "_i" + str(incrTime) + "_s" + str(startPos) + "_" + self.m_name
-            elif(writeType == NORMS):
-                newFName = "NORM_" + self.m_name
-                if(normType == MM_NORM):
-                    newFName = "NORM_MM_" + self.m_name
-                if(normType == ZS_NORM):
-                    newFName = "NORM_ZS_" + self.m_name
-            
-            newFPath = outputPath + newFName
+    def write(self, fileName, stat, times, values, report = None):
+        cachePath = self.m_path + fileName + ".bin"
+        if(report is None):
+            report = ParseReport(fileName)
+        try:
+            os.makedirs(self.m_path, exist_ok = True)
+            header = self.HEADER.pack(self.MAGIC, self.VERSION, stat.st_size, stat.st_mtime_ns, len(times), self.fileHash(fileName),
+                                      report.m_blank, report.m_comment, report.m_malformed)
+            if(sys.byteorder != "little"):
+                times = array('d', times)
+                values = array('d', values)
+                times.byteswap()
+                values.byteswap()
+            with open(cachePath + ".tmp", "wb") as cacheFile:
+                cacheFile.write(header)
+                times.tofile(cacheFile)
+                values.tofile(cacheFile)
+            os.replace(cachePath + ".tmp", cachePath)
+        except OSError:
+            print("[WARN] Parse cache for \"%s\" could not be written." % fileName)
+
+###=-=-=-=-=-=-= END CLASS PARSECACHE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS RESULTCACHE =-=-=-=-=-=-=###
+#
+#   ResultCache - calculated results of one data file, kept in the "results" folder of its "-cache" folder
+#   (see RESULT_CACHE), so they outlive the run, unlike the FeatureCache.
+#
+#   Results are content addressed: an entry is named after the SHA-256 of the data file's contents (both
+#   members' for a pair) and of the key of the result (what was calculated, the normalization and the window
+#   parameters), so a renamed or copied file finds its results, and a changed one never finds stale ones.
+#   CALCULATION is hashed in too: it is raised whenever a cached calculation gives different results than before,
+#   so results of an older version of the program are not read back.
+#
+#   Each entry is one binary file: a 12 byte header (magic, version, column count), then the type code and
+#   length of each column, then each column in turn as little endian values. Reading an entry makes it the most
+#   recently used (its modification time); trim() drops the least recently used past RESULT_CACHE_SIZE.
+#
 
-            # Write new file
-            with open(newFPath, "w+") as newF:
-                
-                ##########################
-                ### Calculation Output ###
-                ##########################
+class ResultCache:
+    __slots__ = ("m_path", "m_digest")
+    HEADER = struct.Struct("<4sII") # magic, version, column count
+    COLUMN = struct.Struct("<cQ") # type code, length
+    MAGIC = b"EDAR"
+    VERSION = 1
+    CALCULATION = 2 # version of the calculations whose results are kept; raise it when any of them changes
 
-                if(writeType == CALCS):
-                    # Name of the original file
-                    if(doFeat[NORMS]):
-                        newF.write("[NOTE] File was normalized prior to calculation.\n\n")
-                    newF.write("Calculations of file: " + self.m_name + "\n\n")
-
-                    # Writing details of the windows
-                    newF.write("[Details]\n")
-                    newF.write("Window Count: %s\n" % (windowCt))
-                    newF.write("Window width: %s lines of data, or %s seconds\n" % (sectTime, sectTime/4))
-                    newF.write("Increments: Every %s lines of data, or %s seconds\n" % (incrTime, incrTime/4))
-                    newF.write("Starting Position: line %s, or %s seconds\n\n" % (startPos, startPos/4))
-                    # newF.write("Timestamps are exclusive. Notation: [start, end)\n\n")
-
-                    headers = "Time:\t\t\t\t"
-                    if(doFeat[AVG]):
-                        headers = headers + "Average\t\t"
-                    if(doFeat[STD]):
-                        headers = headers + "Standard Dev.\t"
-                    if(doFeat[SLOPE]):
-                        headers = headers + "Slope\t\t"
+    def __init__(self, folderPath, fileName):
+        self.m_path = self.path(folderPath)
+        self.m_digest = ParseCache(folderPath).contentHash(fileName)
 
-                    newF.write(headers + "\n")
+    #
+    # path() - The folder the results of the files of a data folder are kept in
+    #           staticmethod due to not using self values
+    #
 
-                    # List of the timestamps and average per timestamp
-                    dataRange = windowCt
-                    if(dataRange <= 0): # Window count was set to unlimited
-                        dataRange = int(len(calcs[0])) # No need to check which is the least since same window count as other calcs
-                    for i in range(dataRange):
-                        start = (startPos/4) + (i * (incrTime/4))
-                        end = (startPos/4) + (i * (incrTime/4)) + (sectTime/4) - (1/4) # Subtract .25 (1 data count) since end is exclusive
+    @staticmethod
+    def path(folderPath):
+        return ParseCache(folderPath).m_path + "results\\"
 
-                        # Timestamps
-                        newWrite = '{:<7}'.format(str(start)) + " secs - " + '{:>7}'.format(str(end)) + " secs:"
+    #
+    # key() - The name of the entry of a result (parts, e.g. a FeatureCache key) of this file, or of this file
+    #           and other (the ResultCache of the second member of a pair)
+    #
 
-                        # Calculations
-                        for j in range(len(calcs)):
-                            # Calculated Data
-                            newWrite = newWrite + "\t" + str(round(calcs[j][i], 9))
+    def key(self, parts, other = None):
+        digest = hashlib.sha256(self.m_digest)
+        if(other is not None):
+            digest.update(other.m_digest)
+        digest.update(repr((self.CALCULATION, parts)).encode())
+        return digest.hexdigest()
 
-                        newWrite = newWrite + "\n"
-                        newF.write(newWrite)
+    #
+    # get() - The columns (arrays) of an entry, or None if there is no usable one
+    #
 
-                ############################
-                ### Normalization Output ###
-                ############################
+    def get(self, key):
+        entryPath = self.m_path + key + ".res"
+        try:
+            with open(entryPath, "rb") as entryFile:
+                view = memoryview(entryFile.read())
+            magic, version, amount = self.HEADER.unpack_from(view)
+            if(magic != self.MAGIC or version != self.VERSION):
+                return None
+
+            at = self.HEADER.size
+            shapes = []
+            for i in range(amount):
+                shapes.append(self.COLUMN.unpack_from(view, at))
+                at += self.COLUMN.size
+            columns = []
+            for code, length in shapes:
+                column = array(code.decode())
+                column.frombytes(view[at:at + (length * column.itemsize)])
+                if(len(column) != length):
+                    return None
+                at += length * column.itemsize
+                columns.append(column)
+            if(at != len(view)):
+                return None
+
+            os.utime(entryPath) # Most recently used
+        except (OSError, ValueError, struct.error):
+            return None
+
+        if(sys.byteorder != "little"):
+            for column in columns:
+                column.byteswap()
+        return columns
 
-                if(writeType == NORMS):
-                    norms = self.m_NormData.m_data
-                    for val in norms:
-                        time = val[0]
-                        EDA = val[1]
+    #
+    # put() - Keep the columns (arrays) of a result as an entry
+    #           Written to a temporary file of this process and thread first, so workers never see an entry half written
+    #
 
-                        newF.write("%s\t\t%s \n" % (time, EDA))
+    def put(self, key, columns):
+        entryPath = self.m_path + key + ".res"
+        tempPath = "%s.%d.%d.tmp" % (entryPath, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.m_path, exist_ok = True)
+            with open(tempPath, "wb") as entryFile:
+                entryFile.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(columns)))
+                for column in columns:
+                    entryFile.write(self.COLUMN.pack(column.typecode.encode(), len(column)))
+                for column in columns:
+                    if(sys.byteorder != "little"):
+                        column = array(column.typecode, column)
+                        column.byteswap()
+                    column.tofile(entryFile)
+            os.replace(tempPath, entryPath)
+        except OSError:
+            print("[WARN] Result cache entry could not be written.")
+            if(os.path.exists(tempPath)):
+                os.remove(tempPath)
+
+    #
+    # fetch() - The columns of a result: read from its entry, or calculated by calculate() and kept
+    #
+
+    def fetch(self, key, calculate):
+        columns = self.get(key)
+        if(columns is None):
+            columns = calculate()
+            self.put(key, columns)
+        return columns
+
+    #
+    # trim() - Drop the least recently used entries of a data folder until they take RESULT_CACHE_SIZE bytes at most
+    #           Returns the amount of entries dropped
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def trim(folderPath):
+        entries = []
+        try:
+            with os.scandir(ResultCache.path(folderPath)) as found:
+                for entry in found:
+                    if(entry.name.endswith(".res")):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return 0
+
+        entries.sort()
+        total = sum(entry[1] for entry in entries)
+        dropped = 0
+        for mtime, size, entryPath in entries:
+            if(total <= RESULT_CACHE_SIZE):
+                break
+            try:
+                os.remove(entryPath)
+            except OSError:
+                continue
+            total -= size
+            dropped += 1
+        return dropped
+
+###=-=-=-=-=-=-= END CLASS RESULTCACHE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS DATATABLE =-=-=-=-=-=-=###
+#
+#   DataTable - the named, typed columns of one output, written as a data file when DATA_FORMAT is set.
+#   The data file has the name of the text output, with ".csv" or ".bin" instead of its extension.
+#
+#   "csv": a header line of the column names, then one line per row, with the values separated by commas.
+#   "bin": a 20 byte header (magic, version, row count, column count), then the schema: for each column,
+#   its array type code ('d' float64, 'b' int8), the length of its name and its name (UTF-8). Then each
+#   column in turn, as little endian values, so a column can be read without going through the others.
+#
+
+class DataTable:
+    HEADER = struct.Struct("<4sIQI") # magic, version, rows, columns
+    COLUMN = struct.Struct("<cB") # type code, name length
+    MAGIC = b"EDAT"
+    VERSION = 1
+
+    def __init__(self):
+        self.m_names = [] # name of each column
+        self.m_columns = [] # typed array of each column
+
+    #
+    # add() - Add a column of values, stored as an array of the given type code
+    #
+
+    def add(self, name, typeCode, values):
+        self.m_names.append(name)
+        self.m_columns.append(array(typeCode, values))
+
+    #
+    # rows() - Amount of rows, the length of the shortest column
+    #
+
+    def rows(self):
+        if(len(self.m_columns) == 0):
+            return 0
+        return min(map(len, self.m_columns))
+
+    #
+    # write() - Write the table as the data file of the text output at textPath, returns its path
+    #
+
+    def write(self, textPath, dataFormat):
+        dataPath = os.path.splitext(textPath)[0] + "." + dataFormat
+        if(dataFormat == "csv"):
+            self.writeDelimited(dataPath)
+        elif(dataFormat == "bin"):
+            self.writeBinary(dataPath)
+        else:
+            raise ValueError("Unknown data format \"%s\"" % dataFormat)
+        return dataPath
+
+    def writeDelimited(self, dataPath):
+        rows = self.rows()
+        with commitFile(dataPath, "w", newline = "") as dataFile:
+            dataFile.write(",".join(self.m_names) + "\n")
+            columns = [map(str, column[:rows]) for column in self.m_columns]
+            writeLines(dataFile, map("%s\n".__mod__, map(",".join, zip(*columns))))
+
+    def writeBinary(self, dataPath):
+        rows = self.rows()
+        with commitFile(dataPath, "wb") as dataFile:
+            dataFile.write(self.HEADER.pack(self.MAGIC, self.VERSION, rows, len(self.m_columns)))
+            for name, column in zip(self.m_names, self.m_columns):
+                name = name.encode("utf-8")
+                dataFile.write(self.COLUMN.pack(column.typecode.encode("ascii"), len(name)) + name)
+            for column in self.m_columns:
+                column = column[:rows]
+                if(sys.byteorder != "little"):
+                    column.byteswap()
+                column.tofile(dataFile)
+
+    #
+    # read() - Produce the DataTable of a data file, in either format
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def read(dataPath):
+        table = DataTable()
+        with open(dataPath, "rb") as dataFile:
+            content = dataFile.read()
+
+        if(content[:4] != DataTable.MAGIC):
+            lines = content.decode("utf-8").splitlines()
+            names = lines[0].split(",")
+            rows = [line.split(",") for line in lines[1:]]
+            for i in range(len(names)):
+                values = [row[i] for row in rows]
+                if(all(map(str.isdigit, (value.lstrip("-") for value in values))) and len(values) > 0):
+                    table.add(names[i], 'b', map(int, values))
+                else:
+                    table.add(names[i], 'd', map(float, values))
+            return table
+
+        magic, version, rows, count = DataTable.HEADER.unpack_from(content)
+        if(version != DataTable.VERSION):
+            raise ValueError("Unknown data file version %s" % version)
+        pos = DataTable.HEADER.size
+        schema = []
+        for i in range(count):
+            typeCode, length = DataTable.COLUMN.unpack_from(content, pos)
+            pos += DataTable.COLUMN.size
+            schema.append([content[pos:pos + length].decode("utf-8"), typeCode.decode("ascii")])
+            pos += length
+        for name, typeCode in schema:
+            column = array(typeCode)
+            size = column.itemsize * rows
+            column.frombytes(content[pos:pos + size])
+            if(sys.byteorder != "little"):
+                column.byteswap()
+            table.m_names.append(name)
+            table.m_columns.append(column)
+            pos += size
+        return table
+
+###=-=-=-=-=-=-= END CLASS DATATABLE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS FILELIST =-=-=-=-=-=-=###
+#
+#   FileList - the "-fileList.txt" of a run: a line per output file, under a heading per kind of output, then the totals.
+#   The lines are gathered while the outputs are written, in the order of the stages and of the files within each
+#   (never the order they happened to finish in), and written once at the end.
+#
+
+class FileList:
+    def __init__(self):
+        self.m_lines = []
+        self.m_size = 0 # bytes of the files listed
+        self.m_count = 0 # files listed
+
+    # heading() - Start the list of a kind of output
+
+    def heading(self, title):
+        DTstr = updateDT()
+        self.m_lines.append("%s %s\t\t\t[%s]\n" % (DTstr[1], DTstr[3], title))
+
+    # add() - List output files, from their [size, name] file info
+
+    def add(self, fileInfos):
+        for fileInfo in fileInfos:
+            DTstr = updateDT()
+            self.m_lines.append("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
+            self.m_size += fileInfo[0]
+            self.m_count += 1
+
+    # write() - Write the list and its totals (through a temporary file, see commitFile())
+
+    def write(self, filePath):
+        with commitFile(filePath) as fList:
+            fList.writelines(self.m_lines)
+            fList.write("\n\t%s File(s)\t%s bytes" % (self.m_count, self.m_size))
+
+###=-=-=-=-=-=-= END CLASS FILELIST =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS CHECKPOINT =-=-=-=-=-=-=###
+#
+#   Checkpoint - how far incremental mode got with one data file, kept in the CHECKPOINT_FOLDER of its outputs.
+#
+#   The file holds a header: the byte offset read up to, the amount of lines read, the SHA-256 of the first
+#   HEAD bytes of the data file (to notice a file that was replaced rather than added to), the normalization and
+#   features it was written with, the running minimum and maximum of the EDA (for Min-Max normalization) and the
+#   size of the NORM output. Then for each window configuration its parameters, the number of the next window to
+#   write and the size of its CALCS output, and last the tail: the time and EDA (before normalization) of every
+#   line from m_tailPos on, which windows that are not complete yet still need. Written like the parse cache:
+#   little endian, through a temporary file.
+#
+#   The outputs are cut back to the sizes of the checkpoint before anything is appended to them, so lines
+#   appended by a run that stopped before writing its checkpoint are not appended twice.
+#
+
+class Checkpoint:
+    HEADER = struct.Struct("<4sIQQ32siIddQQQI") # magic, version, offset, lines, head sha256, normType, feats, min, max, NORM size, tailPos, tail length, windows
+    WINDOW = struct.Struct("<qqqqQQ") # width, increment, count, start, next window, CALCS size
+    MAGIC = b"EDAK"
+    VERSION = 2
+    HEAD = 4096
+
+    def __init__(self, outputPath, fileName):
+        self.m_path = outputPath + CHECKPOINT_FOLDER + "\\" + fileName + ".ckpt"
+        self.m_offset = 0 # bytes of the data file read so far
+        self.m_lines = 0 # lines of the data file read so far
+        self.m_head = bytes(32)
+        self.m_normType = -1
+        self.m_feats = 0
+        self.m_min = math.inf
+        self.m_max = -math.inf
+        self.m_windows = {} # window parameters (tuple) -> number of the next window to write
+        self.m_normSize = 0 # bytes of the NORM output written so far
+        self.m_sizes = {} # window parameters (tuple) -> bytes of their CALCS output written so far
+        self.m_tailPos = 0 # line number of the first line of the tail
+        self.m_tailTimes = array('d')
+        self.m_tailData = array('d')
+
+    #
+    # featBits() - The features of doFeat that change the contents of the outputs, as one number
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def featBits(doFeat):
+        return functools.reduce(operator.or_, (1 << feat for feat in (AVG, STD, SLOPE, NORMS) if doFeat[feat]), 0)
+
+    #
+    # headHash() - SHA-256 of the first HEAD bytes (at most offset) of the data file
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def headHash(filePath, offset):
+        with open(filePath, "rb") as dataFile:
+            return hashlib.sha256(dataFile.read(min(offset, Checkpoint.HEAD))).digest()
+
+    #
+    # start() - Begin again from the start of the data file, for the given normalization, features and window configurations
+    #
+
+    def start(self, normType, doFeat, paramSets):
+        self.m_offset = self.m_lines = self.m_tailPos = 0
+        self.m_min = math.inf
+        self.m_max = -math.inf
+        self.m_tailTimes = array('d')
+        self.m_tailData = array('d')
+        self.m_normType = normType
+        self.m_feats = self.featBits(doFeat)
+        self.m_windows = {tuple(params): 0 for params in paramSets}
+        self.m_normSize = 0
+        self.m_sizes = {tuple(params): 0 for params in paramSets}
+
+    #
+    # outputSizes() - The sizes of the outputs written so far, in the order NameData.writeAppend() names them:
+    #           the NORM output first, then the CALCS output of each window configuration
+    #
+
+    def outputSizes(self, doFeat, paramSets):
+        sizes = []
+        if(doFeat[NORMS]):
+            sizes.append(self.m_normSize)
+        if(doFeat[CALCS]):
+            sizes.extend(self.m_sizes[tuple(params)] for params in paramSets)
+        return sizes
+
+    #
+    # matches() - Whether this checkpoint can be continued from: the data file was only added to since, and
+    #           the outputs were written with the same normalization, features and window configurations and
+    #           are at least as large as when it was written
+    #
+
+    def matches(self, filePath, normType, doFeat, paramSets, outputPaths):
+        if(normType != self.m_normType or self.featBits(doFeat) != self.m_feats):
+            return False
+        if(set(self.m_windows) != set(tuple(params) for params in paramSets)):
+            return False
+        for outputFPath, size in zip(outputPaths, self.outputSizes(doFeat, paramSets)):
+            if(not os.path.exists(outputFPath) or os.stat(outputFPath).st_size < size):
+                return False
+        if(os.stat(filePath).st_size < self.m_offset):
+            return False
+        return self.headHash(filePath, self.m_offset) == self.m_head
+
+    #
+    # read() - Load the checkpoint, returns False if there is none (or it cannot be used)
+    #
+
+    def read(self):
+        try:
+            with open(self.m_path, "rb") as ckptFile:
+                content = ckptFile.read()
+            fields = self.HEADER.unpack_from(content)
+            if(fields[0] != self.MAGIC or fields[1] != self.VERSION):
+                return False
+            self.m_offset, self.m_lines, self.m_head, self.m_normType, self.m_feats, self.m_min, self.m_max = fields[2:9]
+            self.m_normSize, self.m_tailPos, tailLen, windows = fields[9:]
+
+            pos = self.HEADER.size
+            self.m_windows = {}
+            self.m_sizes = {}
+            for i in range(windows):
+                window = self.WINDOW.unpack_from(content, pos)
+                self.m_windows[window[:4]] = window[4]
+                self.m_sizes[window[:4]] = window[5]
+                pos += self.WINDOW.size
+
+            if(len(content) != pos + (16 * tailLen)):
+                return False
+            self.m_tailTimes = array('d')
+            self.m_tailData = array('d')
+            self.m_tailTimes.frombytes(content[pos:pos + (8 * tailLen)])
+            self.m_tailData.frombytes(content[pos + (8 * tailLen):])
+        except (OSError, ValueError, struct.error):
+            return False
+
+        if(sys.byteorder != "little"):
+            self.m_tailTimes.byteswap()
+            self.m_tailData.byteswap()
+        return True
+
+    #
+    # write() - Keep the checkpoint, written to a temporary file first so it is never left half written
+    #
+
+    def write(self, filePath):
+        self.m_head = self.headHash(filePath, self.m_offset)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.m_offset, self.m_lines, self.m_head, self.m_normType, self.m_feats,
+                                  self.m_min, self.m_max, self.m_normSize, self.m_tailPos, len(self.m_tailTimes), len(self.m_windows))
+        times = array('d', self.m_tailTimes)
+        values = array('d', self.m_tailData)
+        if(sys.byteorder != "little"):
+            times.byteswap()
+            values.byteswap()
+
+        os.makedirs(os.path.dirname(self.m_path), exist_ok = True)
+        with open(self.m_path + ".tmp", "wb") as ckptFile:
+            ckptFile.write(header)
+            for window, nextWindow in self.m_windows.items():
+                ckptFile.write(self.WINDOW.pack(*window, nextWindow, self.m_sizes[window]))
+            times.tofile(ckptFile)
+            values.tofile(ckptFile)
+        os.replace(self.m_path + ".tmp", self.m_path)
+
+###=-=-=-=-=-=-= END CLASS CHECKPOINT =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS PROBE =-=-=-=-=-=-=###
+#
+#   Probe - measures one stage of a run, or one file worked on in it, from when it is made until record().
+#
+#   A record holds the wall time, the CPU time of the process, its peak memory and the samples (lines of data)
+#   per second. The peak is the high-water mark of the whole process so far, as the OS reports it; a traced
+#   probe (PROFILE on) also holds the peak of Python allocations during just the measurement (tracemalloc).
+#   While a task is measured (see measureTask()), the records of the files it writes are gathered in s_local.taken
+#   (per thread, as writer threads measure their tasks side by side).
+#
+
+class Probe:
+    __slots__ = ("m_wall", "m_cpu", "m_traced")
+    s_local = threading.local() # .taken: records of the task being measured in this thread, None when no task is
+
+    def __init__(self, traced = False):
+        self.m_traced = traced and tracemalloc.is_tracing()
+        if(self.m_traced):
+            tracemalloc.reset_peak()
+        self.m_wall = timer.perf_counter()
+        self.m_cpu = timer.process_time()
+
+    # record() - The measurements so far, as a dictionary ready for the metrics file
+
+    def record(self, name, samples = None, size = None):
+        wall = timer.perf_counter() - self.m_wall
+        record = {"name": name, "wall_secs": wall, "cpu_secs": timer.process_time() - self.m_cpu, "peak_rss_bytes": peakMemory()}
+        if(self.m_traced):
+            record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        record["samples"] = samples
+        record["samples_per_sec"] = samples / wall if samples is not None and wall > 0 else None
+        if(size is not None):
+            record["bytes"] = size
+        record["process"] = os.getpid()
+        return record
+
+###=-=-=-=-=-=-= END CLASS PROBE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS METRICS =-=-=-=-=-=-=###
+#
+#   Metrics - the stages of one run of main() and the files worked on in each, written to "-metrics.json".
+#
+#   Stages are measured in this process between begin() and end(). The per-file tasks of a stage are measured
+#   where they run (see runTasks()), so with WORKERS above 1 the CPU time of a stage is that of this process plus
+#   that of its tasks in the worker processes, and its peak memory is the highest of all of them.
+#   With PROFILE on, cProfile runs during every stage (never while waiting for an answer to a prompt).
+#
+
+class Metrics:
+    def __init__(self):
+        self.m_stages = [] # record of every stage, in order
+        self.m_files = [] # record of every task and written file, in order
+        self.m_stage = None # [name, Probe, task records] of the stage being measured
+        self.m_profiler = None
+        if(PROFILE):
+            self.m_profiler = cProfile.Profile()
+            tracemalloc.start()
+
+    # begin() / end() - Start and finish measuring a stage
+    #           samples defaults to the sum of the samples of the stage's tasks
+
+    def begin(self, name):
+        self.m_stage = [name, Probe(self.m_profiler is not None), []]
+        if(self.m_profiler is not None):
+            self.m_profiler.enable()
+
+    def end(self, samples = None):
+        if(self.m_profiler is not None):
+            self.m_profiler.disable()
+        name, probe, records = self.m_stage
+        tasks = [record for record in records if record["call"] != "writeFile"]
+        counted = [record["samples"] for record in tasks if record["samples"] is not None]
+        if(samples is None and len(counted) > 0):
+            samples = sum(counted)
+        stage = probe.record(name, samples)
+        del stage["process"]
+
+        # Tasks that ran in worker processes are not part of this process's CPU time and memory
+        others = [record for record in tasks if record["process"] != os.getpid()]
+        stage["cpu_secs"] += sum(record["cpu_secs"] for record in others)
+        peaks = [record["peak_rss_bytes"] for record in others + [stage] if record["peak_rss_bytes"] is not None]
+        stage["peak_rss_bytes"] = max(peaks) if len(peaks) > 0 else None
+        stage["files"] = len(tasks)
+        stage["processes"] = len(set(record["process"] for record in others)) + 1
+
+        self.m_stages.append(stage)
+        self.m_files.extend(records)
+        self.m_stage = None
+
+    # tasks() - Keep the records of the measured tasks of the current stage, returns the tasks' own results
+
+    def tasks(self, measured):
+        name = self.m_stage[0]
+        results = []
+        for result, records in measured:
+            for record in records:
+                record["stage"] = name
+            self.m_stage[2].extend(records)
+            results.append(result)
+        return results
+
+    # write() - Write the metrics file (info: what the run was asked to do), and the profile when PROFILE is on
+
+    def write(self, filePath, info):
+        metrics = {"date": datetime.now().isoformat(timespec = "seconds"), "python": sys.version.split()[0]}
+        metrics.update(info)
+        metrics["total"] = {"wall_secs": sum(stage["wall_secs"] for stage in self.m_stages),
+                            "cpu_secs": sum(stage["cpu_secs"] for stage in self.m_stages)}
+        metrics["stages"] = self.m_stages
+        metrics["files"] = self.m_files
+        if(METRICS):
+            with open(filePath, "w") as metricsFile:
+                json.dump(metrics, metricsFile, indent = 1)
+
+        if(self.m_profiler is not None):
+            profilePath = os.path.join(os.path.dirname(filePath), "-profile")
+            self.m_profiler.dump_stats(profilePath + ".prof")
+            with open(profilePath + ".txt", "w") as profileFile:
+                pstats.Stats(self.m_profiler, stream = profileFile).sort_stats("cumulative").print_stats(60)
+            tracemalloc.stop()
+
+###=-=-=-=-=-=-= END CLASS METRICS =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS CHUNKEDDATA =-=-=-=-=-=-=###
+#
+#   ChunkedData - one data file in out-of-core mode, read again for every pass over it, CHUNK_LINES lines at a time.
+#
+#   Made with a first pass for its statistics: the amount of lines, and for normalization, the min and max (Min-Max),
+#   or the mean, then (a second pass) the standard deviation (Z-Score), added up in the same order as MMNormData and
+#   ZSNormData do, so every normalized value is the same. Each pass after reads the memory mapped parse cache (built
+#   first, a piece at a time, if the file has none), or parses the text again without PARSE_CACHE.
+#
+#   Windows are calculated a chunk at a time: the lines from the start of the next window on are carried over to the
+#   next chunk, so windows that cross from one chunk to the next are whole. WindowSums is exact, so a window comes
+#   out the same whichever lines are in memory with it.
+#
+
+class ChunkedData:
+    __slots__ = ("m_folder", "m_name", "m_normType", "m_cached", "m_count", "m_min", "m_max", "m_average", "m_standard")
+
+    def __init__(self, folder, name, normType = -1):
+        self.m_folder = folder
+        self.m_name = name
+        self.m_normType = normType # MM_NORM or ZS_NORM if the data is normalized
+        self.m_cached = False # whether the passes read the parse cache (otherwise the text)
+        self.m_count = 0 # lines of data
+        self.m_min = self.m_max = None # for Min-Max normalization
+        self.m_average = self.m_standard = None # for Z-Score normalization
+        self.calcStats()
+
+    # columns() - The time and EDA (before normalization) columns, CHUNK_LINES lines at a time
+
+    def columns(self):
+        if(self.m_cached):
+            return ParseCache(self.m_folder).readChunks(self.m_name, CHUNK_LINES)
+        return rechunk(Clam.parseChunks(self.m_folder, self.m_name), CHUNK_LINES)
+
+    # chunks() - The time and data (normalized, if it is) columns, CHUNK_LINES lines at a time
+
+    def chunks(self):
+        for times, values in self.columns():
+            yield times, self.normalize(values)
+
+    # calcStats() - The statistics pass(es), see above
+
+    def calcStats(self):
+        if(PARSE_CACHE):
+            cache = ParseCache(self.m_folder)
+            stat = os.stat(self.m_folder + "\\" + self.m_name)
+            self.m_cached = cache.count(self.m_name, stat) is not None or cache.build(self.m_name, stat)
+
+        total = 0
+        for times, values in self.columns():
+            self.m_count += len(values)
+            if(self.m_normType == MM_NORM and len(values) > 0):
+                self.m_min = min(values) if self.m_min is None else min(self.m_min, min(values))
+                self.m_max = max(values) if self.m_max is None else max(self.m_max, max(values))
+            if(self.m_normType == ZS_NORM):
+                for val in values:
+                    total += val
+
+        if(self.m_normType == ZS_NORM):
+            self.m_average = total/self.m_count
+            total = 0
+            for times, values in self.columns():
+                for val in values:
+                    total += math.pow((val - self.m_average), 2)
+            self.m_standard = math.sqrt(total/self.m_count)
+
+    # normalize() - Normalize one chunk of EDA with the statistics of the whole file
+
+    def normalize(self, values):
+        if(self.m_normType == MM_NORM):
+            return array('d', (MMNormData.normalize(value, self.m_min, self.m_max) for value in values))
+        if(self.m_normType == ZS_NORM):
+            return array('d', (ZSNormData.normalize(value, self.m_average, self.m_standard) for value in values))
+        return values
+
+    # windows() - Calculate the features in feats of the first total windows in params, a chunk at a time
+    #           Produces [number of the first window, one array per feature] for the windows each chunk completes
+
+    def windows(self, params, feats, total):
+        for first, starts, (times, data) in windowBatches(self.chunks(), params, total):
+            yield [first, WindowSums(times, data).calcWindows(params, feats, starts)]
+
+###=-=-=-=-=-=-= END CLASS CHUNKEDDATA =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS CLAM =-=-=-=-=-=-=###
+
+class Clam:
+    def __init__(self, folderPath, lazy = False):
+        self.m_lazy = lazy # If lazy, files are only read when a NameData object is loaded
+        self.m_datasets = self.readFolder(folderPath)
+
+    #
+    #           PER FILE
+    # readFile() - Read the file and produce a time column and an EDA column of floats
+    #           Taken from the parse cache when the file has not changed since it was last parsed
+    #           staticmethod due to not using self values (NameData.load() also reads through it)
+    #           With a ParseReport, also tells what parsing found (kept in the parse cache, for when it is read from there)
+    #
+
+    @staticmethod
+    def readFile(folderPath, fileName, report = None):
+        if(not PARSE_CACHE):
+            return Clam.parseFile(folderPath, fileName, report)
+
+        if(report is None):
+            report = ParseReport(fileName)
+        cache = ParseCache(folderPath)
+        stat = os.stat(folderPath + "\\" + fileName)
+        columns = cache.read(fileName, stat, report)
+        if(columns is None):
+            columns = Clam.parseFile(folderPath, fileName, report)
+            cache.write(fileName, stat, columns[0], columns[1], report)
+        return columns
+
+    #
+    # parseFile() - Parse the text of the file into a time column and an EDA column of floats
+    #           The file is read in READ_CHUNK sized pieces, and each piece is parsed straight into the
+    #           columns, so the raw text of the whole file is never held in memory
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def parseFile(folderPath, fileName, report = None):
+        times = array('d')
+        values = array('d')
+        for chunkTimes, chunkValues in Clam.parseChunks(folderPath, fileName, report):
+            times.extend(chunkTimes)
+            values.extend(chunkValues)
+        return times, values
+
+    #
+    # parseChunks() - Parse the text of the file a READ_CHUNK sized piece at a time, producing the time and EDA
+    #           columns of the lines of each piece (out-of-core mode works on them without keeping them)
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def parseChunks(folderPath, fileName, report = None):
+        filePath = folderPath + "\\" + fileName
+        if(report is None):
+            report = ParseReport(fileName)
+        rest = b""
+        with open(filePath, "rb") as dataFile:
+            # Data is read as "Time Data" per line; a line cut off at the end of a piece is kept for the next one
+            chunk = dataFile.read(READ_CHUNK)
+            while(chunk):
+                buffer = rest + chunk
+                cut = buffer.rfind(b"\n") + 1
+                rest = buffer[cut:]
+                times = array('d')
+                values = array('d')
+                Clam.parseBuffer(buffer[:cut], times, values, report)
+                yield times, values
+                chunk = dataFile.read(READ_CHUNK)
+
+        if(rest.strip()): # Last line without a line break
+            times = array('d')
+            values = array('d')
+            Clam.parseBuffer(rest + b"\n", times, values, report)
+            yield times, values
+
+    #
+    # parseFrom() - Parse the complete lines of the file from the byte offset on (incremental mode)
+    #           A last line without a line break may still be being written, so it is left for next time
+    #           Returns the time column, the EDA column and the offset right after the last line parsed
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def parseFrom(folderPath, fileName, offset, report = None):
+        filePath = folderPath + "\\" + fileName
+        times = array('d')
+        values = array('d')
+        rest = b""
+        with open(filePath, "rb") as dataFile:
+            dataFile.seek(offset)
+            chunk = dataFile.read(READ_CHUNK)
+            while(chunk):
+                buffer = rest + chunk
+                cut = buffer.rfind(b"\n") + 1
+                rest = buffer[cut:]
+                Clam.parseBuffer(buffer[:cut], times, values, report)
+                offset += len(chunk)
+                chunk = dataFile.read(READ_CHUNK)
+
+        return times, values, offset - len(rest)
+
+    #
+    # parseBuffer() - Parse the "Time Data" lines of a buffer (bytes of whole lines, each ending in a line break) onto
+    #           the end of the time and EDA columns, counting them in the ParseReport (if one is given)
+    #           The whole buffer is split at once, with a ';' put in for every line break: when every third piece is a ';'
+    #           and all the others are numbers, every line held exactly two, and they become the columns in one go.
+    #           Otherwise (a blank, comment or malformed line somewhere in it) the buffer is parsed line by line, and
+    #           the lines that are not two numbers are counted and skipped. Spaces, tabs and "\r\n" line breaks are all
+    #           taken as they come, and anything after the first two numbers of a line is ignored, as it always was
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def parseBuffer(buffer, times, values, report = None):
+        if(report is None):
+            report = ParseReport()
+        lines = buffer.count(b"\n")
+
+        pieces = buffer.replace(b"\n", b" ; ").split()
+        if(len(pieces) == 3 * lines and pieces[2::3].count(b";") == lines):
+            del pieces[2::3]
+            try:
+                pairs = array('d', map(float, pieces))
+            except ValueError: # Some piece is not a number
+                pairs = None
+            if(pairs is not None):
+                times.extend(pairs[0::2])
+                values.extend(pairs[1::2])
+                report.m_lines += lines
+                report.m_parsed += lines
+                return
+
+        for line in buffer.split(b"\n")[:lines]:
+            report.m_lines += 1
+            pair = line.split()
+            if(len(pair) == 0):
+                report.m_blank += 1
+            elif(pair[0].startswith(ParseReport.COMMENT)):
+                report.m_comment += 1
+            else:
+                try:
+                    time, value = float(pair[0]), float(pair[1])
+                except (ValueError, IndexError):
+                    report.malformed(line)
+                    continue
+                times.append(time)
+                values.append(value)
+                report.m_parsed += 1
+
+    #
+    #           PER FOLDER
+    # readFolder() - Take a path and produce an array of NameData (name, time column, EDA column)
+    #           Every file read gets a ParseReport (in m_reports), and its skipped lines are told about; a file without
+    #           any data lines is left out
+    #           In lazy mode the files are not read yet, so only the ones already in the parse cache have one
+    #
+
+    def readFolder(self, folderPath):
+        setOfNameData = []
+        self.m_reports = []
+        print("\nProcessing files in folder path: " + folderPath)
+        fileNames, folderNames = self.listFolder(folderPath)
+        for fileName in fileNames:
+            print("File name: " + fileName)
+            report = ParseReport(fileName)
+            if(self.m_lazy):
+                namedata = NameData(fileName, folder = folderPath)
+                if(PARSE_CACHE and not ParseCache(folderPath).report(fileName, os.stat(folderPath + "\\" + fileName), report)):
+                    report = None
+            else:
+                namedata = NameData(fileName, *self.readFile(folderPath, fileName, report))
+            if(report is not None):
+                self.m_reports.append(report)
+                if(report.skipped() > 0):
+                    print(report.summary())
+                if(not self.hasData(report)):
+                    print("[WARN] \"%s\" has no data lines, it was skipped." % fileName)
+                    continue
+            setOfNameData.append(namedata)
+        for folderName in folderNames:
+            print("[WARN] \"%s\" is a folder, it was skipped." % folderName)
+        return setOfNameData
+
+    #
+    # listFolder() - The names of the files of a folder that may be data files, and the names of its folders, both sorted
+    #           (so nothing depends on the order of the directory); exempt names, beginning with '-', are in neither
+    #           staticmethod due to not using self values (service mode lists its folders through it too)
+    #
+
+    @staticmethod
+    def listFolder(folderPath):
+        fileNames = []
+        folderNames = []
+        for fileName in sorted(os.listdir(folderPath)):
+            if(fileName[:1] == "-"): # Exempt files begin with '-'
+                continue
+            if(os.path.isdir(folderPath + "\\" + fileName)):
+                folderNames.append(fileName)
+            else:
+                fileNames.append(fileName)
+        return fileNames, folderNames
+
+    #
+    # hasData() - Whether a file that was read (its ParseReport) is a data file: one with a data line or more
+    #           A file without any is left out, since nothing could be calculated from it
+    #           staticmethod due to not using self values
+    #
+
+    @staticmethod
+    def hasData(report):
+        return report.m_parsed > 0
+
+    #
+    # setPairs() - If synchrony is enabled, set a member variable containing the array of pairs
+    #
+
+    def setPairs(self, pairs):
+        self.m_pairs = pairs
+
+    #
+    # sharesMembers() - Whether a file is a member of more than one pair (a team larger than a dyad)
+    #
+
+    def sharesMembers(self):
+        members = [id(member) for pair in self.m_pairs for member in (pair.m_first, pair.m_second) if member is not None]
+        return len(members) != len(set(members))
+
+    #
+    # openResults() - Give every file the ResultCache of its contents (see RESULT_CACHE), reading each file through once
+    #
+
+    def openResults(self, folderPath):
+        for obj in self.m_datasets:
+            try:
+                obj.m_results = ResultCache(folderPath, obj.m_name)
+            except OSError:
+                print("[WARN] Results of \"%s\" will not be cached." % obj.m_name)
+
+    #
+    # groupSessions() - Group the NameData objects by session, in one pass over the files
+    #           Returns a dict of session ID -> list of its NameData objects (a dyad, triad or larger team)
+    #           Files without a "Session" tag are each a group of their own, under their file name
+    #
+
+    def groupSessions(self):
+        groups = {}
+        for obj in self.m_datasets:
+            sessID = parseSession(obj.m_name)[0]
+            if(sessID is None):
+                sessID = obj.m_name
+            groups.setdefault(sessID, []).append(obj)
+        return groups
+
+    #
+    # pairSessions() - Set the SyncPairs of every session group: every pair of members of the group,
+    #           or the single member alone (an incomplete pair). Groups are in session order
+    #
+
+    def pairSessions(self):
+        groups = self.groupSessions()
+        pairs = []
+        for sessID in sorted(groups, key = sessionOrder):
+            members = groups[sessID]
+            if(len(members) == 1):
+                pairs.append(SyncPair(members[0], None))
+            for first, second in combinations(members, 2):
+                pair = SyncPair(first, second)
+                if(len(members) > 2): # Tell the pairs of a larger team apart in their output names
+                    pair.m_tag = parseSession(pair.m_first.m_name)[1] + "-" + parseSession(pair.m_second.m_name)[1]
+                pairs.append(pair)
+        self.setPairs(pairs)
+
+###=-=-=-=-=-=-= END CLASS CLAM =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS NAMEDATA =-=-=-=-=-=-=###
+
+class NameData:
+    __slots__ = ("m_name", "m_folder", "m_time", "m_orig", "m_data", "m_sums", "m_normType", "m_features",
+                 "m_NormData", "m_avg", "m_std", "m_slope", "m_chunked", "m_index", "m_results")
+
+    def __init__(self, name, times = None, data = None, folder = None):
+        self.m_name = name # original filename
+        self.m_folder = folder # folder to load the file from, if it was not read in advance (Clam lazy mode)
+        self.m_time = times # column of time
+        self.m_orig = data # column of data (BEFORE NORMALIZATION [if applicable])
+        self.m_data = data # column of data
+        self.m_sums = None # WindowSums of m_data, built on first calculation
+        self.m_normType = -1 # MM_NORM or ZS_NORM once normalized, reapplied whenever the file is loaded again
+        self.m_features = FeatureCache() # feature results already calculated, see feature()
+        self.m_NormData = None # MMNormData or ZSNormData once normalized
+        self.m_avg = self.m_std = self.m_slope = None # AvgData, StdData and SlopeData of the last window parameters calculated
+        self.m_chunked = None # ChunkedData of the file (out-of-core mode), see chunked()
+        self.m_index = None # AggregateIndex of the file, see index()
+        self.m_results = None # ResultCache of the file's contents, if its results are kept between runs (see Clam.openResults())
+
+    # load() - Read the file if it is not in memory (Clam lazy mode), reapplying its normalization
+
+    def load(self):
+        if(self.m_data is None):
+            self.m_time, self.m_orig = Clam.readFile(self.m_folder, self.m_name)
+            self.m_data = self.m_orig
+            if(self.m_normType == MM_NORM):
+                self.calcMMnorm()
+            if(self.m_normType == ZS_NORM):
+                self.calcZSnorm()
+
+    # unload() - Release the data of a file that can be loaded again (Clam lazy mode), otherwise does nothing
+
+    def unload(self):
+        if(self.m_folder is not None):
+            self.m_time = self.m_orig = self.m_data = None
+            self.m_NormData = self.m_sums = self.m_index = None
+            self.m_avg = self.m_std = self.m_slope = None
+            self.m_features.clear()
+
+    # The following calculation-related arrays are single lists example: m_avg = [data, data, data, data, ...]
+
+    def calcAvg(self, params):
+        self.m_avg = AvgData(self.getSums(), params, self.feature(AVG, params))
+
+    def calcStd(self, params):
+        self.m_std = StdData(self.getSums(), params, self.feature(STD, params))
+
+    def calcSlope(self, params):
+        self.m_slope = SlopeData(self.getSums(), params, self.feature(SLOPE, params))
+
+    # feature() - Produce the values of one feature (AVG, STD or SLOPE) of every window in params
+    #           Calculated on first use, then taken from the feature cache
+
+    def feature(self, feat, params):
+        return self.features([feat], params)[0]
+
+    # features() - Produce the values of several features of every window in params, in the order of feats
+    #           The ones in neither the feature cache nor the result cache are calculated together, in one pass over
+    #           the windows, then kept in both
+    #           Every feature is read straight from the window sums, so none needs another calculated first
+
+    def features(self, feats, params):
+        keys = [FeatureCache.key(feat, self.m_normType, params) for feat in feats]
+        results = [self.m_features.get(key) for key in keys]
+
+        if(self.m_results is not None):
+            for i in range(len(feats)):
+                if(results[i] is None):
+                    columns = self.m_results.get(self.m_results.key(keys[i]))
+                    if(columns is not None):
+                        results[i] = columns[0]
+                        self.m_features.put(keys[i], results[i])
+
+        missing = [feat for feat, values in zip(feats, results) if values is None]
+        if(len(missing) > 0):
+            calculated = dict(zip(missing, self.getSums().calcWindows(params, missing)))
+            for i in range(len(feats)):
+                if(results[i] is None):
+                    results[i] = calculated[feats[i]]
+                    self.m_features.put(keys[i], results[i])
+                    if(self.m_results is not None):
+                        self.m_results.put(self.m_results.key(keys[i]), [results[i]])
+        return results
+
+    # calcFeatures() - Calculate every selected feature (AVG, STD, SLOPE) in one pass over the windows
+
+    def calcFeatures(self, params, doFeat):
+        feats = calcFeats(doFeat)
+        results = dict(zip(feats, self.features(feats, params)))
+
+        if(doFeat[AVG]):
+            self.m_avg = AvgData(self.m_sums, params, results[AVG])
+        if(doFeat[STD]):
+            self.m_std = StdData(self.m_sums, params, results[STD])
+        if(doFeat[SLOPE]):
+            self.m_slope = SlopeData(self.m_sums, params, results[SLOPE])
+
+    def calcMMnorm(self):
+        self.m_normType = MM_NORM
+        self.setNormData(MMNormData(self.m_orig))
+
+    def calcZSnorm(self):
+        self.m_normType = ZS_NORM
+        self.setNormData(ZSNormData(self.m_orig))
+
+    # setNormData() - Make normalized data (possibly calculated in another process) the main data
+
+    def setNormData(self, normData):
+        self.m_NormData = normData
+        self.m_data = self.m_NormData.m_data
+        self.m_sums = None # Results of other normalizations stay in the feature cache under their own keys
+
+    # samples() / label() - Lines of data in memory (None if not loaded), and the name used in the metrics file
+
+    def samples(self):
+        if(self.m_data is None):
+            return None if self.m_chunked is None else self.m_chunked.m_count
+        return len(self.m_data)
+
+    def label(self):
+        return self.m_name
+
+    # chunked() - The file worked on a chunk at a time (out-of-core mode), its statistics taken on first use
+
+    def chunked(self):
+        if(self.m_chunked is None or self.m_chunked.m_normType != self.m_normType):
+            self.m_chunked = ChunkedData(self.m_folder, self.m_name, self.m_normType)
+        return self.m_chunked
+
+    # getSums() - Build the window engine for the current data once, then share it between features
+    #           Normalizing replaces m_data, so it also clears the engine to be rebuilt on next use
+
+    def getSums(self):
+        if(self.m_sums is None):
+            self.m_sums = WindowSums(self.m_time, self.m_data)
+        return self.m_sums
+
+    # __getstate__() - When sent to a worker process, leave the window engine and feature results behind
+    #           They are much larger than the columns they were built from, so the worker rebuilds what it needs
+
+    def __getstate__(self):
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["m_sums"] = state["m_index"] = None
+        state["m_features"] = FeatureCache()
+        return (None, state)
+
+    # index() - The AggregateIndex of the file: taken from the cache folder of folderPath (by default the file's own
+    #           folder), otherwise built and kept there (with PARSE_CACHE on)
+    #           A file not in memory is read through the views of its cache file, so it is not loaded to be queried
+
+    def index(self, folderPath = None):
+        if(self.m_index is None):
+            if(folderPath is None):
+                folderPath = self.m_folder
+            cache = stat = None
+            if(PARSE_CACHE and folderPath is not None):
+                cache = ParseCache(folderPath)
+                stat = os.stat(folderPath + "\\" + self.m_name)
+
+            columns = None
+            if(self.m_orig is not None):
+                columns = [self.m_time, self.m_orig]
+            elif(cache is not None):
+                columns = cache.view(self.m_name, stat)
+            if(columns is None):
+                self.load()
+                columns = [self.m_time, self.m_orig]
+
+            if(cache is not None):
+                self.m_index = cache.readIndex(self.m_name, stat, columns[0], columns[1])
+            if(self.m_index is None):
+                self.m_index = AggregateIndex(columns[0], columns[1]).build()
+                if(cache is not None):
+                    cache.writeIndex(self.m_name, stat, self.m_index)
+        return self.m_index
+
+    # query() - The statistics of the data of lines [start, end) (see AggregateIndex.query()), or of seconds [start, end)
+    #           from the beginning of the file with inSeconds (4 lines per second, as the window parameters)
+    #           Normalized data is answered from the index of the data as recorded: normalization only shifts and
+    #           scales it, so the results are the same up to rounding (all nan for a file whose data never changes,
+    #           which normalization cannot scale)
+
+    def query(self, start, end, inSeconds = False, folderPath = None):
+        if(inSeconds):
+            start = math.ceil(start * 4)
+            end = math.ceil(end * 4)
+        index = self.index(folderPath)
+        result = index.query(start, end)
+
+        shift = 0.0
+        scale = 1.0
+        if(self.m_normType == MM_NORM):
+            shift, maxv = index.extremes(0, index.m_count)
+            scale = maxv - shift
+        if(self.m_normType == ZS_NORM):
+            shift, scale = index.m_average, index.m_standard
+        if(self.m_normType != -1 and scale == 0):
+            for key in ("mean", "std", "slope", "min", "max"):
+                result[key] = math.nan
+        elif(self.m_normType != -1):
+            for key in ("mean", "min", "max"):
+                result[key] = (result[key] - shift) / scale
+            result["std"] = result["std"] / scale
+            result["slope"] = result["slope"] / scale
+        return result
+
+
+    #######################################################################################################
+    # outputName() - Name of the output file of writeType (CALCS in the window parameters, or NORMS)
+
+    def outputName(self, params, writeType, normType = -1):
+        # newName: AVG_ct#_width_increment_start_originalfile.txt
+        newFName = ""
+        if(writeType == CALCS):
+            newFName = "CALCS_ct" + str(params[COUNT]) + "_w" + str(params[WIDTH]) + "_i" + str(params[INCRE]) + "_s" + str(params[START]) + "_" + self.m_name
+        elif(writeType == NORMS):
+            newFName = "NORM_" + self.m_name
+            if(normType == MM_NORM):
+                newFName = "NORM_MM_" + self.m_name
+            if(normType == ZS_NORM):
+                newFName = "NORM_ZS_" + self.m_name
+        return newFName
+
+    #######################################################################################################
+    # writeHeader() - Writes the lines of a calculation output file that come before its windows
+
+    def writeHeader(self, newF, params, doFeat):
+        sectTime = params[WIDTH]
+        incrTime = params[INCRE]
+        windowCt = params[COUNT]
+        startPos = params[START]
+
+        # Name of the original file
+        if(doFeat[NORMS]):
+            newF.write("[NOTE] File was normalized prior to calculation.\n\n")
+        newF.write("Calculations of file: " + self.m_name + "\n\n")
+
+        # Writing details of the windows
+        newF.write("[Details]\n")
+        newF.write("Window Count: %s\n" % (windowCt))
+        newF.write("Window width: %s lines of data, or %s seconds\n" % (sectTime, sectTime/4))
+        newF.write("Increments: Every %s lines of data, or %s seconds\n" % (incrTime, incrTime/4))
+        newF.write("Starting Position: line %s, or %s seconds\n\n" % (startPos, startPos/4))
+        # newF.write("Timestamps are exclusive. Notation: [start, end)\n\n")
+
+        headers = "Time:\t\t\t\t"
+        if(doFeat[AVG]):
+            headers = headers + "Average\t\t"
+        if(doFeat[STD]):
+            headers = headers + "Standard Dev.\t"
+        if(doFeat[SLOPE]):
+            headers = headers + "Slope\t\t"
+
+        newF.write(headers + "\n")
+
+    #######################################################################################################
+    # writeFile() - Writes the output files for both calculation and normalization depending on writeType
+
+    def writeFile(self, outputPath, params, writeType, doFeat, normType = -1):
+        try:
+            calcs = []
+            if(writeType == CALCS):
+                if(doFeat[AVG]):
+                    calcs.append(self.m_avg.m_data)
+                if(doFeat[STD]):
+                    calcs.append(self.m_std.m_data)
+                if(doFeat[SLOPE]):
+                    calcs.append(self.m_slope.m_data)
+
+            newFName = self.outputName(params, writeType, normType)
+            newFPath = outputPath + newFName
+
+            # Write new file
+            with commitFile(newFPath) as newF:
+                
+                ##########################
+                ### Calculation Output ###
+                ##########################
+
+                if(writeType == CALCS):
+                    self.writeHeader(newF, params, doFeat)
+
+                    # List of the timestamps and average per timestamp
+                    dataRange = params[COUNT]
+                    if(dataRange <= 0): # Window count was set to unlimited
+                        dataRange = int(len(calcs[0])) # No need to check which is the least since same window count as other calcs
+                    rows = min(dataRange, len(calcs[0]))
+
+                    # Timestamps, then the Calculated Data columns, each formatted as a whole column
+                    columns = [windowLabels(params, rows)]
+                    for calc in calcs:
+                        columns.append(prefixColumn("\t", formatColumn(calc, rows)))
+                    writeRows(newF, columns)
+                    checkRows(rows, dataRange)
+
+                    # Data file: window start and end (secs), then each feature, unrounded
+                    table = windowTable(params, rows)
+                    for feat, calc in zip(calcFeats(doFeat), calcs):
+                        table.add(FEATNAMES[feat], 'd', calc[:rows])
+
+                ############################
+                ### Normalization Output ###
+                ############################
+
+                if(writeType == NORMS):
+                    norms = self.m_NormData.m_data
+                    writeLines(newF, map("%s\t\t%s \n".__mod__, zip(self.m_time, norms)))
+
+                    # Data file: time (secs) and normalized EDA
+                    table = DataTable()
+                    table.add("time", 'd', self.m_time)
+                    table.add("eda", 'd', norms)
+
+            if(DATA_FORMAT != ""):
+                table.write(newFPath, DATA_FORMAT)
+
+            # Output Confirmation
+            if(writeType == CALCS):
+                print("[SAFE] Calculations output file for \"%s\" created!" % self.m_name)
+            elif(writeType == NORMS):
+                print("[SAFE] Normalized output file for \"%s\" created!" % self.m_name)
+
+            # File info returned for fileList.txt [size, name]
+            fileInfo = [os.stat(newFPath).st_size, newFName]
+            return fileInfo
+        except:
+            if(writeType == CALCS):
+                print("[ERROR] Calculations output file for \"%s\" failed!" % self.m_name)
+            elif(writeType == NORMS):
+                print("[ERROR] Normalized output file for \"%s\" failed!" % self.m_name)
+            
+            # Return dummy info for fileList.txt [size, name]
+            failedName = "[FAILED] " + newFName
+            fileInfo = [0, failedName]
+            return fileInfo
+
+    #######################################################################################################
+    # writeChunked() - Out-of-core mode: write the same CALCS or NORM output as writeFile(), a chunk of the file at a time
+    #           DATA_FORMAT files are not written (they need whole columns)
+
+    def writeChunked(self, outputPath, params, writeType, doFeat, normType = -1):
+        newFName = self.outputName(params, writeType, normType)
+        newFPath = outputPath + newFName
+        try:
+            data = self.chunked()
+            with commitFile(newFPath) as newF:
+
+                # Calculation Output: the windows of each chunk as it is calculated
+                if(writeType == CALCS):
+                    self.writeHeader(newF, params, doFeat)
+                    rows = windowCount(params, data.m_count)
+                    dataRange = params[COUNT]
+                    if(dataRange <= 0): # Window count was set to unlimited
+                        dataRange = rows
+                    for first, calcs in data.windows(params, calcFeats(doFeat), rows):
+                        columns = [windowLabels(params, len(calcs[0]), first)]
+                        for calc in calcs:
+                            columns.append(prefixColumn("\t", formatColumn(calc, len(calc))))
+                        writeRows(newF, columns)
+                    checkRows(rows, dataRange)
+
+                # Normalization Output: each chunk as it is normalized
+                if(writeType == NORMS):
+                    for times, norms in data.chunks():
+                        writeLines(newF, map("%s\t\t%s \n".__mod__, zip(times, norms)))
+
+            # Output Confirmation
+            if(writeType == CALCS):
+                print("[SAFE] Calculations output file for \"%s\" created!" % self.m_name)
+            elif(writeType == NORMS):
+                print("[SAFE] Normalized output file for \"%s\" created!" % self.m_name)
+
+            # File info returned for fileList.txt [size, name]
+            return [os.stat(newFPath).st_size, newFName]
+        except:
+            if(writeType == CALCS):
+                print("[ERROR] Calculations output file for \"%s\" failed!" % self.m_name)
+            elif(writeType == NORMS):
+                print("[ERROR] Normalized output file for \"%s\" failed!" % self.m_name)
+
+            # Return dummy info for fileList.txt [size, name]
+            return [0, "[FAILED] " + newFName]
+
+    #######################################################################################################
+    # writeAppend() - Incremental mode: read the lines added to the file since its checkpoint, then append the
+    #           normalized lines and the windows they complete to the NORM and CALCS outputs
+    #           Everything is written again from the start when the checkpoint cannot be continued from, or when
+    #           the new lines change the normalization (a new minimum or maximum; any new line for z-score)
+    #           Returns [NORM file info or None, [CALCS file info per window configuration]], each [size, name]
+
+    def writeAppend(self, outputPath, paramSets, doFeat):
+        normType = self.m_normType
+        filePath = self.m_folder + "\\" + self.m_name
+        names = []
+        if(doFeat[NORMS]):
+            names.append(self.outputName(None, NORMS, normType))
+        if(doFeat[CALCS]):
+            names.extend(self.outputName(params, CALCS) for params in paramSets)
+
+        try:
+            ckpt = Checkpoint(outputPath, self.m_name)
+            outputPaths = [outputPath + name for name in names]
+            fresh = not ckpt.read() or not ckpt.matches(filePath, normType, doFeat, paramSets, outputPaths)
+            if(not fresh):
+                times, values, offset = Clam.parseFrom(self.m_folder, self.m_name, ckpt.m_offset)
+                if(normType == MM_NORM and len(values) > 0):
+                    fresh = min(values) < ckpt.m_min or max(values) > ckpt.m_max
+                if(normType == ZS_NORM and len(values) > 0):
+                    fresh = True
+            if(fresh):
+                ckpt.start(normType, doFeat, paramSets)
+                times, values, offset = Clam.parseFrom(self.m_folder, self.m_name, 0)
+
+            if(len(values) > 0):
+                ckpt.m_min = min(ckpt.m_min, min(values))
+                ckpt.m_max = max(ckpt.m_max, max(values))
+            ckpt.m_offset = offset
+            ckpt.m_lines = ckpt.m_lines + len(values)
+            tailTimes = ckpt.m_tailTimes + times
+            tailData = ckpt.m_tailData + values
+
+            # Normalize the new lines and the tail (z-score only gets here with the whole file as new lines)
+            if(normType == MM_NORM):
+                norms = array('d', (MMNormData.normalize(value, ckpt.m_min, ckpt.m_max) for value in values))
+                tailNorms = array('d', (MMNormData.normalize(value, ckpt.m_min, ckpt.m_max) for value in tailData))
+            elif(normType == ZS_NORM and len(values) > 0):
+                norms = tailNorms = ZSNormData(values).m_data
+            else:
+                norms = values
+                tailNorms = tailData
+
+            mode = "a"
+            if(fresh):
+                mode = "w"
+            else: # Drop whatever a run that stopped before its checkpoint appended
+                for outputFPath, size in zip(outputPaths, ckpt.outputSizes(doFeat, paramSets)):
+                    os.truncate(outputFPath, size)
+            normInfo = None
+            calcInfos = []
+
+            # Normalization Output
+            if(doFeat[NORMS]):
+                with open(outputPath + names[0], mode) as newF:
+                    writeLines(newF, map("%s\t\t%s \n".__mod__, zip(times, norms)))
+                normInfo = [os.stat(outputPath + names[0]).st_size, names[0]]
+                ckpt.m_normSize = normInfo[0]
+
+            # Calculation Output: the windows completed since the last run, per window configuration
+            keepFrom = ckpt.m_lines
+            sums = None
+            for params in paramSets:
+                if(not doFeat[CALCS]):
+                    break
+                key = tuple(params)
+                first = ckpt.m_windows[key]
+                total = windowCount(params, ckpt.m_lines)
+                starts = [params[START] + (i * params[INCRE]) - ckpt.m_tailPos for i in range(first, total)]
+
+                calcs = []
+                if(len(starts) > 0):
+                    if(sums is None):
+                        sums = WindowSums(tailTimes, tailNorms)
+                    calcs = sums.calcWindows(params, calcFeats(doFeat), starts)
+
+                newFName = self.outputName(params, CALCS)
+                with open(outputPath + newFName, mode) as newF:
+                    if(fresh):
+                        self.writeHeader(newF, params, doFeat)
+                    columns = [windowLabels(params, len(starts), first)]
+                    for calc in calcs:
+                        columns.append(prefixColumn("\t", formatColumn(calc, len(calc))))
+                    writeRows(newF, columns)
+                calcInfos.append([os.stat(outputPath + newFName).st_size, newFName])
+                ckpt.m_sizes[key] = calcInfos[-1][0]
+
+                # Lines from the start of the next window on are still needed, unless no more windows will come
+                ckpt.m_windows[key] = total
+                if((params[COUNT] <= 0 or total < params[COUNT]) and (params[INCRE] > 0 or total == 0)):
+                    keepFrom = min(keepFrom, params[START] + (total * params[INCRE]))
+
+            # Keep the tail for the next run
+            keepFrom = max(keepFrom, ckpt.m_tailPos)
+            ckpt.m_tailTimes = tailTimes[keepFrom - ckpt.m_tailPos:]
+            ckpt.m_tailData = tailData[keepFrom - ckpt.m_tailPos:]
+            ckpt.m_tailPos = keepFrom
+            ckpt.write(filePath)
+
+            print("[SAFE] Output files for \"%s\" brought up to date! (%s new lines)" % (self.m_name, len(values)))
+            return [normInfo, calcInfos]
+        except:
+            print("[ERROR] Incremental output files for \"%s\" failed!" % self.m_name)
+
+            # Return dummy info for fileList.txt [size, name]
+            failed = [[0, "[FAILED] " + name] for name in names]
+            if(doFeat[NORMS]):
+                return [failed[0], failed[1:]]
+            return [None, failed]
+
+###=-=-=-=-=-=-= END CLASS NAMEDATA =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS SYNCPAIR =-=-=-=-=-=-=###
+
+class SyncPair:
+    __slots__ = ("m_first", "m_second", "m_name", "m_DA_count", "m_DA_runs", "m_SM_diffs", "m_XC", "m_XC_windows", "m_sums",
+                 "m_SW", "m_tag", "m_maxlen")
+
+    def __init__(self, first = None, second = None):
+        if(second == None):
+            self.m_first = first
+            self.m_second = second
+        else:
+            if("_TL_" in second.m_name):
+                self.m_first = second
+                self.m_second = first
+            else:
+                self.m_first = first
+                self.m_second = second
+        self.m_name = self.m_first.m_name # Output name, set when writing
+
+        # Initialize the DA vars (None until calculated)
+        self.m_DA_count = 0
+        self.m_DA_runs = None
+
+        # Initialize the SM vars (None until calculated)
+        self.m_SM_diffs = None
+
+        # Initialize the Cross-Correlation vars (None until calculated)
+        self.m_XC = None # [correlation per lag, peak lag, peak correlation] of the whole recording
+        self.m_XC_windows = None # [peak lags, peak correlations] of every window of the last window parameters calculated
+
+        # Initialize the windowed synchrony vars (None until calculated)
+        self.m_sums = None # PairSums of both members' data, built on first calculation
+        self.m_SW = None # [correlations, mean differences, agreement ratios] of the last window parameters calculated
+
+        # Member IDs put in the output names when the session has more than two members, "" otherwise
+        self.m_tag = ""
+
+        self.m_maxlen = 0
+        if(self.m_first.m_data is not None): # Otherwise set once the pair is loaded (Clam lazy mode)
+            self.calcMaxLen()
+
+    #######################################################################################################
+    # calcMaxLen() - Set the amount of data both members have
+
+    def calcMaxLen(self):
+        self.m_maxlen = len(self.m_first.m_data)
+        # Correct the maxlen (should be the lesser of the two)
+        if(self.m_second is not None):
+            if(len(self.m_second.m_data) < self.m_maxlen): # Use lessthan to prevent OOB exceptions
+                self.m_maxlen = len(self.m_second.m_data)
+
+    #######################################################################################################
+    # samples() / label() - Lines of data both members have (None until known), and the name used in the metrics file
+
+    def samples(self):
+        return self.m_maxlen if self.m_maxlen > 0 else None
+
+    def label(self):
+        if(self.m_second is None):
+            return self.m_first.m_name
+        return self.m_first.m_name + " + " + self.m_second.m_name
+
+    #######################################################################################################
+    # load() / unload() - Load or release both members of the pair (Clam lazy mode)
+    #           Unloading also releases the DA, SM, Cross-Correlation and synchrony results, which are recalculated when needed
+
+    def load(self):
+        self.m_first.load()
+        if(self.m_second is not None):
+            self.m_second.load()
+        self.calcMaxLen()
+
+    def unload(self):
+        if(self.m_first.m_folder is not None):
+            self.m_first.unload()
+            if(self.m_second is not None):
+                self.m_second.unload()
+            self.m_DA_runs = None
+            self.m_SM_diffs = None
+            self.m_XC = self.m_XC_windows = None
+            self.m_sums = self.m_SW = None
+    
+    #######################################################################################################
+    # calcFeatures() - Calculate the selected window features of both members of the pair, and their windowed synchrony
+
+    def calcFeatures(self, params, doFeat):
+        self.m_first.calcFeatures(params, doFeat)
+        if(self.m_second is not None):
+            self.m_second.calcFeatures(params, doFeat)
+            if(doFeat[SYNCW]):
+                self.m_SW = self.cached(("SW", self.m_first.m_normType, tuple(params)), lambda: self.getSums().calcWindows(params))
+
+    #######################################################################################################
+    # getSums() - Build the synchrony window engine of the pair once, then share it between window parameters
+
+    def getSums(self):
+        if(self.m_sums is None):
+            self.m_sums = PairSums(self.m_first.m_data, self.m_second.m_data, self.m_maxlen)
+        return self.m_sums
+
+    #######################################################################################################
+    # __getstate__() - When sent to a worker process, leave the synchrony window engine behind (see NameData)
+
+    def __getstate__(self):
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["m_sums"] = None
+        return (None, state)
+
+    #######################################################################################################
+    # cached() - The columns calculate() produces for the data of both members, read from the result cache when they
+    #           were kept there (see ResultCache), otherwise calculated and kept
+    #           parts tells the result apart from the others of the pair (what it is, normalization, window parameters)
+
+    def cached(self, parts, calculate):
+        if(self.m_second is None or self.m_first.m_results is None or self.m_second.m_results is None):
+            return calculate()
+        return self.m_first.m_results.fetch(self.m_first.m_results.key(parts, self.m_second.m_results), calculate)
+
+    #######################################################################################################
+    # calcMatch() - Calculate the amount of matches for Directional Agreement, and its intervals
+    #
+    #           Each member's data becomes a column of signs of change (1 increasing, -1 decreasing), where no
+    #           change keeps the previous sign and 0 ("x") means no change has been seen yet. The pair of signs
+    #           is packed into one small number per position (see packSigns()) and run-length encoded once:
+    #           m_DA_runs is [run starting positions, packed signs of each run], and the writer's intervals are
+    #           read straight from it.
+    #           matchColumns() does the calculation, as the columns [[number of matches], run starts, run signs],
+    #           so calcMatch() can take them from the result cache instead
+
+    def calcMatch(self):
+        count, starts, codes = self.cached(("DA", self.m_first.m_normType), self.matchColumns)
+        # number of matches
+        self.m_DA_count = count[0]
+        # runs of the same pair of signs
+        self.m_DA_runs = [starts, codes]
+
+    def matchColumns(self):
+        if(self.m_second is None or self.m_maxlen <= 0):
+            return [array('q', [0]), array('I'), array('B')]
+
+        signsA = self.calcSigns(self.m_first.m_data, self.m_maxlen)
+        signsB = self.calcSigns(self.m_second.m_data, self.m_maxlen)
+
+        # The first position has nothing before it to compare with, so it is never a match
+        count = sum(self.calcMatches(signsA, signsB)) - 1
+
+        # A run starts wherever the pair of signs differs from the position before
+        codes = array('B', map(self.packSigns, signsA, signsB))
+        changed = map(operator.ne, codes[1:], codes[:-1])
+        starts = array('I' if self.m_maxlen <= 0xFFFFFFFF else 'Q', [0])
+        starts.extend(compress(range(1, self.m_maxlen), changed))
+        return [array('q', [count]), starts, array('B', map(codes.__getitem__, starts))]
+
+    #####################################################
+    # packSigns() / unpackSigns() - Pack the TL and P signs of change (1, -1 or 0) into one number from 0 to 8,
+    #           and back into [TL sign, P sign]
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def packSigns(signA, signB):
+        return ((signA + 1) * 3) + (signB + 1)
+
+    @staticmethod
+    def unpackSigns(code):
+        return [(code // 3) - 1, (code % 3) - 1]
+
+    #####################################################
+    # calcSigns() - Produce the column of signs of change of the first maxlen values of data
+    #           sign is the sign of the first value, when data continues a column (0 otherwise)
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def calcSigns(data, maxlen, sign = 0):
+        rises = map(operator.gt, data[1:maxlen], data[:maxlen - 1])
+        falls = map(operator.lt, data[1:maxlen], data[:maxlen - 1])
+        changes = map(operator.sub, rises, falls)
+
+        # Forward fill: no change (0) keeps the previous sign
+        return array('b', accumulate(changes, lambda prev, change: change or prev, initial = sign))
+
+    #####################################################
+    # calcMatches() - Produce the column of Directional Agreement matches (True where both signs are the same,
+    #           including both still without a change), as the DIRAG match count takes them
+    #           staticmethod due to not using self values
+
+    @staticmethod
+    def calcMatches(signsA, signsB):
+        return map(operator.eq, signsA, signsB)
+    
+    #######################################################################################################
+    # calcDiffs() - Calculate the difference values of the pair
+
+    def calcDiffs(self):
+        # column of float values (difference between two points), lined up with m_first.m_time
+        self.m_SM_diffs = self.cached(("SM", self.m_first.m_normType), self.diffColumns)[0]
+
+    def diffColumns(self):
+        if(self.m_second is None):
+            return [array('d')]
+        dataA = self.m_first.m_data
+        dataB = self.m_second.m_data
+        return [array('d', (abs(dataA[i] - dataB[i]) for i in range(self.m_maxlen)))]
+
+
+    #######################################################################################################
+    # calcXCorr() - Calculate the Cross-Correlation of the pair over the whole recording (see crossCorrelate())
+    # calcXCorrWindows() - Calculate it within every window of the window parameters, keeping the peak of each
+
+    def calcXCorr(self):
+        self.m_XC = None
+        if(self.m_second is not None and self.m_maxlen > 0):
+            self.m_XC = crossCorrelate(self.m_first.m_data[:self.m_maxlen], self.m_second.m_data[:self.m_maxlen], XCORR_LAG)
+
+    def calcXCorrWindows(self, params):
+        self.m_XC_windows = [array('q'), array('d')]
+        if(self.m_second is not None):
+            dataA = self.m_first.m_data
+            dataB = self.m_second.m_data
+            for i in range(windowCount(params, self.m_maxlen)):
+                start = params[START] + (i * params[INCRE])
+                end = start + params[WIDTH]
+                curve, lag, peak = crossCorrelate(dataA[start:end], dataB[start:end], XCORR_LAG)
+                self.m_XC_windows[0].append(lag)
+                self.m_XC_windows[1].append(peak)
+
+    #######################################################################################################
+    # outputName() - Name of the output file of writeType (CALCS or XCORRW in the window parameters, DIRAG, SIGMA or XCORR)
+    #           Also sets the pair's own name, SYNC_Sess#[_IDa-IDb]_DATE_STARTTIME_ENDTIME_PROC.txt
+    #           (SYNC_FILENAME[_IDa-IDb].txt, after the first member, for a file without a "Session" tag)
+
+    def outputName(self, params, writeType):
+        sessFile = self.m_first.m_name.split("_")
+        # 0        1  2    3     4          5      6         7       8
+        # Session#_ID_DATE_COLOR_PAIRMEMBER_BANDID_STARTTIME_ENDTIME_"PROC".txt
+
+        sessID = parseSession(self.m_first.m_name)[0]
+        if(sessID is None):
+            stem, extension = os.path.splitext(self.m_first.m_name)
+            sessName = "SYNC_" + stem
+            if(self.m_tag != ""):
+                sessName = sessName + "_" + self.m_tag
+            self.m_name = sessName + extension
+        else:
+            sessDate = sessFile[2]
+            sessEnd = sessFile[6] + "_" + sessFile[7] + "_" + sessFile[8]
+
+            sessName = "SYNC_Sess" + sessID
+            if(self.m_tag != ""):
+                sessName = sessName + "_" + self.m_tag
+            self.m_name = sessName + "_" + sessDate + "_" + sessEnd
+        newFName = ""
+        if(writeType == CALCS):
+            newFName = "CALCS_ct" + str(params[COUNT]) + "_w" + str(params[WIDTH]) + "_i" + str(params[INCRE]) + "_s" + str(params[START]) + "_" + self.m_name
+        if(writeType == DIRAG):
+            newFName = "DIRAG_" + self.m_name
+        if(writeType == SIGMA):
+            newFName = "SIGMA_" + self.m_name
+        if(writeType == XCORR):
+            newFName = "XCORR_" + self.m_name
+        if(writeType == XCORRW):
+            newFName = "XCORR_ct" + str(params[COUNT]) + "_w" + str(params[WIDTH]) + "_i" + str(params[INCRE]) + "_s" + str(params[START]) + "_" + self.m_name
+        return newFName
+
+    #######################################################################################################
+    # writeHeader() - Write the name(s) of the file(s), window details and column headers of a CALCS output
+
+    def writeHeader(self, newF, params, doFeat):
+        sectTime = params[WIDTH]
+        incrTime = params[INCRE]
+        windowCt = params[COUNT]
+        startPos = params[START]
+
+        # Name of the original file
+        if(doFeat[NORMS]):
+            newF.write("[NOTE] File was normalized prior to calculation.\n\n")
+        if(self.m_second is not None):
+            newF.write("Calculations of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+        else:
+            newF.write("Calculations of file:\n" + self.m_first.m_name + "\n\n")
+
+        # Writing details of the windows
+        newF.write("[Details]\n")
+        newF.write("Window Count: %s\n" % (windowCt))
+        newF.write("Window width: %s lines of data, or %s seconds\n" % (sectTime, sectTime/4))
+        newF.write("Increments: Every %s lines of data, or %s seconds\n" % (incrTime, incrTime/4))
+        newF.write("Starting Position: line %s, or %s seconds\n\n" % (startPos, startPos/4))
+        # newF.write("Timestamps are exclusive. Notation: [start, end)\n\n")
+
+        headers1 = "\t\t\t\t"
+        headers2 = "Time:\t\t\t\t"
+        if(doFeat[AVG]):
+            headers1 = headers1 + "Average\t\t\t\t"
+            if(self.m_second == None):
+                headers2 = headers2 + "Solo Data\t\t\t"
+            else:
+                headers2 = headers2 + "Team Leader\tPartner\t\t"
+        if(doFeat[STD]):
+            headers1 = headers1 + "Standard Dev.\t\t\t"
+            if(self.m_second == None):
+                headers2 = headers2 + "Solo Data\t\t\t"
+            else:
+                headers2 = headers2 + "Team Leader\tPartner\t\t"
+        if(doFeat[SLOPE]):
+            headers1 = headers1 + "Slope\t\t\t\t"
+            if(self.m_second == None):
+                headers2 = headers2 + "Solo Data\t\t\t"
+            else:
+                headers2 = headers2 + "Team Leader\tPartner\t\t"
+        if(doFeat[SYNCW] and self.m_second is not None):
+            headers1 = headers1 + "Synchrony\t\t\t\t\t\t"
+            headers2 = headers2 + "Pearson r\tMean Diff.\tDA Ratio\t"
+
+        newF.write(headers1 + "\n" + headers2 + "\n")
+
+    #######################################################################################################
+    # writeCalcRows() - Write the rows of count windows of a CALCS output, from window number first on
+    #           calcs holds [TL values, P values (None for a lone file)] per feature, sync the windowed synchrony (or None)
+
+    def writeCalcRows(self, newF, params, calcs, count, first = 0, sync = None):
+        # Timestamps, then the Calculated Data columns, each formatted as a whole column
+        columns = [windowLabels(params, count, first)]
+        for calc in calcs:
+            if(self.m_second == None):
+                columns.append(prefixColumn("\t", formatColumn(calc[0], count), "\t\t"))
+            else:
+                columns.append(prefixColumn("\t", formatColumn(calc[0], count)))
+                columns.append(prefixColumn("\t", formatColumn(calc[1], count)))
+        if(sync is not None):
+            columns.extend(prefixColumn("\t", formatColumn(values, count)) for values in sync)
+        writeRows(newF, columns)
+
+    #######################################################################################################
+    # writeSigmaHeader() / writeSigmaRows() - Write the details of a SIGMA output (total: the sum of the differences),
+    #           then rows of time, difference, TL data and P data
+    # writeXCorrHeader() - Write the names of the files and the lags of an XCORR output
+
+    def writeSigmaHeader(self, newF, total):
+        newF.write("Signal Matching data of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+
+        # Writing details of the windows
+        newF.write("[Details]\n")
+        newF.write("Data Count: %s\n" % (self.m_maxlen))
+
+        dataAvg = total / self.m_maxlen
+        newF.write("Overall mean difference: %s\n\n" % (dataAvg))
+
+        # Data Header
+        header = "Time:\t\tDifference:\t\t\tTL Data:\t\t\tP Data:\n"
+        newF.write(header)
+
+    def writeXCorrHeader(self, newF, title, maxLag):
+        newF.write(title + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+
+        # Writing details of the lags
+        newF.write("[Details]\n")
+        newF.write("Lags: %s to %s lines of data, or %s to %s seconds\n" % (-maxLag, maxLag, -maxLag/4, maxLag/4))
+        newF.write("Positive lags: the Partner follows the Team Leader. Negative lags: the Team Leader follows the Partner.\n")
+
+    def writeSigmaRows(self, newF, times, diffs, dataA, dataB):
+        times = map(str.ljust, map(str, times), repeat(7))
+        columns = [times, prefixColumn("\t\t", map(str, diffs))]
+        columns.append(prefixColumn("\t\t", map(str, dataA)))
+        columns.append(prefixColumn("\t\t", map(str, dataB)))
+        writeRows(newF, columns)
+
+    #######################################################################################################
+    # writeFile() - Writes the output files for both calculation and normalization depending on writeType
+
+    def writeFile(self, outputPath, params, writeType, doFeat):
+        try:
+            calcs = []
+            table = None # DataTable of the data file, if one is written
+            if(writeType == CALCS):
+                if(self.m_second is not None):
+                    if(doFeat[AVG]):
+                        calcs.append([self.m_first.m_avg.m_data, self.m_second.m_avg.m_data])
+                    if(doFeat[STD]):
+                        calcs.append([self.m_first.m_std.m_data, self.m_second.m_std.m_data])
+                    if(doFeat[SLOPE]):
+                        calcs.append([self.m_first.m_slope.m_data, self.m_second.m_slope.m_data])
+                else:
+                    if(doFeat[AVG]):
+                        calcs.append([self.m_first.m_avg.m_data, None])
+                    if(doFeat[STD]):
+                        calcs.append([self.m_first.m_std.m_data, None])
+                    if(doFeat[SLOPE]):
+                        calcs.append([self.m_first.m_slope.m_data, None])
+
+            newFName = self.outputName(params, writeType)
+            newFPath = outputPath + newFName
+
+            # Write new calculations or normalization file
+
+            if(writeType == DIRAG and self.m_second is None):
+                print("[WARN] Directional Agreement file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
+            if((writeType == XCORR or writeType == XCORRW) and self.m_second is None):
+                print("[WARN] Cross-Correlation file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
+            elif(writeType == SIGMA and self.m_second is None):
+                print("[WARN] Signal Matching file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
+            else:
+                with commitFile(newFPath) as newF:
+                    
+                    ##########################
+                    ### Calculation Output ###
+                    ##########################
+
+                    if(writeType == CALCS):
+                        self.writeHeader(newF, params, doFeat)
+
+                        # List of the timestamps and average per timestamp
+                        dataRange = params[COUNT]
+                        if(dataRange <= 0): # Window count was set to unlimited
+                            dataRange = int(len(calcs[0][0])) 
+                            # Check which is the least to avoid errors where one set is longer than the other in pairs
+                            if(calcs[0][1] is not None):
+                                if(int(len(calcs[0][1])) < dataRange):
+                                    dataRange = int(len(calcs[0][1]))
+                        rows = min(dataRange, len(calcs[0][0]))
+                        if(calcs[0][1] is not None):
+                            rows = min(rows, len(calcs[0][1]))
+
+                        sync = None
+                        if(doFeat[SYNCW] and self.m_second is not None):
+                            sync = self.m_SW
+                        self.writeCalcRows(newF, params, calcs, rows, 0, sync)
+                        checkRows(rows, dataRange)
+
+                        # Data file: window start and end (secs), then each feature (of the TL and P), unrounded
+                        table = windowTable(params, rows)
+                        for feat, calc in zip(calcFeats(doFeat), calcs):
+                            if(self.m_second == None):
+                                table.add(FEATNAMES[feat], 'd', calc[0][:rows])
+                            else:
+                                table.add(FEATNAMES[feat] + "_tl", 'd', calc[0][:rows])
+                                table.add(FEATNAMES[feat] + "_p", 'd', calc[1][:rows])
+                        if(sync is not None):
+                            for name, values in zip(SYNCNAMES, sync):
+                                table.add(name, 'd', values[:rows])
+
+                    ##############################
+                    ### Signal Matching Output ###
+                    ##############################
+
+                    elif(writeType == SIGMA and self.m_second is not None):
+                        # Calculate average of the whole set (added up in order, one value at a time)
+                        temp = functools.reduce(operator.add, self.m_SM_diffs[:self.m_maxlen], 0.0)
+                        self.writeSigmaHeader(newF, temp)
+
+                        # Write data, each column formatted as a whole
+                        count = self.m_maxlen
+                        self.writeSigmaRows(newF, self.m_first.m_time[:count], self.m_SM_diffs[:count], self.m_first.m_data[:count], self.m_second.m_data[:count])
+
+                        # Data file: time (secs), difference, TL and P data
+                        table = DataTable()
+                        table.add("time", 'd', self.m_first.m_time[:count])
+                        table.add("difference", 'd', self.m_SM_diffs[:count])
+                        table.add("eda_tl", 'd', self.m_first.m_data[:count])
+                        table.add("eda_p", 'd', self.m_second.m_data[:count])
+
+                    ################################
+                    ### Cross-Correlation Output ###
+                    ################################
+
+                    elif(writeType == XCORR and self.m_second is not None):
+                        curve, peakLag, peak = self.m_XC
+                        maxLag = len(curve) // 2
+                        self.writeXCorrHeader(newF, "Cross-Correlation of files:\n", maxLag)
+                        newF.write("Data Count: %s\n" % (self.m_maxlen))
+                        newF.write("Peak Lag: %s lines of data, or %s seconds\n" % (peakLag, peakLag/4))
+                        newF.write("Peak Correlation: %s\n\n" % (peak))
+
+                        # Data Header, then the correlation at every lag
+                        newF.write("Lag:\t\tCorrelation:\n")
+                        lags = [lag/4 for lag in range(-maxLag, maxLag + 1)]
+                        columns = [map(str.ljust, map(str, lags), repeat(7)), prefixColumn("\t\t", formatColumn(curve, len(curve)))]
+                        writeRows(newF, columns)
+
+                        # Data file: lag (secs) and correlation
+                        table = DataTable()
+                        table.add("lag", 'd', lags)
+                        table.add("correlation", 'd', curve)
+
+                    elif(writeType == XCORRW and self.m_second is not None):
+                        lags, peaks = self.m_XC_windows
+                        self.writeXCorrHeader(newF, "Cross-Correlation per window of files:\n", max(0, min(XCORR_LAG, params[WIDTH] - 1)))
+                        newF.write("Window Count: %s\n" % (params[COUNT]))
+                        newF.write("Window width: %s lines of data, or %s seconds\n" % (params[WIDTH], params[WIDTH]/4))
+                        newF.write("Increments: Every %s lines of data, or %s seconds\n" % (params[INCRE], params[INCRE]/4))
+                        newF.write("Starting Position: line %s, or %s seconds\n\n" % (params[START], params[START]/4))
+
+                        # Data Header, then the peak lag (secs) and peak correlation of every window
+                        newF.write("Time:\t\t\t\tPeak Lag:\tPeak Correlation:\n")
+                        dataRange = params[COUNT]
+                        if(dataRange <= 0): # Window count was set to unlimited
+                            dataRange = len(peaks)
+                        rows = min(dataRange, len(peaks))
+                        lagSecs = [lag/4 for lag in lags[:rows]]
+                        columns = [windowLabels(params, rows), prefixColumn("\t", map(str.ljust, map(str, lagSecs), repeat(7))),
+                                   prefixColumn("\t", formatColumn(peaks, rows))]
+                        writeRows(newF, columns)
+                        checkRows(rows, dataRange)
+
+                        # Data file: window start and end (secs), then the peak lag (secs) and peak correlation
+                        table = windowTable(params, rows)
+                        table.add("peak_lag", 'd', lagSecs)
+                        table.add("peak_correlation", 'd', peaks[:rows])
+
+                    ####################################
+                    ### Directional Agreement Output ###
+                    ####################################
+
+                    elif(writeType == DIRAG and self.m_second is not None):
+                        newF.write("Directional Agreement of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+
+                        # Writing details of the windows
+                        newF.write("[Details]\n")
+                        newF.write("Data Count: %s\n" % (self.m_maxlen))
+                        newF.write("Matches: %s\n\n" % (self.m_DA_count))
+
+                        # Each run of m_DA_runs is an interval: it ends on the position before the next run starts,
+                        # and the next interval begins there too
+                        # The interval still going on at the end of the data is not written
+                        starts, codes = self.m_DA_runs
+                        signs = list(map(self.unpackSigns, codes))
+                        signsA = [sign[0] for sign in signs]
+                        signsB = [sign[1] for sign in signs]
+                        lines = []
+                        start = 0
+                        for k in range(len(starts) - 1):
+                            end = (starts[k + 1] - 1) / 4.0
+
+                            # Build the new line
+                            newWrite = '{:<7}'.format(str(start)) + " secs - " + '{:>7}'.format(str(end)) + " secs:"
+
+                            if(signsA[k] == signsB[k] and signsA[k] != 0): # If it was a match
+                                if(signsA[k] == 1):
+                                    signstr = "Increasing\t"
+                                else:
+                                    signstr = "Decreasing\t"
+                            else: # If it was not a match
+                                signstr = "Opposites TL: " + SIGNS[signsA[k]] + " P: " + SIGNS[signsB[k]]
+
+                            # Elapsed time during the sync/desync
+                            elapsed = end - start
+
+                            newWrite = newWrite + "\t" + str(signstr) + "\tElapsed Time: " + '{:<7}'.format(str(elapsed)) + "\n"
+
+                            # Add the new line
+                            lines.append(newWrite)
+
+                            # Begin next interval (Starting at the end of this one because it is changing since that point)
+                            start = end
+
+                        writeLines(newF, lines)
+
+                        # Data file: interval start, end and elapsed time (secs), then the TL and P signs
+                        #       (1 increasing, -1 decreasing, 0 no change yet) and whether they match
+                        ends = [(starts[k + 1] - 1) / 4.0 for k in range(len(starts) - 1)]
+                        begins = [0] + ends[:-1]
+                        table = DataTable()
+                        table.add("start", 'd', begins)
+                        table.add("end", 'd', ends)
+                        table.add("elapsed", 'd', map(operator.sub, ends, begins))
+                        table.add("sign_tl", 'b', signsA[:len(ends)])
+                        table.add("sign_p", 'b', signsB[:len(ends)])
+                        table.add("match", 'b', (a == b and a != 0 for a, b in zip(signsA[:len(ends)], signsB)))
+
+                    ###################
+                    ### End Outputs ###
+                    ###################
+
+                if(DATA_FORMAT != "" and table is not None):
+                    table.write(newFPath, DATA_FORMAT)
 
             # Output Confirmation
             if(writeType == CALCS):
                 print("[SAFE] Calculations output file for \"%s\" created!" % self.m_name)
-            elif(writeType == NORMS):
-                print("[SAFE] Normalized output file for \"%s\" created!" % self.m_name)
+            if(writeType == DIRAG and self.m_second is not None):
+                print("[SAFE] Directional Agreement file for \"%s\" created!" % self.m_name)
+            if(writeType == SIGMA and self.m_second is not None):
+                print("[SAFE] Signal Matching file for \"%s\" created!" % self.m_name)
+            if((writeType == XCORR or writeType == XCORRW) and self.m_second is not None):
+                print("[SAFE] Cross-Correlation file for \"%s\" created!" % self.m_name)
 
             # File info returned for fileList.txt [size, name]
-            fileInfo = [os.stat(newFPath).st_size, newFName]
+            if(self.m_second is None and writeType in (DIRAG, SIGMA, XCORR, XCORRW)):
+                fileInfo = [0, newFName]
+            else:
+                fileInfo = [os.stat(newFPath).st_size, newFName]
             return fileInfo
         except:
             if(writeType == CALCS):
                 print("[ERROR] Calculations output file for \"%s\" failed!" % self.m_name)
-            elif(writeType == NORMS):
-                print("[ERROR] Normalized output file for \"%s\" failed!" % self.m_name)
+            if(writeType == DIRAG):
+                print("[ERROR] Directional Agreement file for \"%s\" failed!" % self.m_name)
+            if(writeType == SIGMA):
+                print("[ERROR] Signal Matching file for \"%s\" failed!" % self.m_name)
+            if(writeType == XCORR or writeType == XCORRW):
+                print("[ERROR] Cross-Correlation file for \"%s\" failed!" % self.m_name)
             
             # Return dummy info for fileList.txt [size, name]
             failedName = "[FAILED] " + newFName
             fileInfo = [0, failedName]
             return fileInfo
 
-###=-=-=-=-=-=-= END CLASS NAMEDATA =-=-=-=-=-=-=###
+    #######################################################################################################
+    # windows() - Out-of-core mode: calculate the windowed synchrony of the first total windows in params from the
+    #           members' ChunkedData, a chunk of both at a time (see ChunkedData.windows())
+
+    def windows(self, members, params, total):
+        for first, starts, (dataA, dataB, matches) in windowBatches(self.matchChunks(members), params, total):
+            yield [first, PairSums(dataA, dataB, len(dataA), matches).calcWindows(params, starts)]
+
+    # matchChunks() - The data of both members and their Directional Agreement matches, a chunk at a time
+    #           Each chunk's signs carry on from the last value and sign of the one before, as in one whole column
+
+    def matchChunks(self, members):
+        lastA = lastB = None # [last value, its sign]
+        for chunkA, chunkB in zip(members[0].chunks(), members[1].chunks()):
+            count = min(len(chunkA[1]), len(chunkB[1]))
+            dataA = chunkA[1][:count]
+            dataB = chunkB[1][:count]
+            if(lastA is None):
+                signsA = self.calcSigns(dataA, count)
+                signsB = self.calcSigns(dataB, count)
+            else:
+                signsA = self.calcSigns(array('d', [lastA[0]]) + dataA, count + 1, lastA[1])[1:]
+                signsB = self.calcSigns(array('d', [lastB[0]]) + dataB, count + 1, lastB[1])[1:]
+            if(count > 0):
+                lastA = [dataA[-1], signsA[-1]]
+                lastB = [dataB[-1], signsB[-1]]
+            yield dataA, dataB, array('d', self.calcMatches(signsA, signsB))
 
+    #######################################################################################################
+    # writeChunked() - Out-of-core mode: write the same CALCS or SIGMA output as writeFile(), a chunk of both files at a
+    #           time (DIRAG is written by writeFile(), with the pair loaded). DATA_FORMAT files are not written
 
+    def writeChunked(self, outputPath, params, writeType, doFeat):
+        newFName = self.outputName(params, writeType)
+        newFPath = outputPath + newFName
+        try:
+            members = [self.m_first.chunked()]
+            if(self.m_second is not None):
+                members.append(self.m_second.chunked())
+            self.m_maxlen = min(member.m_count for member in members)
 
-###=-=-=-=-=-=-= BEGIN CLASS SYNCPAIR =-=-=-=-=-=-=###
+            if(writeType == SIGMA and self.m_second is None):
+                print("[WARN] Signal Matching file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
+                return [0, newFName]
 
-class SyncPair:
-    def __init__(self, first = None, second = None):
-        if(second == None):
-            self.m_first = first
-            self.m_second = second
+            with commitFile(newFPath) as newF:
+
+                # Calculation Output: as many rows as the member with the fewest windows has (see writeFile())
+                if(writeType == CALCS):
+                    self.writeHeader(newF, params, doFeat)
+                    rows = min(windowCount(params, member.m_count) for member in members)
+                    dataRange = params[COUNT]
+                    if(dataRange <= 0): # Window count was set to unlimited
+                        dataRange = rows
+
+                    # Both files are read in chunks of the same lines, so each chunk completes the same windows of both
+                    feats = calcFeats(doFeat)
+                    batches = [member.windows(params, feats, rows) for member in members]
+                    if(doFeat[SYNCW] and self.m_second is not None):
+                        batches.append(self.windows(members, params, rows))
+                    for batch in zip(*batches):
+                        first, calcsA = batch[0]
+                        calcsB = [None] * len(feats)
+                        sync = None
+                        for other in batch[1:]:
+                            if(other[0] != first or len(other[1][0]) != len(calcsA[0])):
+                                raise ValueError("The windows of the pair are not lined up")
+                        if(len(batch) > 1):
+                            calcsB = batch[1][1]
+                        if(len(batch) > 2):
+                            sync = batch[2][1]
+                        self.writeCalcRows(newF, params, [list(calc) for calc in zip(calcsA, calcsB)], len(calcsA[0]), first, sync)
+                    checkRows(rows, dataRange)
+
+                # Signal Matching Output: a first pass adds up the differences (in order, as writeFile() does), the second writes them
+                if(writeType == SIGMA):
+                    total = 0.0
+                    for chunkA, chunkB in zip(members[0].chunks(), members[1].chunks()):
+                        count = min(len(chunkA[1]), len(chunkB[1]))
+                        total = functools.reduce(operator.add, map(abs, map(operator.sub, chunkA[1][:count], chunkB[1][:count])), total)
+                    self.writeSigmaHeader(newF, total)
+
+                    for chunkA, chunkB in zip(members[0].chunks(), members[1].chunks()):
+                        count = min(len(chunkA[1]), len(chunkB[1]))
+                        diffs = array('d', map(abs, map(operator.sub, chunkA[1][:count], chunkB[1][:count])))
+                        self.writeSigmaRows(newF, chunkA[0][:count], diffs, chunkA[1][:count], chunkB[1][:count])
+
+            # Output Confirmation
+            if(writeType == CALCS):
+                print("[SAFE] Calculations output file for \"%s\" created!" % self.m_name)
+            if(writeType == SIGMA):
+                print("[SAFE] Signal Matching file for \"%s\" created!" % self.m_name)
+
+            # File info returned for fileList.txt [size, name]
+            return [os.stat(newFPath).st_size, newFName]
+        except:
+            if(writeType == CALCS):
+                print("[ERROR] Calculations output file for \"%s\" failed!" % self.m_name)
+            if(writeType == SIGMA):
+                print("[ERROR] Signal Matching file for \"%s\" failed!" % self.m_name)
+
+            # Return dummy info for fileList.txt [size, name]
+            return [0, "[FAILED] " + newFName]
+
+###=-=-=-=-=-=-= END CLASS SYNCPAIR =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS STREAMWINDOW =-=-=-=-=-=-=###
+#
+#   StreamWindow - the live window state of one sensor (streaming mode), fed one sample at a time.
+#
+#   The last WIDTH samples are kept in a ring buffer, with running sums of x (time), y (data), x^2, y^2
+#   and xy over them: adding a sample adds its terms and removes those of the sample it pushes out, so each
+#   sample costs the same no matter how wide the window is. The sums are of values shifted by a recent
+#   sample, and are recomputed from the ring once per WIDTH samples, which keeps rounding from building up.
+#   A window is emitted as soon as its last sample arrives.
+#
+
+class StreamWindow:
+    __slots__ = ("m_name", "m_params", "m_feats", "m_width", "m_times", "m_data", "m_count", "m_window",
+                 "m_shiftX", "m_shiftY", "m_sx", "m_sy", "m_sxx", "m_syy", "m_sxy", "m_sinceSync")
+
+    def __init__(self, name, params, feats):
+        self.m_name = name
+        self.m_params = params
+        self.m_feats = feats
+        self.m_width = max(params[WIDTH], 1)
+        self.m_times = array('d', bytes(8 * self.m_width)) # ring buffer of time
+        self.m_data = array('d', bytes(8 * self.m_width)) # ring buffer of data
+        self.m_count = 0 # samples received
+        self.m_window = 0 # number of the next window to emit
+        self.m_shiftX = self.m_shiftY = 0.0
+        self.m_sx = self.m_sy = self.m_sxx = self.m_syy = self.m_sxy = 0.0
+        self.m_sinceSync = 0
+
+    #
+    # add() - Take the next sample, returns the windows it completes as [window number, [values in feats order]]
+    #
+
+    def add(self, time, value):
+        index = self.m_count
+        self.m_count += 1
+        if(index < self.m_params[START]): # Windows only begin at the starting position
+            return []
+
+        slot = (index - self.m_params[START]) % self.m_width
+        filled = index - self.m_params[START] + 1
+        if(filled > self.m_width): # Remove the sample being pushed out
+            x = self.m_times[slot] - self.m_shiftX
+            y = self.m_data[slot] - self.m_shiftY
+            self.m_sx -= x
+            self.m_sy -= y
+            self.m_sxx -= x * x
+            self.m_syy -= y * y
+            self.m_sxy -= x * y
         else:
-            if("_TL_" in second.m_name):
-                self.m_first = second
-                self.m_second = first
-            else:
-                self.m_first = first
-                self.m_second = second
-        
-        self.m_maxlen = len(self.m_first.m_data)
-        if(self.m_second is not None):
-            # Initialize the DA vars
-            self.m_DA_count = 0
-            self.m_DA_match = []
+            if(filled == 1):
+                self.m_shiftX = time
+                self.m_shiftY = value
+        self.m_times[slot] = time
+        self.m_data[slot] = value
+        x = time - self.m_shiftX
+        y = value - self.m_shiftY
+        self.m_sx += x
+        self.m_sy += y
+        self.m_sxx += x * x
+        self.m_syy += y * y
+        self.m_sxy += x * y
+
+        self.m_sinceSync += 1
+        if(self.m_sinceSync >= self.m_width and filled >= self.m_width):
+            self.sync(slot)
+
+        return self.closeWindows(index)
 
-            # Initialize the SM vars
-            self.m_SM_diffs = []
+    #
+    # sync() - Shift by the oldest sample in the ring, and recompute the running sums from the ring
+    #
 
-            # Correct the maxlen (should be the lesser of the two)
-            if(len(self.m_second.m_data) < self.m_maxlen): # Use lessthan to prevent OOB exceptions
-                self.m_maxlen = len(self.m_second.m_data)
-    
-    #######################################################################################################
-    # calcMatch() - Calculate the amount of matches for Directional Agreement
-    def calcMatch(self):
-        # number of matches
+    def sync(self, slot):
+        oldest = (slot + 1) % self.m_width
+        self.m_shiftX = self.m_times[oldest]
+        self.m_shiftY = self.m_data[oldest]
+        xs = [x - self.m_shiftX for x in self.m_times]
+        ys = [y - self.m_shiftY for y in self.m_data]
+        self.m_sx = math.fsum(xs)
+        self.m_sy = math.fsum(ys)
+        self.m_sxx = math.fsum(map(operator.mul, xs, xs))
+        self.m_syy = math.fsum(map(operator.mul, ys, ys))
+        self.m_sxy = math.fsum(map(operator.mul, xs, ys))
+        self.m_sinceSync = 0
+
+    #
+    # closeWindows() - The windows whose last sample is the sample at index
+    #           The same windows the batch calculations make, given enough data (see windowCount())
+    #
+
+    def closeWindows(self, index):
+        width = self.m_params[WIDTH]
+        incrTime = self.m_params[INCRE]
+        windowCt = self.m_params[COUNT]
+        last = index - self.m_params[START] - width + 1 # samples since the end of the first window
+        if(last < 0 or width <= 0):
+            return []
+
+        total = 0
+        if(incrTime > 0):
+            if(last % incrTime == 0 and (windowCt <= 0 or self.m_window < windowCt)):
+                total = 1
+        elif(last == 0):
+            total = max(windowCt, 1) # A window that never moves is emitted once per window counted
+        if(total == 0):
+            return []
+
+        values = self.calc()
+        windows = [[self.m_window + i, values] for i in range(total)]
+        self.m_window += total
+        return windows
+
+    #
+    # calc() - The features of the window in the ring, from the running sums
+    #
+
+    def calc(self):
+        count = self.m_width
+        results = []
+        for feat in self.m_feats:
+            if(feat == AVG):
+                results.append(self.m_shiftY + (self.m_sy / count))
+            if(feat == STD):
+                results.append(math.sqrt(max((self.m_syy - (self.m_sy * self.m_sy / count)) / count, 0.0)))
+            if(feat == SLOPE):
+                ytotal = (count * self.m_sxx) - (self.m_sx * self.m_sx)
+                results.append(((count * self.m_sxy) - (self.m_sx * self.m_sy)) / ytotal if ytotal != 0 else 0.0)
+        return results
+
+###=-=-=-=-=-=-= END CLASS STREAMWINDOW =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS STREAMPAIR =-=-=-=-=-=-=###
+#
+#   StreamPair - the live Directional Agreement and Signal Matching of two sensors (streaming mode).
+#
+#   Samples are lined up by position, as in SyncPair: the one of a member that arrives first waits in a
+#   queue of at most STREAM_LAG samples until the other member's sample at that position arrives.
+#   A pair made after one member already sent samples begins at the position the other member starts
+#   from (begin), skipping the first samples of the member that has not got there yet.
+#   Each lined up position updates the signs of change, the match count and the running mean difference,
+#   and a Directional Agreement interval is emitted whenever the pair of signs changes.
+#
+
+class StreamPair:
+    __slots__ = ("m_name", "m_first", "m_second", "m_waiting", "m_skip", "m_begin", "m_count", "m_prev", "m_signs",
+                 "m_DA_count", "m_runStart", "m_SM_total", "m_dropped")
+
+    def __init__(self, name, first, second, begin = 0, skip = None):
+        self.m_name = name
+        self.m_first = first # Team Leader's name (if any)
+        self.m_second = second
+        self.m_waiting = {first: deque(), second: deque()}
+        self.m_skip = {first: 0, second: 0} # samples of each member still to skip before position begin
+        if(skip is not None):
+            self.m_skip.update(skip)
+        self.m_begin = begin # position of the first lined up samples
+        self.m_count = begin # position of the next lined up samples
+        self.m_prev = [0.0, 0.0] # previous values of both members
+        self.m_signs = [0, 0] # current signs of change of both members
         self.m_DA_count = 0
-        # array of 1/0 to indicate matches, -1 is null
-        self.m_DA_match = []
+        self.m_runStart = begin / 4.0 # start (secs) of the current interval
+        self.m_SM_total = 0.0
+        self.m_dropped = False
 
-        if(self.m_second is not None):
-            tempA = self.m_first.m_data[0][1]
-            tempB = self.m_second.m_data[0][1]
-            prevsigA = "x"
-            prevsigB = "x"
-
-            self.m_DA_match.append([0, prevsigA, prevsigB])
-
-            for i in range(1, self.m_maxlen):
-                entry = [i, "", ""] # Default entry
-                if(self.m_first.m_data[i][1] > tempA):
-                    entry[1] = "+"
-                elif(self.m_first.m_data[i][1] < tempA):
-                    entry[1] = "-"
-                else:
-                    entry[1] = prevsigA
+    #
+    # add() - Take the next sample of one member, returns the positions it lines up as
+    #           [time, TL value, P value, difference, interval ended or None]
+    #           where an ended interval is [start secs, end secs, TL sign, P sign]
+    #
 
-                if(self.m_second.m_data[i][1] > tempB):
-                    entry[2] = "+"
-                elif(self.m_second.m_data[i][1] < tempB):
-                    entry[2] = "-"
-                else:
-                    entry[2] = prevsigB
+    def add(self, name, time, value):
+        if(self.m_skip[name] > 0):
+            self.m_skip[name] -= 1
+            return []
+        queue = self.m_waiting[name]
+        queue.append((time, value))
+        if(len(queue) > STREAM_LAG):
+            queue.popleft()
+            if(not self.m_dropped):
+                print("[WARN] \"%s\" is more than %s samples ahead of its partner, dropping its oldest samples." % (name, STREAM_LAG), file = sys.stderr)
+                self.m_dropped = True
+
+        results = []
+        first = self.m_waiting[self.m_first]
+        second = self.m_waiting[self.m_second]
+        while(first and second):
+            timeA, valueA = first.popleft()
+            timeB, valueB = second.popleft()
+            results.append(self.line(timeA, valueA, valueB))
+        return results
 
-                if(entry[1] == entry[2]):
-                    self.m_DA_count += 1
+    #
+    # line() - Take the values of both members at the next position
+    #
 
-                self.m_DA_match.append(entry)
-                
-                tempA = self.m_first.m_data[i][1]
-                tempB = self.m_second.m_data[i][1]
-                prevsigA = entry[1]
-                prevsigB = entry[2]
-    
-    #######################################################################################################
-    # calcDiffs() - Calculate the difference values of the pair
+    def line(self, time, valueA, valueB):
+        position = self.m_count
+        self.m_count += 1
+        ended = None
 
-    def calcDiffs(self):
-        # array of time and float values (difference between two points)
-        # Will have [time, data] pairs due to having somewhat similar output to normalized data
-        self.m_SM_diffs = []
+        if(position > self.m_begin):
+            signs = [self.m_signs[0], self.m_signs[1]]
+            for i, value in ((0, valueA), (1, valueB)):
+                if(value > self.m_prev[i]):
+                    signs[i] = 1
+                elif(value < self.m_prev[i]):
+                    signs[i] = -1
+            if(signs[0] == signs[1]):
+                self.m_DA_count += 1
+            if(signs != self.m_signs): # A new interval starts here
+                end = (position - 1) / 4.0
+                ended = [self.m_runStart, end, self.m_signs[0], self.m_signs[1]]
+                self.m_runStart = end
+                self.m_signs = signs
+        self.m_prev = [valueA, valueB]
 
-        if(self.m_second is not None):
-            for i in range(self.m_maxlen):
-                diffVal = abs(self.m_first.m_data[i][1] - self.m_second.m_data[i][1])
-                self.m_SM_diffs.append([self.m_first.m_data[i][0], diffVal])
+        diff = abs(valueA - valueB)
+        self.m_SM_total += diff
+        return [time, valueA, valueB, diff, ended]
 
+###=-=-=-=-=-=-= END CLASS STREAMPAIR =-=-=-=-=-=-=###
 
-    #######################################################################################################
-    # writeFile() - Writes the output files for both calculation and normalization depending on writeType
 
-    def writeFile(self, outputPath, params, writeType, doFeat):
-        try:
-            dataLength = len(self.m_first.m_data)
-            calcs = []
-            if(writeType == CALCS):
-                sectTime = params[WIDTH]
-                incrTime = params[INCRE]
-                windowCt = params[COUNT]
-                startPos = params[START]
-                if(self.m_second is not None):
-                    if(doFeat[AVG]):
-                        calcs.append([self.m_first.m_avg.m_data, self.m_second.m_avg.m_data])
-                    if(doFeat[STD]):
-                        calcs.append([self.m_first.m_std.m_data, self.m_second.m_std.m_data])
-                    if(doFeat[SLOPE]):
-                        calcs.append([self.m_first.m_slope.m_data, self.m_second.m_slope.m_data])
-                else:
-                    if(doFeat[AVG]):
-                        calcs.append([self.m_first.m_avg.m_data, None])
-                    if(doFeat[STD]):
-                        calcs.append([self.m_first.m_std.m_data, None])
-                    if(doFeat[SLOPE]):
-                        calcs.append([self.m_first.m_slope.m_data, None])
 
-            sessFile = self.m_first.m_name.split("_")
-            # 0        1  2    3     4          5      6         7       8
-            # Session#_ID_DATE_COLOR_PAIRMEMBER_BANDID_STARTTIME_ENDTIME_"PROC".txt
+###=-=-=-=-=-=-= BEGIN CLASS STREAMENGINE =-=-=-=-=-=-=###
+#
+#   StreamEngine - the live calculations of every sensor (streaming mode). Samples come in as (name, time,
+#   value); a sensor is set up the first time its name is seen, and paired with every sensor of the same
+#   session already seen (as in Clam.pairSessions()). Results are written as tab separated lines:
+#       CALCS   name    window  start secs  end secs    feature values...
+#       SIGMA   pair    time    difference  TL data     P data      running mean difference
+#       DIRAG   pair    start secs  end secs    TL sign P sign  matches so far
+#
 
-            sessPos = sessFile[0].find("Session")
-            sessID = sessFile[0][sessPos + 7:]
-            sessDate = sessFile[2]
-            sessEnd = sessFile[6] + "_" + sessFile[7] + "_" + sessFile[8]
-            
-            sessName = "SYNC_Sess" + sessID
-            self.m_name = sessName + "_" + sessDate + "_" + sessEnd
-            newFName = ""
-            if(writeType == CALCS):
-                newFName = "CALCS_ct" + str(windowCt) + "_w" + str(sectTime) + "_i" + str(incrTime) + "_s" + str(startPos) + "_" + self.m_name
-            if(writeType == DIRAG):
-                newFName = "DIRAG_" + self.m_name
-            if(writeType == SIGMA):
-                newFName = "SIGMA_" + self.m_name
-            
-            newFPath = outputPath + newFName
+class StreamEngine:
+    def __init__(self, params, doFeat, output = None):
+        if(output is None):
+            output = sys.stdout
+        self.m_params = params
+        self.m_doFeat = doFeat
+        self.m_feats = calcFeats(doFeat)
+        self.m_output = output
+        self.m_windows = {} # name -> StreamWindow
+        self.m_pairs = {} # name -> StreamPairs the sensor is a member of
+        self.m_sessions = {} # session ID -> names of its sensors
 
-            # Write new calculations or normalization file
+    #
+    # sensor() - Set up a sensor seen for the first time, pairing it with its session's other sensors
+    #
 
-            if(writeType == DIRAG and self.m_second is None):
-                print("[WARN] Directional Agreement file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
-            if(writeType == SIGMA and self.m_second is None):
-                print("[WARN] Signal Matching file for \"%s\" not created! (Dyad/Pair incomplete)" % self.m_name)
+    def sensor(self, name):
+        self.m_windows[name] = StreamWindow(name, self.m_params, self.m_feats)
+        self.m_pairs[name] = []
+        if(not self.m_doFeat[SYNC]):
+            return
+
+        sessID = parseSession(name)[0]
+        if(sessID is None):
+            return
+        members = self.m_sessions.setdefault(sessID, [])
+        for other in members:
+            first, second = other, name
+            if("_TL_" in name):
+                first, second = name, other
+            pairName = "SYNC_Sess" + sessID + "_" + parseSession(first)[1] + "-" + parseSession(second)[1]
+            begin = self.m_windows[other].m_count # The new sensor lines up from the other's next sample
+            pair = StreamPair(pairName, first, second, begin, {name: begin})
+            self.m_pairs[first].append(pair)
+            self.m_pairs[second].append(pair)
+        members.append(name)
+
+    #
+    # add() - Take the next sample of a sensor, writing every result it completes
+    #
+
+    def add(self, name, time, value):
+        if(name not in self.m_windows):
+            self.sensor(name)
+
+        lines = []
+        if(len(self.m_feats) > 0):
+            for window, values in self.m_windows[name].add(time, value):
+                start, end = windowTimes(self.m_params, 1, window)
+                lines.append("\t".join(["CALCS", name, str(window), str(start[0]), str(end[0])] + [str(round(v, 9)) for v in values]))
+
+        for pair in self.m_pairs[name]:
+            for lineTime, valueA, valueB, diff, ended in pair.add(name, time, value):
+                if(self.m_doFeat[SIGMA]):
+                    lines.append("\t".join(["SIGMA", pair.m_name, str(lineTime), str(diff), str(valueA), str(valueB), str(pair.m_SM_total / (pair.m_count - pair.m_begin))]))
+                if(self.m_doFeat[DIRAG] and ended is not None):
+                    lines.append("\t".join(["DIRAG", pair.m_name, str(ended[0]), str(ended[1]), SIGNS[ended[2]], SIGNS[ended[3]], str(pair.m_DA_count)]))
+
+        if(len(lines) > 0):
+            self.m_output.write("\n".join(lines) + "\n")
+
+    #
+    # addLines() - Take "name time value" lines (bytes), or "time value" lines of the sensor named default
+    #           Lines that cannot be read are skipped, so one bad sample does not stop the stream
+    #
+
+    def addLines(self, lines, default):
+        for line in lines:
+            fields = line.split()
+            try:
+                if(len(fields) == 3):
+                    self.add(fields[0].decode("utf-8", "replace"), float(fields[1]), float(fields[2]))
+                elif(len(fields) == 2):
+                    self.add(default, float(fields[0]), float(fields[1]))
+            except ValueError:
+                print("[WARN] Skipped a line that could not be read: %r" % line, file = sys.stderr)
+        self.m_output.flush()
+
+###=-=-=-=-=-=-= END CLASS STREAMENGINE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS SERVICE =-=-=-=-=-=-=###
+#
+#   Service - the folders of service mode, read once and kept in memory between requests (see serveMain()).
+#
+#   Each folder is a Clam. Before a request uses a folder, its files are checked against the size and modification
+#   time they had when read: only a file that changed (or is new) is read again, a removed one is dropped, and the
+#   pairs of the folder are made again. Normalized copies of a file, and the pairs of normalized files, are made the
+#   first time they are asked for and kept along with their feature caches and DA and SM results.
+#
+#   Requests are answered by the threads of the HTTP server; m_lock keeps one of them at a time in the calculations.
+#
+
+class Service:
+    NORMS = {"none": -1, "mm": MM_NORM, "zs": ZS_NORM}
+
+    def __init__(self, folderPaths):
+        self.m_lock = threading.Lock()
+        self.m_clams = {} # folder path -> Clam
+        self.m_stats = {} # (folder path, file name) -> (size, mtime_ns) when read
+        self.m_copies = {} # (folder path, file name, normType) -> normalized NameData
+        self.m_pairs = {} # (folder path, normType) -> {pair name: SyncPair}
+        for folderPath in folderPaths:
+            self.m_clams[folderPath] = Clam(folderPath)
+            # Files left out as not data are kept here too, so they are only read again once they change
+            for fileName in Clam.listFolder(folderPath)[0]:
+                stat = os.stat(folderPath + "\\" + fileName)
+                self.m_stats[(folderPath, fileName)] = (stat.st_size, stat.st_mtime_ns)
+
+    #
+    # refresh() - Read again the files of a folder that changed since they were read, returns whether any did
+    #           Folders and files that are not data are left out, like Clam.readFolder() does
+    #
+
+    def refresh(self, folderPath):
+        clam = self.m_clams[folderPath]
+        current = {}
+        for fileName in Clam.listFolder(folderPath)[0]:
+            stat = os.stat(folderPath + "\\" + fileName)
+            current[fileName] = (stat.st_size, stat.st_mtime_ns)
+
+        known = {obj.m_name: obj for obj in clam.m_datasets}
+        changed = [name for name in current if self.m_stats.get((folderPath, name)) != current[name]]
+        removed = [name for folder, name in self.m_stats if folder == folderPath and name not in current]
+        if(len(changed) == 0 and len(removed) == 0):
+            return False
+
+        for name in changed:
+            print("[SAFE] Reading \"%s\" again (changed)" % name, file = sys.stderr)
+            report = ParseReport(name)
+            columns = Clam.readFile(folderPath, name, report)
+            if(Clam.hasData(report)):
+                known[name] = NameData(name, *columns)
             else:
-                with open(newFPath, "w+") as newF:
-                    
-                    ##########################
-                    ### Calculation Output ###
-                    ##########################
+                print("[WARN] \"%s\" has no data lines, it was skipped." % name, file = sys.stderr)
+                known.pop(name, None)
+            self.m_stats[(folderPath, name)] = current[name]
+        for name in removed:
+            known.pop(name, None)
+            del self.m_stats[(folderPath, name)]
+        for name in changed + removed:
+            for normType in self.NORMS.values():
+                self.m_copies.pop((folderPath, name, normType), None)
+
+        clam.m_datasets = [known[name] for name in sorted(known)]
+        for normType in self.NORMS.values():
+            self.m_pairs.pop((folderPath, normType), None)
+        return True
+
+    #
+    # folder() - The folder path a request names (its path or last folder name), the first folder if it names none
+    #
+
+    def folder(self, name):
+        if(name is None):
+            return next(iter(self.m_clams))
+        for folderPath in self.m_clams:
+            if(name == folderPath or name == os.path.basename(os.path.normpath(folderPath.replace("\\", os.sep)))):
+                return folderPath
+        raise LookupError("No folder \"%s\" is served" % name)
+
+    #
+    # dataset() - The NameData of a file, normalized by normType (-1 for none), reading it again if it changed
+    #
+
+    def dataset(self, folderPath, fileName, normType):
+        self.refresh(folderPath)
+        for obj in self.m_clams[folderPath].m_datasets:
+            if(obj.m_name == fileName):
+                if(normType == -1):
+                    return obj
+                key = (folderPath, fileName, normType)
+                if(key not in self.m_copies):
+                    copy = NameData(fileName, obj.m_time, obj.m_orig)
+                    if(normType == MM_NORM):
+                        copy.calcMMnorm()
+                    if(normType == ZS_NORM):
+                        copy.calcZSnorm()
+                    self.m_copies[key] = copy
+                return self.m_copies[key]
+        raise LookupError("No file \"%s\" in \"%s\"" % (fileName, folderPath))
+
+    #
+    # pairs() - The SyncPairs of a folder (of its files normalized by normType), by the name of their outputs
+    #
+
+    def pairs(self, folderPath, normType):
+        self.refresh(folderPath)
+        key = (folderPath, normType)
+        if(key not in self.m_pairs):
+            clam = self.m_clams[folderPath]
+            clam.pairSessions()
+            named = {}
+            for pair in clam.m_pairs:
+                first = self.dataset(folderPath, pair.m_first.m_name, normType)
+                second = None if pair.m_second is None else self.dataset(folderPath, pair.m_second.m_name, normType)
+                copy = SyncPair(first, second)
+                copy.m_tag = pair.m_tag
+                try:
+                    copy.outputName(None, DIRAG) # Sets its name
+                except IndexError: # A file name outside Session#_ID_DATE_..._STARTTIME_ENDTIME_PROC, so the pair has none
+                    print("[WARN] \"%s\" does not follow the file naming scheme, its pair was skipped." % first.m_name, file = sys.stderr)
+                    continue
+                named[copy.m_name] = copy
+            self.m_pairs[key] = named
+        return self.m_pairs[key]
+
+    #
+    # pair() - One complete SyncPair of a folder, by name
+    #
+
+    def pair(self, folderPath, pairName, normType):
+        pair = self.pairs(folderPath, normType).get(pairName)
+        if(pair is None or pair.m_second is None):
+            raise LookupError("No complete pair \"%s\" in \"%s\"" % (pairName, folderPath))
+        return pair
+
+    #
+    # answer() - The JSON-ready answer to a request for path with the query arguments args (name -> value)
+    #           Raises LookupError for what does not exist, ValueError for arguments that cannot be used
+    #
+
+    def answer(self, path, args):
+        with self.m_lock:
+            folderPath = self.folder(args.get("folder"))
+            norm = args.get("norm", "none")
+            if(norm not in self.NORMS):
+                raise ValueError("norm must be one of %s" % ", ".join(self.NORMS))
+            normType = self.NORMS[norm]
+
+            if(path == "/files"):
+                self.refresh(folderPath)
+                return {"folders": list(self.m_clams), "folder": folderPath,
+                        "files": {obj.m_name: len(obj.m_data) for obj in self.m_clams[folderPath].m_datasets},
+                        "pairs": sorted(self.pairs(folderPath, -1))}
+
+            if(path == "/features"):
+                obj = self.dataset(folderPath, requireArg(args, "file"), normType)
+                params = [0, 0, 0, 0]
+                params[WIDTH] = int(requireArg(args, "width"))
+                params[INCRE] = int(requireArg(args, "incr"))
+                params[COUNT] = int(args.get("count", 0))
+                params[START] = int(args.get("start", 0))
+                if(params[WIDTH] <= 0 or params[INCRE] < 0 or params[COUNT] < 0 or params[START] < 0):
+                    raise ValueError("width must be above 0, and incr, count and start at least 0")
+                feats = [feat for feat, name in ((AVG, "avg"), (STD, "std"), (SLOPE, "slope")) if name in args.get("calc", "avg,std,slope").split(",")]
+                rows = windowCount(params, len(obj.m_data))
+                starts, ends = windowTimes(params, rows)
+                answer = {"file": obj.m_name, "norm": norm, "width": params[WIDTH], "increment": params[INCRE],
+                          "count": params[COUNT], "start": params[START], "windows": rows, "start_secs": starts, "end_secs": ends}
+                for feat, values in zip(feats, obj.features(feats, params)):
+                    answer[FEATNAMES[feat]] = jsonColumn(values[:rows])
+                return answer
+
+            if(path == "/norm"):
+                obj = self.dataset(folderPath, requireArg(args, "file"), normType)
+                start = int(args.get("start", 0))
+                end = int(args.get("end", len(obj.m_data)))
+                return {"file": obj.m_name, "norm": norm, "start": start, "end": end,
+                        "time": list(obj.m_time[start:end]), "data": jsonColumn(obj.m_data[start:end])}
+
+            if(path == "/query"):
+                obj = self.dataset(folderPath, requireArg(args, "file"), normType)
+                inSeconds = args.get("seconds", "0") not in ("0", "", "false", "no")
+                result = obj.query(float(requireArg(args, "start")) if inSeconds else int(requireArg(args, "start")),
+                                   float(requireArg(args, "end")) if inSeconds else int(requireArg(args, "end")), inSeconds, folderPath)
+                result["file"] = obj.m_name
+                result["norm"] = norm
+                return {key: jsonColumn([value])[0] if isinstance(value, float) else value for key, value in result.items()}
+
+            if(path == "/dirag"):
+                pair = self.pair(folderPath, requireArg(args, "pair"), normType)
+                if(pair.m_DA_runs is None):
+                    pair.calcMatch()
+                starts, codes = pair.m_DA_runs
+                signs = [SyncPair.unpackSigns(code) for code in codes]
+                return {"pair": pair.m_name, "norm": norm, "first": pair.m_first.m_name, "second": pair.m_second.m_name,
+                        "count": pair.m_maxlen, "matches": pair.m_DA_count,
+                        "runs": {"start_secs": [pair.m_first.m_time[start] for start in starts],
+                                 "tl": [sign[0] for sign in signs], "p": [sign[1] for sign in signs]}}
+
+            if(path == "/sigma"):
+                pair = self.pair(folderPath, requireArg(args, "pair"), normType)
+                if(pair.m_SM_diffs is None):
+                    pair.calcDiffs()
+                total = functools.reduce(operator.add, pair.m_SM_diffs[:pair.m_maxlen], 0.0)
+                answer = {"pair": pair.m_name, "norm": norm, "first": pair.m_first.m_name, "second": pair.m_second.m_name,
+                          "count": pair.m_maxlen, "mean_difference": jsonColumn([total / pair.m_maxlen])[0] if pair.m_maxlen > 0 else None}
+                if(args.get("data", "0") not in ("0", "", "false", "no")):
+                    answer["differences"] = jsonColumn(pair.m_SM_diffs[:pair.m_maxlen])
+                return answer
+
+            raise LookupError("No such request \"%s\" (try /files, /features, /norm, /query, /dirag or /sigma)" % path)
+
+###=-=-=-=-=-=-= END CLASS SERVICE =-=-=-=-=-=-=###
+
+
+
+###=-=-=-=-=-=-= BEGIN CLASS SERVICEHANDLER =-=-=-=-=-=-=###
+#
+#   ServiceHandler - answers the HTTP requests of service mode with the JSON of Service.answer()
+#   (404 for what does not exist, 400 for arguments that cannot be used, 500 for anything else)
+#
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None # the Service, set by serveMain()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        args = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        start = timer.perf_counter()
+        try:
+            status = 200
+            body = self.service.answer(url.path.rstrip("/") or "/files", args)
+        except LookupError as error:
+            status, body = 404, {"error": str(error)}
+        except (ValueError, IndexError) as error:
+            status, body = 400, {"error": str(error)}
+        except Exception as error:
+            status, body = 500, {"error": "%s: %s" % (type(error).__name__, error)}
+        body["secs"] = timer.perf_counter() - start
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # address_string() / log_message() - Name the client ("local" for a Unix socket) in the request log, on stderr
+
+    def address_string(self):
+        if(isinstance(self.client_address, tuple)):
+            return self.client_address[0]
+        return "local"
+
+    def log_message(self, format, *args):
+        print("%s - %s" % (self.address_string(), format % args), file = sys.stderr)
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+###=-=-=-=-=-=-= END CLASS SERVICEHANDLER =-=-=-=-=-=-=###
+
+#
+#           WRITER FUNCTION
+# windowLabels() - Produce the "start secs - end secs:" timestamps of count windows, from window number first on
+#           Subtract .25 (1 data count) from the end since end is exclusive
+#
+
+def windowLabels(params, count, first = 0):
+    starts, ends = windowTimes(params, count, first)
+    return [start.ljust(7) + " secs - " + end.rjust(7) + " secs:" for start, end in zip(map(str, starts), map(str, ends))]
+
+#
+#           WRITER FUNCTION
+# windowTimes() - Produce the start and end (secs) of count windows, from window number first on
+#
+
+def windowTimes(params, count, first = 0):
+    sectTime = params[WIDTH]
+    incrTime = params[INCRE]
+    startPos = params[START]
+    starts = [(startPos/4) + (i * (incrTime/4)) for i in range(first, first + count)]
+    ends = [(startPos/4) + (i * (incrTime/4)) + (sectTime/4) - (1/4) for i in range(first, first + count)]
+    return starts, ends
+
+#
+#           WRITER FUNCTION
+# windowTable() - Start the DataTable of a CALCS output with the start and end (secs) of the first count windows
+#
+
+def windowTable(params, count):
+    starts, ends = windowTimes(params, count)
+    table = DataTable()
+    table.add("start", 'd', starts)
+    table.add("end", 'd', ends)
+    return table
+
+#
+#           WRITER FUNCTION
+# calcFeats() - The features written in CALCS outputs, in the order of their columns
+#
+
+def calcFeats(doFeat):
+    return [feat for feat in (AVG, STD, SLOPE) if doFeat[feat]]
+
+#
+#           WRITER FUNCTION
+# formatColumn() - Format the first count calculated values of a column, rounded to 9 decimals
+#
+
+def formatColumn(values, count):
+    return map(str, map(round, values[:count], repeat(9)))
+
+#
+#           WRITER FUNCTION
+# prefixColumn() - Put the separator before (and the ending after) every formatted value of a column
+#
+
+def prefixColumn(separator, column, ending = ""):
+    if(ending == ""):
+        return map(separator.__add__, column)
+    return map(separator.__add__, map(str.__add__, column, repeat(ending)))
+
+#
+#           WRITER FUNCTION
+# writeRows() - Join the formatted columns row by row (ending each with a line break), then write them
+#
+
+def writeRows(newF, columns):
+    writeLines(newF, map("".join, zip(*columns, repeat("\n"))))
+
+#
+#           WRITER FUNCTION
+# commitFile() - Open an output file to be written through a temporary file next to it, which only takes the file's name
+#           (os.replace) once it is complete, so a run that stops partway never leaves a half written output behind
+#           The temporary file is removed if writing it fails, except for the IndexError of checkRows(): the file then
+#           still fails, but keeps the rows that exist, as it always has
+#
+
+@contextlib.contextmanager
+def commitFile(filePath, mode = "w+", **kwargs):
+    tempPath = filePath + ".tmp"
+    try:
+        with open(tempPath, mode, **kwargs) as newF:
+            try:
+                yield newF
+            except IndexError:
+                newF.close()
+                os.replace(tempPath, filePath)
+                raise
+        os.replace(tempPath, filePath)
+    finally:
+        if(os.path.exists(tempPath)):
+            os.remove(tempPath)
+
+#
+#           WRITER FUNCTION
+# writeLines() - Write lines in blocks of WRITE_BLOCK, one write call per block
+#
 
-                    if(writeType == CALCS):
-                        # Name of the original file
-                        if(doFeat[NORMS]):
-                            newF.write("[NOTE] File was normalized prior to calculation.\n\n")
-                        if(self.m_second is not None):
-                            newF.write("Calculations of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
-                        else:
-                            newF.write("Calculations of file:\n" + self.m_first.m_name + "\n\n")
+def writeLines(newF, lines):
+    lines = iter(lines)
+    block = "".join(islice(lines, WRITE_BLOCK))
+    while(block):
+        newF.write(block)
+        block = "".join(islice(lines, WRITE_BLOCK))
 
-                        # Writing details of the windows
-                        newF.write("[Details]\n")
-                        newF.write("Window Count: %s\n" % (windowCt))
-                        newF.write("Window width: %s lines of data, or %s seconds\n" % (sectTime, sectTime/4))
-                        newF.write("Increments: Every %s lines of data, or %s seconds\n" % (incrTime, incrTime/4))
-                        newF.write("Starting Position: line %s, or %s seconds\n\n" % (startPos, startPos/4))
-                        # newF.write("Timestamps are exclusive. Notation: [start, end)\n\n")
-
-                        headers1 = "\t\t\t\t"
-                        headers2 = "Time:\t\t\t\t"
-                        if(doFeat[AVG]):
-                            headers1 = headers1 + "Average\t\t\t\t"
-                            if(self.m_second == None):
-                                headers2 = headers2 + "Solo Data\t\t\t"
-                            else:
-                                headers2 = headers2 + "Team Leader\tPartner\t\t"
-                        if(doFeat[STD]):
-                            headers1 = headers1 + "Standard Dev.\t\t\t"
-                            if(self.m_second == None):
-                                headers2 = headers2 + "Solo Data\t\t\t"
-                            else:
-                                headers2 = headers2 + "Team Leader\tPartner\t\t"
-                        if(doFeat[SLOPE]):
-                            headers1 = headers1 + "Slope\t\t\t\t"
-                            if(self.m_second == None):
-                                headers2 = headers2 + "Solo Data\t\t\t"
-                            else:
-                                headers2 = headers2 + "Team Leader\tPartner\t\t"
+#
+#           WRITER FUNCTION
+# checkRows() - Asking for more windows than were calculated fails the file, after the rows that exist
+#
 
-                        newF.write(headers1 + "\n" + headers2 + "\n")
+def checkRows(rows, dataRange):
+    if(rows < dataRange):
+        raise IndexError("Only %s of %s windows could be calculated" % (rows, dataRange))
 
-                        # List of the timestamps and average per timestamp
-                        dataRange = windowCt
-                        if(dataRange <= 0): # Window count was set to unlimited
-                            dataRange = int(len(calcs[0][0])) 
-                            # Check which is the least to avoid errors where one set is longer than the other in pairs
-                            if(calcs[0][1] is not None):
-                                if(int(len(calcs[0][1])) < dataRange):
-                                    dataRange = int(len(calcs[0][1]))
-                        for i in range(dataRange):
-                            start = (startPos/4) + (i * (incrTime/4))
-                            end = (startPos/4) + (i * (incrTime/4)) + (sectTime/4) - (1/4) # Subtract .25 (1 data count) since end is exclusive
-                            # Timestamps
-                            newWrite = '{:<7}'.format(str(start)) + " secs - " + '{:>7}'.format(str(end)) + " secs:"
+#
+#           HELPER FUNCTION
+# windowCount() - Amount of windows the window parameters make in length lines of data
+#           Windows stay full size and end strictly before the data ends
+#
 
-                            # Calculated Data
-                            for j in range(len(calcs)):
-                                if(self.m_second == None):
-                                    newWrite = newWrite + "\t" + str(round(calcs[j][0][i], 9)) + "\t\t"
-                                else:
-                                    newWrite = newWrite + "\t" + str(round(calcs[j][0][i], 9)) + "\t" + str(round(calcs[j][1][i], 9))
+def windowCount(params, length):
+    sectTime = params[WIDTH]
+    incrTime = params[INCRE]
+    windowCt = params[COUNT]
+    end = params[START] + sectTime
+
+    if(end >= length):
+        return 0
+
+    if(incrTime > 0):
+        total = (length - 1 - end) // incrTime + 1
+        if(windowCt > 0 and windowCt < total):
+            total = windowCt
+    elif(windowCt > 0):
+        total = windowCt
+    else:
+        total = 1 # A window that never moves would repeat forever, so only take it once
+    return total
 
-                            newWrite = newWrite + "\n"
-                            newF.write(newWrite)
+#
+#           HELPER FUNCTION
+# rechunk() - Turn (time column, EDA column) pieces of any length into chunks of exactly size lines (the last may be shorter)
+#
 
-                    ##############################
-                    ### Signal Matching Output ###
-                    ##############################
+def rechunk(chunks, size):
+    times = array('d')
+    values = array('d')
+    for chunkTimes, chunkValues in chunks:
+        times.extend(chunkTimes)
+        values.extend(chunkValues)
+        while(len(times) >= size):
+            yield times[:size], values[:size]
+            del times[:size]
+            del values[:size]
+    if(len(times) > 0):
+        yield times, values
 
-                    elif(writeType == SIGMA and self.m_second is not None):
-                        newF.write("Signal Matching data of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+#
+#           HELPER FUNCTION
+# requireArg() - The value of a request argument of service mode, which must be given
+#
 
-                        # Writing details of the windows
-                        newF.write("[Details]\n")
-                        newF.write("Data Count: %s\n" % (self.m_maxlen))
+def requireArg(args, name):
+    if(name not in args):
+        raise ValueError("The \"%s\" argument is missing" % name)
+    return args[name]
 
-                        # Calculate average of the whole set
-                        temp = 0.0
-                        for i in range(self.m_maxlen):
-                            temp = temp + self.m_SM_diffs[i][1]
-                        dataAvg = temp / self.m_maxlen
-                        newF.write("Overall mean difference: %s\n\n" % (dataAvg))
+#
+#           HELPER FUNCTION
+# jsonColumn() - A column of floats as a list for JSON, with null in place of nan (which JSON does not have)
+#
 
-                        # Data Header
-                        header = "Time:\t\tDifference:\t\t\tTL Data:\t\t\tP Data:\n"
-                        newF.write(header)
+def jsonColumn(values):
+    return [None if value != value else value for value in values]
 
-                        # Write data
-                        for i in range(self.m_maxlen):
-                            newWrite = '{:<7}'.format(str(self.m_SM_diffs[i][0])) + "\t\t" + str(self.m_SM_diffs[i][1]) + "\t\t"
-                            newWrite = newWrite + str(self.m_first.m_data[i][1]) + "\t\t" + str(self.m_second.m_data[i][1]) + "\n"
-                            newF.write(newWrite)
+#
+#           HELPER FUNCTION
+# windowBatches() - Gather chunks of columns (tuples of arrays of the same lines) into the windows of params they complete
+#           Produces [number of the first window, window starts within the columns, the columns] for the first total
+#           windows; the lines from the start of the next window on are carried over to the next chunk
+#
 
-                    ####################################
-                    ### Directional Agreement Output ###
-                    ####################################
+def windowBatches(chunks, params, total):
+    width = params[WIDTH]
+    incr = params[INCRE]
+    startPos = params[START]
+    columns = None
+    base = 0 # line number of the first line kept
+    nextWindow = 0
+    for chunk in chunks:
+        if(nextWindow >= total):
+            break
+        if(columns is None):
+            columns = tuple(array('d') for column in chunk)
+        for column, values in zip(columns, chunk):
+            column.extend(values)
+        end = base + len(columns[0])
+
+        # Windows that end within the lines read so far
+        last = total
+        if(incr > 0):
+            last = min(total, max(0, (end - width - startPos) // incr + 1))
+        elif(startPos + width > end):
+            last = 0
+        if(last > nextWindow):
+            yield [nextWindow, [startPos + (i * incr) - base for i in range(nextWindow, last)], columns]
+            nextWindow = last
+
+        # Carry over the lines from the start of the next window on
+        drop = min(startPos + (nextWindow * incr) - base, len(columns[0]))
+        if(drop > 0):
+            for column in columns:
+                del column[:drop]
+            base += drop
 
-                    elif(writeType == DIRAG and self.m_second is not None):
-                        newF.write("Directional Agreement of files:\n" + self.m_first.m_name + "\n" + self.m_second.m_name + "\n\n")
+#
+#           HELPER FUNCTION
+# fftTables() - The bit reversed order of size positions, and the twiddle factors e^(-2*pi*i*k/size) of an FFT of size
+#
 
-                        # Writing details of the windows
-                        newF.write("[Details]\n")
-                        newF.write("Data Count: %s\n" % (self.m_maxlen))
-                        newF.write("Matches: %s\n\n" % (self.m_DA_count))
+@functools.lru_cache(maxsize = 16)
+def fftTables(size):
+    bits = size.bit_length() - 1
+    order = [int(format(i, "0%sb" % bits)[::-1], 2) for i in range(size)] if bits > 0 else [0]
+    twiddles = [cmath.exp(-2j * math.pi * k / size) for k in range(size // 2)]
+    return order, twiddles
 
-                        # TODO: write the code to display the matches timestamps and such
-                        matchArray = [] # Array of [isMatch, TLs, Ps, startNew]:
-                                        # isMatch, did they match?
-                                        # TLs, sign of Team Leader 
-                                        # Ps, sign of Partner
-                                        # startNew, is this entry the start of a new range of match/opposites?
-                        # Each DA_match entry is [position, TL sign, P sign]
-                        prevA = self.m_DA_match[0][1]
-                        prevB = self.m_DA_match[0][2]
-                        prevMatch = (prevA == prevB and prevA != "x" and prevB != "x")
-
-                        matchArray.append([prevMatch, prevA, prevB, False])
-
-                        # Write the matchArray to have loop indicators
-                        for i in range(1, self.m_maxlen):
-                            match = self.m_DA_match[i]
-
-                            isMatch = (match[1] == match[2] and match[1] != "x" and match[2] != "x")
-                            if(isMatch):
-                                if(prevA == match[1] and prevMatch == isMatch):
-                                    matchArray.append([isMatch, match[1], match[2], False])
-                                else:
-                                    matchArray.append([isMatch, match[1], match[2], True])
-                            else:
-                                if(prevA == match[1] and prevB == match[2] and prevMatch == isMatch):
-                                    matchArray.append([isMatch, match[1], match[2], False])
-                                else:
-                                    matchArray.append([isMatch, match[1], match[2], True])
-
-                            prevMatch = isMatch
-                            prevA = match[1]
-                            prevB = match[2]
-
-                        start = end = prevPos = 0
-                        # Write the new Directional Agreement data
-                        for i in range(len(matchArray)):
-                            startNew = matchArray[i][3]
-
-                            if(startNew):
-                                end = prevPos / 4.0
-                                    
-
-                                # Build the new line
-                                newWrite = '{:<7}'.format(str(start)) + " secs - " + '{:>7}'.format(str(end)) + " secs:"
-                                
-                                # Check the previous matchArray data to finalize + write its information
-                                if(matchArray[prevPos][0]): # If previous was a match
-                                    if(matchArray[prevPos][1] == "+"):
-                                        signstr = "Increasing\t"
-                                    if(matchArray[prevPos][1] == "-"):
-                                        signstr = "Decreasing\t"
-                                else: # If previous was not a match
-                                    signstr = "Opposites TL: " + matchArray[prevPos][1] + " P: " + matchArray[prevPos][2]
-                                    
-                                # Elapsed time during the sync/desync
-                                elapsed = end - start
-
-                                newWrite = newWrite + "\t" + str(signstr) + "\tElapsed Time: " + '{:<7}'.format(str(elapsed)) + "\n"
-
-                                # Write the new line
-                                newF.write(newWrite)
-
-                                # Begin next interval (Starting at i - 1 because it is now increasing since that point)
-                                start = prevPos / 4.0
-
-                            prevPos = i
+#
+#           HELPER FUNCTION
+# fft() - Fast Fourier Transform (or its inverse) of a list of complex values, whose length is a power of two
+#           Iterative radix-2: each stage combines the halves of every block, a whole slice at a time
+#
 
-                    ###################
-                    ### End Outputs ###
-                    ###################
+def fft(values, inverse = False):
+    size = len(values)
+    order, twiddles = fftTables(size)
+    out = [values[i] for i in order]
+    half = 1
+    while(half < size):
+        factors = twiddles[::size // (2 * half)]
+        if(inverse):
+            factors = [factor.conjugate() for factor in factors]
+        for start in range(0, size, 2 * half):
+            evens = out[start:start + half]
+            odds = list(map(operator.mul, out[start + half:start + (2 * half)], factors))
+            out[start:start + half] = map(operator.add, evens, odds)
+            out[start + half:start + (2 * half)] = map(operator.sub, evens, odds)
+        half *= 2
+    if(inverse):
+        return [value / size for value in out]
+    return out
 
-            # Output Confirmation
-            if(writeType == CALCS):
-                print("[SAFE] Calculations output file for \"%s\" created!" % self.m_name)
-            if(writeType == DIRAG and self.m_second is not None):
-                print("[SAFE] Directional Agreement file for \"%s\" created!" % self.m_name)
-            if(writeType == SIGMA and self.m_second is not None):
-                print("[SAFE] Signal Matching file for \"%s\" created!" % self.m_name)
+#
+#           HELPER FUNCTION
+# crossCorrelate() - Normalized cross-correlation of two columns of data at every lag from -maxLag to maxLag (lines)
+#           At lag k, each value of A is paired with the value of B k lines later, so a positive lag means B follows A:
+#               r(k) = sum((A[t] - mean A) * (B[t + k] - mean B)) / sqrt(sum((A - mean A)^2) * sum((B - mean B)^2))
+#           which is 1 for B being A delayed by k lines. All lags come from one FFT of both columns (as the real and
+#           imaginary parts, padded with zeros so no lag wraps around) and one inverse FFT: O(n log n), not O(n * lags)
+#           Returns [correlation per lag (array, lag -maxLag first), peak lag, peak correlation], the peak being the
+#           correlation furthest from 0 (the smallest lag on ties); nan if either column never changes
+#
 
-            # File info returned for fileList.txt [size, name]
-            if((writeType == DIRAG and self.m_second is None) or (writeType == SIGMA and self.m_second is None)):
-                fileInfo = [0, newFName]
-            else:
-                fileInfo = [os.stat(newFPath).st_size, newFName]
-            return fileInfo
-        except:
-            if(writeType == CALCS):
-                print("[ERROR] Calculations output file for \"%s\" failed!" % self.m_name)
-            if(writeType == DIRAG):
-                print("[ERROR] Directional Agreement file for \"%s\" failed!" % self.m_name)
-            if(writeType == SIGMA):
-                print("[ERROR] Signal Matching file for \"%s\" failed!" % self.m_name)
-            
-            # Return dummy info for fileList.txt [size, name]
-            failedName = "[FAILED] " + newFName
-            fileInfo = [0, failedName]
-            return fileInfo
+def crossCorrelate(dataA, dataB, maxLag):
+    count = min(len(dataA), len(dataB))
+    maxLag = max(0, min(maxLag, count - 1))
+    meanA = math.fsum(dataA[:count]) / count
+    meanB = math.fsum(dataB[:count]) / count
+    devA = [value - meanA for value in dataA[:count]]
+    devB = [value - meanB for value in dataB[:count]]
+    scale = math.sqrt(math.fsum(map(operator.mul, devA, devA)) * math.fsum(map(operator.mul, devB, devB)))
+    if(scale == 0):
+        return [array('d', repeat(math.nan, (2 * maxLag) + 1)), 0, math.nan]
+
+    # One FFT of A + iB, split into the spectra of A and B by their symmetry
+    size = 1 << (count + maxLag - 1).bit_length()
+    spectrum = fft(list(map(complex, devA, devB)) + ([0j] * (size - count)))
+    mirror = [spectrum[-k].conjugate() for k in range(size)]
+    specA = [(z + m) / 2 for z, m in zip(spectrum, mirror)]
+    specB = [(z - m) / 2j for z, m in zip(spectrum, mirror)]
+
+    # The inverse of conj(A) * B holds sum(A[t] * B[t + k]) at position k (negative lags at the end)
+    sums = fft([a.conjugate() * b for a, b in zip(specA, specB)], True)
+    curve = array('d', (sums[lag].real / scale for lag in range(-maxLag, maxLag + 1)))
+
+    peakLag = max(range(-maxLag, maxLag + 1), key = lambda lag: (abs(curve[lag + maxLag]), -abs(lag)))
+    return [curve, peakLag, curve[peakLag + maxLag]]
 
-###=-=-=-=-=-=-= END CLASS SYNCPAIR =-=-=-=-=-=-=###
+#
+#           HELPER FUNCTION
+# parseSession() - Take a file name Session#_ID_DATE_COLOR_PAIRMEMBER_... and produce [session ID, ID]
+#           The session ID is everything after "Session" in the first part (so Session1 and Session10 differ),
+#           None if the name has no "Session" tag
+#
+
+def parseSession(name):
+    sessFile = name.split("_")
+    sessPos = sessFile[0].find("Session")
+    if(sessPos < 0):
+        return [None, sessFile[0]]
+    memberID = ""
+    if(len(sessFile) > 1):
+        memberID = sessFile[1]
+    return [sessFile[0][sessPos + 7:], memberID]
+
+#
+#           HELPER FUNCTION
+# sessionOrder() - Sort key of a session ID: numbered sessions first, by number, then any others by name
+#
+
+def sessionOrder(sessID):
+    if(sessID.isdigit()):
+        return (0, int(sessID), sessID)
+    return (1, 0, sessID)
 
 #
 #           HELPER FUNCTION
@@ -884,22 +4310,43 @@ def pickCalc(failed = False, first = True, second = True, third = True, options
 
 #
 #           HELPER FUNCTION
-# pickCalc() - Selecting what calculation to choose, data validation helper, returns choice int
+# pickParam() - Selecting the window parameters, returns a list of values per parameter
+#           Entering several values for a parameter (separated by spaces or commas) runs a parameter sweep
 #
 
 def pickParam(options):
     print("\n\nPlease enter values in counts of data (integer).")
-    print("For reference, 4 counts of data equates to 1 second.\n")
+    print("For reference, 4 counts of data equates to 1 second.")
+    print("To sweep over several window configurations, enter more than one value separated by spaces.\n")
     msg = "Enter the timeframe you wish to section the data with: (how much data per section)\n"
-    options[WIDTH] = (int(input(msg))) # sectTime
+    options[WIDTH] = pickValues(msg) # sectTime
     msg = "Enter the increment you wish to section the data with: (how much data in between sections)\n"
-    options[INCRE] = (int(input(msg))) # incrTime
+    options[INCRE] = pickValues(msg) # incrTime
     msg = "Enter how many windows you wish to section the data with: (0 for no limit)\n"
-    options[COUNT] = (int(input(msg))) # windowCt
+    options[COUNT] = pickValues(msg) # windowCt
     msg = "Enter the position you wish to begin sectioning: (0 is default)\n"
-    options[START] = (int(input(msg))) # startPos
+    options[START] = pickValues(msg) # startPos
     return options
 
+#
+#           HELPER FUNCTION
+# pickValues() - Read one or more integers from a single prompt, duplicates are dropped
+#
+
+def pickValues(msg):
+    values = [int(value) for value in input(msg).replace(",", " ").split()]
+    if(len(values) == 0):
+        raise ValueError("No value was entered")
+    return list(dict.fromkeys(values))
+
+#
+#           HELPER FUNCTION
+# sweepParams() - Turn the picked lists of values into every window configuration [WIDTH, INCRE, COUNT, START]
+#
+
+def sweepParams(options):
+    return [list(params) for params in product(options[WIDTH], options[INCRE], options[COUNT], options[START])]
+
 #
 #           HELPER FUNCTION
 # pickDA() - Decide if doing Directional Agreement
@@ -934,6 +4381,41 @@ def pickSM():
     elif(choice == "n" or choice == "N"):
         return False
 
+#
+#           HELPER FUNCTION
+# pickXC() - Decide if doing Cross-Correlation
+#
+
+def pickXC():
+    print("\n\nCross-Correlation finds how far (within %s seconds) one member of a pair follows the other." % (XCORR_LAG/4))
+    msg = "Would you like to calculate Cross-Correlation? (y/n)\n"
+    choice = str(input(msg))
+    if(choice != "y" and choice != "n" and choice != "Y" and choice != "N"):
+        print("Incorrect input! Please indicate y for Yes, or n for No.\n")
+        return pickXC()
+    elif(choice == "y" or choice == "Y"):
+        return True
+    elif(choice == "n" or choice == "N"):
+        return False
+
+#
+#           HELPER FUNCTION
+# pickSW() - Decide if adding the windowed synchrony of pairs to the Calculations outputs
+#
+
+def pickSW():
+    print("\n\nWindowed synchrony adds the Pearson correlation, mean difference and Directional Agreement ratio of each pair,")
+    print("within every window, to its Calculations output.")
+    msg = "Would you like to calculate windowed synchrony? (y/n)\n"
+    choice = str(input(msg))
+    if(choice != "y" and choice != "n" and choice != "Y" and choice != "N"):
+        print("Incorrect input! Please indicate y for Yes, or n for No.\n")
+        return pickSW()
+    elif(choice == "y" or choice == "Y"):
+        return True
+    elif(choice == "n" or choice == "N"):
+        return False
+
 #
 #           HELPER FUNCTION
 # updateDT() - Return a small array of datetime strings
@@ -953,6 +4435,189 @@ def updateDT():
 
     return [date, datestr, time, timestr]
 
+#
+#           HELPER FUNCTION
+# peakMemory() - The most memory (bytes) this process has used so far, None where the OS cannot tell
+#
+
+def peakMemory():
+    if(resource is not None):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, kilobytes elsewhere
+    if(sys.platform == "win32"):
+        import ctypes
+        from ctypes import wintypes
+        class Counters(ctypes.Structure): # PROCESS_MEMORY_COUNTERS
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + \
+                       [(name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                        "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess
+        process.restype = wintypes.HANDLE
+        if(ctypes.windll.psapi.GetProcessMemoryInfo(process(), ctypes.byref(counters), counters.cb)):
+            return counters.PeakWorkingSetSize
+    return None
+
+#
+#           TASK FUNCTION
+# runTasks() - Run a task on every item, spread over the process pool (or writer threads) if there is one
+#           Results are returned in the same order as the items, so outputs stay deterministic
+#           With metrics, every task is measured where it runs, and kept in the metrics' current stage
+#
+
+def runTasks(pool, task, items, metrics = None):
+    if(metrics is not None):
+        task = functools.partial(measureTask, task)
+    if(pool is None):
+        results = [task(item) for item in items]
+    else:
+        results = list(pool.map(task, items))
+    if(metrics is not None):
+        results = metrics.tasks(results)
+    return results
+
+#
+#           TASK FUNCTION
+# measureTask() - Run a task on one NameData object or SyncPair, measuring it and every file it writes
+#           Returns [the task's result, [task record, file records...]]
+#
+
+def measureTask(task, obj):
+    Probe.s_local.taken = taken = []
+    probe = Probe()
+    try:
+        result = task(obj)
+    finally:
+        Probe.s_local.taken = None
+
+    samples = obj.samples()
+    if(samples is None): # Released again (Clam lazy mode), but the files written knew
+        samples = max([record["samples"] for record in taken if record["samples"] is not None], default = None)
+    record = probe.record(obj.label(), samples)
+    record["call"] = getattr(task, "func", task).__name__
+    return [result, [record] + taken]
+
+#
+#           TASK FUNCTION
+# writeMeasured() - Call a writer (writeFile() or writeChunked()) of a NameData object or SyncPair, keeping its record
+#           if a task is measured
+#           Returns the [size, name] file info
+#
+
+def writeMeasured(write, *args):
+    probe = Probe()
+    fileInfo = write(*args)
+    taken = getattr(Probe.s_local, "taken", None)
+    if(taken is not None):
+        record = probe.record(fileInfo[1], write.__self__.samples(), fileInfo[0])
+        record["call"] = write.__name__
+        taken.append(record)
+    return fileInfo
+
+#
+#           TASK FUNCTION
+# normTask() - Normalize one NameData object, returns its normalized data object
+#
+
+def normTask(normType, obj):
+    obj.load()
+    if(normType == MM_NORM):
+        obj.calcMMnorm()
+    if(normType == ZS_NORM):
+        obj.calcZSnorm()
+    return obj.m_NormData
+
+#
+#           TASK FUNCTION
+# matchTask() - Calculate the Directional Agreement, Signal Matching and/or Cross-Correlation of one SyncPair
+#           Returns [[DA count, DA runs] or None, SM differences or None, Cross-Correlation or None]
+#
+
+def matchTask(doFeat, pair):
+    pair.load()
+    match = diffs = xcorr = None
+    if(doFeat[DIRAG]):
+        pair.calcMatch()
+        match = [pair.m_DA_count, pair.m_DA_runs]
+    if(doFeat[SIGMA]):
+        pair.calcDiffs()
+        diffs = pair.m_SM_diffs
+    if(doFeat[XCORR]):
+        pair.calcXCorr()
+        xcorr = pair.m_XC
+    return [match, diffs, xcorr]
+
+#
+#           TASK FUNCTION
+# calcsTask() - Calculate and write the CALCS files of one NameData object or SyncPair,
+#           once per window configuration, returns the [size, name] file info of each
+#           In OUT_OF_CORE mode, each configuration is calculated while its file is written, a chunk at a time
+#
+
+def calcsTask(outputPath, paramSets, doFeat, obj):
+    if(OUT_OF_CORE):
+        return [writeMeasured(obj.writeChunked, outputPath, params, CALCS, doFeat) for params in paramSets]
+    obj.load()
+    fileInfos = []
+    for params in paramSets:
+        # Do Averages, Standard Deviations and Slopes of this configuration in a single pass per file
+        obj.calcFeatures(params, doFeat)
+        fileInfos.append(writeMeasured(obj.writeFile, outputPath, params, CALCS, doFeat))
+    obj.unload()
+    return fileInfos
+
+#
+#           TASK FUNCTION
+# writeTask() - Write one output file of a NameData object (NORMS) or SyncPair (DIRAG, SIGMA, XCORR)
+#           DA, SM and Cross-Correlation are calculated here if they were not already (Clam lazy mode)
+#           In OUT_OF_CORE mode, NORMS and SIGMA files are written a chunk at a time instead
+#           Returns the [size, name] file info
+#
+
+def writeTask(outputPath, params, writeType, doFeat, normType, obj):
+    if(OUT_OF_CORE and writeType == NORMS):
+        return writeMeasured(obj.writeChunked, outputPath, params, writeType, doFeat, normType)
+    if(OUT_OF_CORE and writeType == SIGMA):
+        return writeMeasured(obj.writeChunked, outputPath, params, writeType, doFeat)
+    obj.load()
+    if(writeType == NORMS):
+        fileInfo = writeMeasured(obj.writeFile, outputPath, params, writeType, doFeat, normType)
+    else:
+        if(writeType == DIRAG and obj.m_DA_runs is None):
+            obj.calcMatch()
+        if(writeType == SIGMA and obj.m_SM_diffs is None):
+            obj.calcDiffs()
+        if(writeType == XCORR and obj.m_XC is None):
+            obj.calcXCorr()
+        fileInfo = writeMeasured(obj.writeFile, outputPath, params, writeType, doFeat)
+    obj.unload()
+    return fileInfo
+
+#
+#           TASK FUNCTION
+# xcorrTask() - Calculate and write the windowed Cross-Correlation files of one SyncPair, once per window configuration,
+#           returns the [size, name] file info of each
+#
+
+def xcorrTask(outputPath, paramSets, doFeat, pair):
+    pair.load()
+    fileInfos = []
+    for params in paramSets:
+        pair.calcXCorrWindows(params)
+        fileInfos.append(writeMeasured(pair.writeFile, outputPath, params, XCORRW, doFeat))
+    pair.unload()
+    return fileInfos
+
+#
+#           TASK FUNCTION
+# appendTask() - Bring the NORM and CALCS files of one NameData object up to date (incremental mode)
+#           Returns [NORM file info or None, [CALCS file info per window configuration]]
+#
+
+def appendTask(outputPath, paramSets, doFeat, obj):
+    return obj.writeAppend(outputPath, paramSets, doFeat)
+
 #
 #           DRIVER FUNCTION
 # main() - driver function
@@ -973,8 +4638,18 @@ def main():
     msg = "Enter the name of or path to the folder of data files:\n"
     folderPath = input(msg)
 
+    # Every stage below is measured (see Metrics), the prompts in between are not
+    metrics = Metrics()
+
     # Retrieve a clam (Retrieve Clam object containing NameData objects)
-    clam = Clam(folderPath)
+    #       In LOW_MEMORY mode, files are only read while they are being worked on
+    #       In INCREMENTAL mode too, since each file is then only read from where the last run stopped
+    #       In OUT_OF_CORE mode, files are never read whole, only a chunk at a time while being worked on
+    metrics.begin("read")
+    clam = Clam(folderPath, LOW_MEMORY or INCREMENTAL or OUT_OF_CORE)
+    if(RESULT_CACHE and not (INCREMENTAL or OUT_OF_CORE)): # Results are read back instead of calculated again
+        clam.openResults(folderPath)
+    metrics.end(None if clam.m_lazy else sum(obj.samples() for obj in clam.m_datasets))
 
     #####################
     # Feature Selection # [v2] - Allows the user to decide to normalize, then prompt kind of norm, then prompt calculation
@@ -990,75 +4665,76 @@ def main():
     # User Parameters # [v2] - Now has pre-init values rather than appending new ones
     ###################
 
+    # paramSets holds every window configuration to calculate (more than one for a parameter sweep)
     params = [0,0,0,0]
+    paramSets = [params]
     if(doFeat[CALCS]):
-        params = pickParam(params)
+        paramSets = sweepParams(pickParam(params))
+        params = paramSets[0]
+        if(len(paramSets) > 1):
+            print("\nParameter sweep: %s window configurations will be calculated." % (len(paramSets)))
+
+    ################
+    # Process Pool # Every file is independent, so the per-file work can be spread over WORKERS processes
+    ################
+
+    workers = WORKERS
+    if(workers <= 0):
+        workers = os.cpu_count()
+    pool = None
+    if(workers > 1):
+        print("\nUsing %s worker processes." % (workers))
+        pool = ProcessPoolExecutor(max_workers = workers)
+
+    # Without worker processes, output files are still written WRITERS at a time, by threads (not while profiling,
+    #       which only follows this thread)
+    writers = pool
+    if(pool is None and WRITERS > 1 and not PROFILE):
+        writers = ThreadPoolExecutor(max_workers = WRITERS)
 
     ################
     # Calculations #
     ################
 
     # Do Min Max Normalization: Set min-max normalized dataset for each NameData object
+    #       In LOW_MEMORY mode, each file is normalized whenever it is loaded instead
     if(doFeat[MM_NORM]):
-        for obj in clam.m_datasets:
-            obj.calcMMnorm()
+        if(clam.m_lazy):
+            for obj in clam.m_datasets:
+                obj.m_normType = MM_NORM
+        else:
+            metrics.begin("normalize_mm")
+            normDatas = runTasks(pool, functools.partial(normTask, MM_NORM), clam.m_datasets, metrics)
+            for obj, normData in zip(clam.m_datasets, normDatas):
+                obj.m_normType = MM_NORM
+                obj.setNormData(normData)
+            metrics.end()
 
     # Do z-score Normalization: Set z-score normalized dataset for each NameData object
     if(doFeat[ZS_NORM]):
-        for obj in clam.m_datasets:
-            obj.calcZSnorm()
-
-    # Do Averages: Set average dataset for each NameData object
-    if(doFeat[AVG] or doFeat[STD]):
-        for obj in clam.m_datasets:
-            obj.calcAvg(params)
-
-    # Do Standard Deviations: Set standard deviation dataset for each NameData object
-    if(doFeat[STD]):
-        for obj in clam.m_datasets:
-            obj.calcStd(params)
+        if(clam.m_lazy):
+            for obj in clam.m_datasets:
+                obj.m_normType = ZS_NORM
+        else:
+            metrics.begin("normalize_zs")
+            normDatas = runTasks(pool, functools.partial(normTask, ZS_NORM), clam.m_datasets, metrics)
+            for obj, normData in zip(clam.m_datasets, normDatas):
+                obj.m_normType = ZS_NORM
+                obj.setNormData(normData)
+            metrics.end()
 
-    # Do Slopes: Set slope dataset for each NameData object
-    if(doFeat[SLOPE]):
-        for obj in clam.m_datasets:
-            obj.calcSlope(params)
+    # Averages, Standard Deviations and Slopes of every window configuration are calculated while
+    #       writing, one configuration at a time (see calcsTask())
 
     #######################
-    # SyncPair Assignment # This assumes that the dataset will only have at most 2 datasets per session
-    #######################
+    # SyncPair Assignment # Files are grouped by their full session ID, then every two members of a group are paired
+    ####################### (a dyad makes one pair, a triad three, and so on)
 
     # Do Assignment
     if(doFeat[SYNC]):
-        sessIDList = []
-        for obj in clam.m_datasets:
-            sessPos = obj.m_name.find("Session") + 7 # Position of the session ID
-            sessIDList.append(obj.m_name[sessPos:sessPos + 1])
-
-        # Set a temporary pair starting with [first NameData, None]
-        tempPairList = [] 
-        tempPair = [clam.m_datasets[0], None]
-        prevSess = sessIDList[0]
-        # Iterate over all NameData objects in the set
-        for i in range(len(clam.m_datasets)):
-            # Set a completed pair if there are two of the same session
-            # In case you forget: The reason why the first Session1 object doesn't duplicate despite tempPair initializing
-            #       with the first NameData object, is because it will get replaced by the second Session1 object since
-            #       it will end up with sessIDList[i = 1] = second Session1 object, leaving this with
-            #       tempPair = [clam.m_datasets[0], clam.m_datasets[i = 1]].
-            if(sessIDList[i] == prevSess):
-                tempPair[1] = clam.m_datasets[i]
-            # If the session is different, create SyncPair object, then start a new pair
-            else:
-                tempPair = SyncPair(tempPair[0], tempPair[1])
-                tempPairList.append(tempPair)
-                tempPair = [clam.m_datasets[i], None]
-            
-            prevSess = sessIDList[i]
-
-        tempPair = SyncPair(tempPair[0], tempPair[1]) # Set final pair
-        tempPairList.append(tempPair)
-        
-        clam.setPairs(tempPairList)
+        metrics.begin("pairing")
+        clam.pairSessions()
+        metrics.end()
 
     #########################
     # SM - DA - Calculation #
@@ -1067,16 +4743,25 @@ def main():
     if(doFeat[SYNC]):
         doFeat[DIRAG] = pickDA()
         doFeat[SIGMA] = pickSM()
-
-    # Calculate Agreement matches
-    if(doFeat[DIRAG]):
-        for pair in clam.m_pairs:
-            pair.calcMatch()
-
-    # Calculate Difference between each data
-    if(doFeat[SIGMA]):
-        for pair in clam.m_pairs:
-            pair.calcDiffs()
+        doFeat[XCORR] = pickXC()
+        # Cross-Correlation per window, when there are windows
+        doFeat[XCORRW] = doFeat[XCORR] and doFeat[CALCS]
+        if(doFeat[CALCS]):
+            doFeat[SYNCW] = pickSW()
+
+    # Calculate Agreement matches, Difference and/or Cross-Correlation between each data
+    #       In LOW_MEMORY mode, each pair is calculated right before its file is written instead
+    if((doFeat[DIRAG] or doFeat[SIGMA] or doFeat[XCORR]) and not clam.m_lazy):
+        metrics.begin("agreement_matching")
+        results = runTasks(pool, functools.partial(matchTask, doFeat), clam.m_pairs, metrics)
+        for pair, result in zip(clam.m_pairs, results):
+            if(result[0] is not None):
+                pair.m_DA_count, pair.m_DA_runs = result[0]
+            if(result[1] is not None):
+                pair.m_SM_diffs = result[1]
+            if(result[2] is not None):
+                pair.m_XC = result[2]
+        metrics.end()
 
 
     ########################
@@ -1091,6 +4776,15 @@ def main():
         DTstr = updateDT()
 
         locOut = [DTstr[0], DTstr[2]]
+
+        # Incremental mode: one fixed output folder per data folder, whose files are brought up to date
+        incremental = INCREMENTAL and not doFeat[SYNC]
+        if(INCREMENTAL and doFeat[SYNC]):
+            print("\n[WARN] Incremental mode only applies to individual files, pairs are calculated in full.")
+        if(OUT_OF_CORE and DATA_FORMAT != ""):
+            print("\n[WARN] Out-of-core mode does not write DATA_FORMAT files.")
+        if(incremental):
+            locOut = ["incremental", os.path.basename(os.path.normpath(folderPath))]
         # Info Message: Location
         print("\n\n\nWriting output files into \"\\outputs\\%s\\%s\\\"" % (locOut[0], locOut[1]))
 
@@ -1103,100 +4797,120 @@ def main():
         # Create the directory/path if not exist
         os.makedirs(os.path.dirname(fListPath), exist_ok=True)
 
-        # Initiate writing to fileList.txt
-        with open(fListPath, "w+") as fList:
-            # Write the output files per calculated files
-            # fList is fileList.txt writer to display list of new files
-
-            # Initialize data size, begin Normalization
-            totalDataSize = 0
-            totalDataCount = 0
+        # Incremental mode: bring every file's outputs up to date, listed below like any other outputs
+        if(incremental):
+            metrics.begin("incremental")
+            appendInfos = runTasks(writers, functools.partial(appendTask, outputPath, paramSets, doFeat), clam.m_datasets, metrics)
+            metrics.end()
 
-            # Normalization
-            if(doFeat[NORMS]):
-                # Min-Max Normalization #
-                if(doFeat[MM_NORM]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Min-Max Normalization]\n" % (DTstr[1], DTstr[3]))
-                
-                    # Data Writing
-                    for obj in clam.m_datasets:
-                        DTstr = updateDT()
-                        fileInfo = obj.writeFile(outputPath, params, NORMS, doFeat, MM_NORM)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
-
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
-                        
-                # Z-Score Normalization #
-                if(doFeat[ZS_NORM]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Z-Score Normalization]\n" % (DTstr[1], DTstr[3]))
-                
-                    # Data Writing
-                    for obj in clam.m_datasets:
-                        DTstr = updateDT()
-                        fileInfo = obj.writeFile(outputPath, params, NORMS, doFeat, ZS_NORM)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
+        # Pairs of a larger team share members, which writer threads would load, release or recalculate under each other,
+        #       so those are written one at a time (worker processes each get their own copy of the members)
+        pairWriters = writers
+        if(doFeat[SYNC] and pool is None and clam.sharesMembers()):
+            pairWriters = None
 
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
+        # Gather the list of new files (fList) while writing, it is written once every output is
+        fList = FileList()
 
-            # End Normalization
+        # Normalization
+        if(doFeat[NORMS]):
+            # Min-Max Normalization #
+            if(doFeat[MM_NORM]):
+                fList.heading("Min-Max Normalization")
 
-            # Synchrony
-            if(doFeat[SYNC]):
                 # Data Writing
-                if(doFeat[CALCS]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Calculations]\n" % (DTstr[1], DTstr[3]))
-                    for pair in clam.m_pairs:
-                        DTstr = updateDT()
-                        fileInfo = pair.writeFile(outputPath, params, CALCS, doFeat)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
-
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
-                
-                # DIRAG Writing
-                if(doFeat[DIRAG]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Directional Agreement]\n" % (DTstr[1], DTstr[3]))
-                    for pair in clam.m_pairs:
-                        DTstr = updateDT()
-                        fileInfo = pair.writeFile(outputPath, params, DIRAG, doFeat)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
-
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
-                
-                # SIGMA Writing
-                if(doFeat[SIGMA]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Signal Matching]\n" % (DTstr[1], DTstr[3]))
-                    for pair in clam.m_pairs:
-                        DTstr = updateDT()
-                        fileInfo = pair.writeFile(outputPath, params, SIGMA, doFeat)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
-
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
-
-            # Individuals
-            else:
+                if(incremental):
+                    fileInfos = [appendInfo[0] for appendInfo in appendInfos]
+                else:
+                    metrics.begin("write_norms_mm")
+                    fileInfos = runTasks(writers, functools.partial(writeTask, outputPath, params, NORMS, doFeat, MM_NORM), clam.m_datasets, metrics)
+                    metrics.end()
+                fList.add(fileInfos)
+
+            # Z-Score Normalization #
+            if(doFeat[ZS_NORM]):
+                fList.heading("Z-Score Normalization")
+
                 # Data Writing
-                if(doFeat[CALCS]):
-                    DTstr = updateDT()
-                    fList.write("%s %s\t\t\t[Calculations]\n" % (DTstr[1], DTstr[3]))
-                    for obj in clam.m_datasets:
-                        DTstr = updateDT()
-                        fileInfo = obj.writeFile(outputPath, params, CALCS, doFeat)
-                        fList.write("%s %s\t\t%s\t%s\n" % (DTstr[1], DTstr[3], fileInfo[0], fileInfo[1]))
-
-                        totalDataSize += fileInfo[0]
-                        totalDataCount += 1
-            
-            fList.write("\n\t%s File(s)\t%s bytes" % (totalDataCount, totalDataSize))
+                if(incremental):
+                    fileInfos = [appendInfo[0] for appendInfo in appendInfos]
+                else:
+                    metrics.begin("write_norms_zs")
+                    fileInfos = runTasks(writers, functools.partial(writeTask, outputPath, params, NORMS, doFeat, ZS_NORM), clam.m_datasets, metrics)
+                    metrics.end()
+                fList.add(fileInfos)
+
+        # End Normalization
+
+        # Synchrony
+        if(doFeat[SYNC]):
+            # Data Writing
+            if(doFeat[CALCS]):
+                fList.heading("Calculations")
+                metrics.begin("write_calcs")
+                pairInfos = runTasks(pairWriters, functools.partial(calcsTask, outputPath, paramSets, doFeat), clam.m_pairs, metrics)
+                metrics.end()
+
+                # Listed per window configuration, then per pair
+                for i in range(len(paramSets)):
+                    fList.add([fileInfos[i] for fileInfos in pairInfos])
+
+            # DIRAG Writing
+            if(doFeat[DIRAG]):
+                fList.heading("Directional Agreement")
+                metrics.begin("write_dirag")
+                fList.add(runTasks(pairWriters, functools.partial(writeTask, outputPath, params, DIRAG, doFeat, -1), clam.m_pairs, metrics))
+                metrics.end()
+
+            # SIGMA Writing
+            if(doFeat[SIGMA]):
+                fList.heading("Signal Matching")
+                metrics.begin("write_sigma")
+                fList.add(runTasks(pairWriters, functools.partial(writeTask, outputPath, params, SIGMA, doFeat, -1), clam.m_pairs, metrics))
+                metrics.end()
+
+            # XCORR Writing: the whole recording, then per window configuration
+            if(doFeat[XCORR]):
+                fList.heading("Cross-Correlation")
+                metrics.begin("write_xcorr")
+                fList.add(runTasks(pairWriters, functools.partial(writeTask, outputPath, params, XCORR, doFeat, -1), clam.m_pairs, metrics))
+                metrics.end()
+                if(doFeat[XCORRW]):
+                    metrics.begin("write_xcorr_windows")
+                    pairInfos = runTasks(pairWriters, functools.partial(xcorrTask, outputPath, paramSets, doFeat), clam.m_pairs, metrics)
+                    metrics.end()
+                    for i in range(len(paramSets)):
+                        fList.add([pairInfo[i] for pairInfo in pairInfos])
+
+        # Individuals
+        else:
+            # Data Writing
+            if(doFeat[CALCS]):
+                fList.heading("Calculations")
+                if(incremental):
+                    objInfos = [appendInfo[1] for appendInfo in appendInfos]
+                else:
+                    metrics.begin("write_calcs")
+                    objInfos = runTasks(writers, functools.partial(calcsTask, outputPath, paramSets, doFeat), clam.m_datasets, metrics)
+                    metrics.end()
+
+                # Listed per window configuration, then per file
+                for i in range(len(paramSets)):
+                    fList.add([fileInfos[i] for fileInfos in objInfos])
+
+        # Write fileList.txt, in the order above rather than the order the files finished in
+        fList.write(fListPath)
+
+        # Metrics of every stage and file of this run, next to the file list
+        if(METRICS or PROFILE):
+            metrics.write(outputPath + "-metrics.json", {
+                "folder": folderPath, "workers": workers, "low_memory": LOW_MEMORY, "incremental": incremental,
+                "features": [name for feat, name in FEATNAMES.items() if doFeat[feat]],
+                "normalization": "min-max" if doFeat[MM_NORM] else "z-score" if doFeat[ZS_NORM] else None,
+                "pairs": doFeat[SYNC], "directional_agreement": doFeat[DIRAG], "signal_matching": doFeat[SIGMA],
+                "cross_correlation": doFeat[XCORR], "windowed_synchrony": doFeat[SYNCW],
+                "parse": [report.record() for report in clam.m_reports],
+                "windows": [{"width": p[WIDTH], "increment": p[INCRE], "count": p[COUNT], "start": p[START]} for p in paramSets] if doFeat[CALCS] else []})
 
         # Info Message: Completion
         print("\nFile writing has been completed.")
@@ -1206,6 +4920,253 @@ def main():
     except:
         print("File writing was interrupted or could not fully complete.")
 
-# Start Program
-print("\n\n\n\n\n") # Spacer (Clear Home)
-main()
\ No newline at end of file
+    if(writers is not None and writers is not pool):
+        writers.shutdown()
+    if(pool is not None):
+        pool.shutdown()
+
+    # Keep the result cache within its size, dropping what was least recently used
+    if(RESULT_CACHE and ResultCache.trim(folderPath) > 0):
+        print("[SAFE] Least recently used results were dropped from the result cache.")
+
+#
+#           STREAM FUNCTION
+# streamTail() - Follow the data files of a folder, feeding the lines added to them to the engine
+#           New files are picked up as they appear. With once, stops after reading what is there
+#           The new lines of all files are fed position by position, so the members of a pair stay lined up
+#
+
+def streamTail(engine, folderPath, once = False):
+    offsets = {}
+    while(True):
+        added = []
+        for fileName in sorted(os.listdir(folderPath)):
+            if(fileName[:1] == "-"): # Exempt files begin with '-'
+                continue
+            offset = offsets.get(fileName, 0)
+            size = os.stat(folderPath + "\\" + fileName).st_size
+            if(size < offset):
+                print("[WARN] \"%s\" got shorter, reading it again from the start." % fileName, file = sys.stderr)
+                offset = 0
+            if(size > offset):
+                times, values, offsets[fileName] = Clam.parseFrom(folderPath, fileName, offset)
+                added.append([fileName, times, values])
+
+        for fileName, times, values in added:
+            if(fileName not in engine.m_windows):
+                engine.sensor(fileName)
+        for i in range(max((len(times) for fileName, times, values in added), default = 0)):
+            for fileName, times, values in added:
+                if(i < len(times)):
+                    engine.add(fileName, times[i], values[i])
+        engine.m_output.flush()
+        if(once):
+            return
+        timer.sleep(STREAM_POLL)
+
+#
+#           STREAM FUNCTION
+# streamPipe() - Feed the lines of the standard input to the engine, until it is closed
+#           "time value" lines are of a sensor named "stdin"
+#
+
+def streamPipe(engine):
+    rest = b""
+    chunk = sys.stdin.buffer.read1(READ_CHUNK)
+    while(chunk):
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        engine.addLines(lines, "stdin")
+        chunk = sys.stdin.buffer.read1(READ_CHUNK)
+    engine.addLines([rest], "stdin")
+
+#
+#           HELPER FUNCTION
+# clearSocket() - Make way for a Unix socket at path: remove the socket an earlier run left there
+#           Returns False, leaving it alone, if something else (a file or folder) is at path
+#
+
+def clearSocket(path):
+    if(not os.path.exists(path)):
+        return True
+    if(not filestat.S_ISSOCK(os.stat(path).st_mode)):
+        print("[ERROR] \"%s\" is not a socket, it was not replaced." % path, file = sys.stderr)
+        return False
+    os.remove(path)
+    return True
+
+#
+#           STREAM FUNCTION
+# streamSocket() - Listen on a local socket and feed the lines every client sends to the engine
+#           address is a port number (TCP on 127.0.0.1) or a path (Unix socket)
+#           Clients are served together from this one thread; "time value" lines are of a sensor named "client#"
+#
+
+def streamSocket(engine, address):
+    if(address.isdigit()):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", int(address)))
+    else:
+        if(not clearSocket(address)):
+            return
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+    server.listen()
+    server.setblocking(False)
+    print("[SAFE] Listening on %s" % address, file = sys.stderr)
+
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ, None)
+    clients = 0
+    try:
+        while(True):
+            for key, events in selector.select():
+                if(key.data is None): # New client
+                    conn, addr = server.accept()
+                    conn.setblocking(False)
+                    clients += 1
+                    selector.register(conn, selectors.EVENT_READ, ["client%s" % clients, b""])
+                    continue
+
+                conn = key.fileobj
+                name, rest = key.data
+                chunk = conn.recv(READ_CHUNK)
+                if(chunk):
+                    lines = (rest + chunk).split(b"\n")
+                    key.data[1] = lines.pop()
+                    engine.addLines(lines, name)
+                else: # Client is done
+                    engine.addLines([rest], name)
+                    selector.unregister(conn)
+                    conn.close()
+    finally:
+        selector.close()
+        server.close()
+
+#
+#           DRIVER FUNCTION
+# streamMain() - driver function of streaming mode: python main.py stream (--tail FOLDER | --pipe | --socket ADDRESS) ...
+#           Runs the window calculations (and pair DA/SM) live, writing each result as soon as it is complete
+#
+
+def streamMain(args):
+    parser = argparse.ArgumentParser(prog = "main.py stream", description = "Calculate windows, Directional Agreement and Signal Matching live.")
+    source = parser.add_mutually_exclusive_group(required = True)
+    source.add_argument("--tail", metavar = "FOLDER", help = "follow the data files of a folder as they grow")
+    source.add_argument("--pipe", action = "store_true", help = "read \"name time value\" lines from the standard input")
+    source.add_argument("--socket", metavar = "ADDRESS", help = "read \"name time value\" lines from clients of a local port or Unix socket path")
+    parser.add_argument("--width", type = int, required = True, help = "lines of data per window")
+    parser.add_argument("--incr", type = int, required = True, help = "lines of data in between windows")
+    parser.add_argument("--count", type = int, default = 0, help = "windows per sensor (0 for no limit)")
+    parser.add_argument("--start", type = int, default = 0, help = "line to begin the windows at")
+    parser.add_argument("--calc", default = "avg,std,slope", help = "features to calculate, any of avg,std,slope (or none)")
+    parser.add_argument("--da", action = "store_true", help = "Directional Agreement of the sensors of each session")
+    parser.add_argument("--sm", action = "store_true", help = "Signal Matching of the sensors of each session")
+    parser.add_argument("--once", action = "store_true", help = "with --tail, stop after reading what the files hold now")
+    options = parser.parse_args(args)
+
+    doFeat = [False] * TOTALFEAT
+    calc = options.calc.split(",")
+    doFeat[AVG] = "avg" in calc
+    doFeat[STD] = "std" in calc
+    doFeat[SLOPE] = "slope" in calc
+    doFeat[DIRAG] = options.da
+    doFeat[SIGMA] = options.sm
+    doFeat[SYNC] = options.da or options.sm
+    params = [0, 0, 0, 0]
+    params[WIDTH] = options.width
+    params[INCRE] = options.incr
+    params[COUNT] = options.count
+    params[START] = options.start
+
+    engine = StreamEngine(params, doFeat)
+    try:
+        if(options.tail is not None):
+            streamTail(engine, options.tail, options.once)
+        elif(options.pipe):
+            streamPipe(engine)
+        else:
+            streamSocket(engine, options.socket)
+    except KeyboardInterrupt:
+        pass
+    sys.stdout.flush()
+
+#
+#           DRIVER FUNCTION
+# queryMain() - driver function of query mode: the statistics of one range of one file, from its aggregate index
+#           python main.py query FOLDER FILE START END [--seconds] [--level N]
+#
+
+def queryMain(args):
+    parser = argparse.ArgumentParser(prog = "main.py query", description = "Statistics of any range of lines (or seconds) of a data file.")
+    parser.add_argument("folder", help = "folder of the data file")
+    parser.add_argument("file", help = "name of the data file")
+    parser.add_argument("start", type = float, help = "first line of the range")
+    parser.add_argument("end", type = float, help = "line after the range")
+    parser.add_argument("--seconds", action = "store_true", help = "start and end are seconds from the beginning of the file")
+    parser.add_argument("--level", type = int, help = "also list the blocks of this level of the index (0 is the finest)")
+    options = parser.parse_args(args)
+
+    if(not os.path.isfile(options.folder + "\\" + options.file)):
+        print("[ERROR] File \"%s\" not found in \"%s\"!" % (options.file, options.folder))
+        return
+    obj = NameData(options.file, folder = options.folder)
+    try:
+        if(options.seconds):
+            result = obj.query(options.start, options.end, True)
+        else:
+            result = obj.query(int(options.start), int(options.end))
+    except IndexError as error:
+        print("[ERROR] %s" % error)
+        return
+    if(options.level is not None and not 0 <= options.level < len(obj.index().m_levels)):
+        print("[WARN] The index of \"%s\" has levels 0 to %s only." % (options.file, len(obj.index().m_levels) - 1))
+    elif(options.level is not None):
+        starts, mins, maxs, means, stds = obj.index().blocks(options.level)
+        result["blocks"] = {"lines": obj.index().blockSize(options.level), "start": starts, "min": list(mins),
+                            "max": list(maxs), "mean": list(means), "std": list(stds)}
+    print(json.dumps(result, indent = 1))
+
+#
+#           DRIVER FUNCTION
+# serveMain() - driver function of service mode: python main.py serve --folder FOLDER [--folder FOLDER ...] [--address ADDRESS]
+#           Reads the folders once, then answers requests for them over HTTP until stopped
+#
+
+def serveMain(args):
+    parser = argparse.ArgumentParser(prog = "main.py serve", description = "Keep data folders in memory and answer requests for them over HTTP.")
+    parser.add_argument("--folder", action = "append", required = True, help = "data folder to serve (more than one may be given)")
+    parser.add_argument("--address", default = "8765", help = "local port number (127.0.0.1 only) or Unix socket path (default 8765)")
+    options = parser.parse_args(args)
+
+    ServiceHandler.service = Service(options.folder)
+    address = options.address
+    if(address.isdigit()):
+        server = ThreadingHTTPServer(("127.0.0.1", int(address)), ServiceHandler)
+        server.daemon_threads = True
+    else:
+        if(not clearSocket(address)):
+            return
+        server = UnixHTTPServer(address, ServiceHandler)
+    print("[SAFE] Serving %s folder(s) on %s" % (len(options.folder), address), file = sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if(not address.isdigit()):
+            clearSocket(address)
+
+# Start Program (only when run directly: worker processes import this file without starting it)
+if __name__ == "__main__":
+    if(len(sys.argv) > 1 and sys.argv[1] == "stream"):
+        streamMain(sys.argv[2:])
+    elif(len(sys.argv) > 1 and sys.argv[1] == "query"):
+        queryMain(sys.argv[2:])
+    elif(len(sys.argv) > 1 and sys.argv[1] == "serve"):
+        serveMain(sys.argv[2:])
+    else:
+        print("\n\n\n\n\n") # Spacer (Clear Home)
+        main()
\ No newline at end of file